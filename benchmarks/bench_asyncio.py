@@ -0,0 +1,131 @@
+"""asyncio benchmarks.
+
+Run with pytest-benchmark::
+
+    $ pip install -e '.[benchmarks]'
+    $ pytest benchmarks/bench_asyncio.py
+
+The maximum event loop lag while decoding is reported as ``max_lag`` in the
+extra info of `test_decode_lag`. Compare `test_hit` with the same test of
+``benchmarks/bench_factory.py`` for the overhead of :mod:`asyncio`.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+import ring
+
+PAYLOAD_SIZES = {
+    "1MB": 2**20,
+    "16MB": 2**24,
+}
+
+
+async def _ticker(lags, interval=0.001):
+    while True:
+        before = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - before - interval)
+
+
+@pytest.fixture(params=sorted(PAYLOAD_SIZES, key=PAYLOAD_SIZES.get))
+def payload(request):
+    size = PAYLOAD_SIZES[request.param]
+    return [float(i) for i in range(size // 8)]
+
+
+@pytest.mark.parametrize("offload_threshold", [None, 2**16])
+def test_decode_lag(benchmark, payload, offload_threshold):
+    benchmark.group = "asyncio-decode-lag-{}".format(len(payload) * 8)
+
+    @ring.dict({}, coder="pickle", offload_threshold=offload_threshold)
+    async def f():
+        return payload
+
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(f.update())
+    lags = []
+
+    async def run():
+        ticker = asyncio.ensure_future(_ticker(lags))
+        await asyncio.sleep(0)
+        await f.get()
+        ticker.cancel()
+
+    benchmark(lambda: loop.run_until_complete(run()))
+    loop.close()
+    benchmark.extra_info["max_lag"] = max(lags) if lags else 0.0
+
+
+def _dict(tmpdir):
+    return ring.dict({})
+
+
+def _sqlite(tmpdir):
+    return ring.sqlite(str(tmpdir.join("cache.db")))
+
+
+def _redis(tmpdir):
+    fakeredis = pytest.importorskip("fakeredis")
+    return ring.aioredis(fakeredis.FakeAsyncRedis(), coder="pickle")
+
+
+ASYNC_FACTORIES = {
+    "dict": _dict,
+    "sqlite": _sqlite,
+    "redis": _redis,
+}
+
+
+@pytest.fixture(params=sorted(ASYNC_FACTORIES))
+def async_factory(request, tmpdir):
+    return request.param, ASYNC_FACTORIES[request.param](tmpdir)
+
+
+@pytest.fixture()
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+def test_hit(benchmark, loop, async_factory):
+    name, decorator = async_factory
+    benchmark.group = "asyncio-hit"
+
+    @decorator
+    async def f(a, b):
+        return a * 100 + b
+
+    loop.run_until_complete(f(1, 2))
+    assert benchmark(lambda: loop.run_until_complete(f(1, 2))) == 102
+
+
+@pytest.mark.parametrize("mode", ["single", "many"])
+def test_bulk_hit(benchmark, loop, async_factory, mode):
+    name, decorator = async_factory
+    if name == "dict":
+        pytest.skip("dict doesn't support bulk access")
+    benchmark.group = "asyncio-bulk-hit-{}".format(name)
+
+    @decorator
+    async def f(a):
+        return a
+
+    args_list = [(i,) for i in range(100)]
+    loop.run_until_complete(f.update_many(*args_list))
+
+    if mode == "single":
+
+        async def get_all():
+            return [await f.get(*args) for args in args_list]
+
+    else:
+
+        async def get_all():
+            return await f.get_many(*args_list)
+
+    result = benchmark(lambda: loop.run_until_complete(get_all()))
+    assert result == list(range(100))
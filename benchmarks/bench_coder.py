@@ -0,0 +1,141 @@
+"""Coder benchmarks.
+
+Run with pytest-benchmark::
+
+    $ pip install -e '.[benchmarks]'
+    $ pytest benchmarks/bench_coder.py
+"""
+
+import pytest
+
+from ring.coder import registry
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+ARRAY_SIZES = {
+    "1KB": 2**10,
+    "1MB": 2**20,
+    "16MB": 2**24,
+    "100MB": 100 * 2**20,
+}
+
+
+PLAIN_OBJECT = {
+    "id": 42,
+    "name": "ring",
+    "tags": ["cache", "decorator"],
+    "score": 3.14,
+    "nested": {"a": [1, 2, 3], "b": None},
+}
+
+
+@pytest.mark.parametrize("coder_name", ["json", "pickle"])
+def test_plain_encode(benchmark, coder_name):
+    benchmark.group = "plain-encode"
+    coder = registry.get(coder_name)
+    benchmark(coder.encode, PLAIN_OBJECT)
+
+
+@pytest.mark.parametrize("coder_name", ["json", "pickle"])
+def test_plain_decode(benchmark, coder_name):
+    benchmark.group = "plain-decode"
+    coder = registry.get(coder_name)
+    encoded = coder.encode(PLAIN_OBJECT)
+    assert benchmark(coder.decode, encoded) == PLAIN_OBJECT
+
+
+@pytest.fixture(params=sorted(ARRAY_SIZES, key=ARRAY_SIZES.get))
+def array(request):
+    if numpy is None:
+        pytest.skip("numpy is not installed")
+    return numpy.random.random_sample(ARRAY_SIZES[request.param] // 8)
+
+
+@pytest.mark.parametrize("coder_name", ["pickle", "numpy"])
+def test_ndarray_encode(benchmark, array, coder_name):
+    benchmark.group = "ndarray-encode-{}".format(array.nbytes)
+    coder = registry.get(coder_name)
+    benchmark(coder.encode, array)
+
+
+@pytest.mark.parametrize("coder_name", ["pickle", "numpy"])
+def test_ndarray_decode(benchmark, array, coder_name):
+    benchmark.group = "ndarray-decode-{}".format(array.nbytes)
+    coder = registry.get(coder_name)
+    encoded = coder.encode(array)
+    decoded = benchmark(coder.decode, encoded)
+    assert decoded.shape == array.shape
+
+
+@pytest.fixture(params=sorted(ARRAY_SIZES, key=ARRAY_SIZES.get))
+def buffers_object(request):
+    if numpy is None:
+        pytest.skip("numpy is not installed")
+    size = ARRAY_SIZES[request.param]
+    return {
+        "array": numpy.random.random_sample(size // 16),
+        "bytearray": bytearray(size // 2),
+    }
+
+
+@pytest.mark.parametrize("coder_name", ["pickle", "pickle5"])
+def test_buffers_encode(benchmark, buffers_object, coder_name):
+    benchmark.group = "buffers-encode-{}".format(
+        buffers_object["array"].nbytes + len(buffers_object["bytearray"])
+    )
+    coder = registry.get(coder_name)
+    benchmark(coder.encode, buffers_object)
+
+
+@pytest.mark.parametrize("coder_name", ["pickle", "pickle5"])
+def test_buffers_decode(benchmark, buffers_object, coder_name):
+    benchmark.group = "buffers-decode-{}".format(
+        buffers_object["array"].nbytes + len(buffers_object["bytearray"])
+    )
+    coder = registry.get(coder_name)
+    encoded = coder.encode(buffers_object)
+    decoded = benchmark(coder.decode, encoded)
+    assert decoded["bytearray"] == buffers_object["bytearray"]
+
+
+def _make_dataclass_decode(binary):
+    """The decoder creating a new dataclass for each decode."""
+    import dataclasses
+    from ring.coder import JsonCoder
+
+    name, fields = JsonCoder.decode(binary)
+    dataclass = dataclasses.make_dataclass(
+        name, [(key, type(value)) for key, value in fields.items()]
+    )
+    return dataclass(**fields)
+
+
+@pytest.mark.parametrize("mode", ["make_dataclass", "substitute", "dict", "tuple"])
+def test_dataclass_hit(benchmark, mode):
+    import dataclasses
+    import ring
+    from ring.coder import DataclassCoder
+
+    @dataclasses.dataclass
+    class Point:
+        x: int
+        y: int
+        label: str
+
+    benchmark.group = "dataclass-hit"
+    coder = DataclassCoder(as_tuple=mode == "tuple")
+    if mode in ("dict", "tuple"):
+        coder.register(Point)
+
+    @ring.dict({}, coder=coder)
+    def f(i):
+        return Point(i, i, "label")
+
+    if mode == "make_dataclass":
+        f.ring.decode(_make_dataclass_decode)
+
+    f(1)
+    assert benchmark(f, 1).x == 1
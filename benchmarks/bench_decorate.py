@@ -0,0 +1,63 @@
+"""Decoration benchmarks.
+
+Run with pytest-benchmark::
+
+    $ pip install -e '.[benchmarks]'
+    $ pytest benchmarks/bench_decorate.py
+
+Each round decorates :data:`FUNCTION_COUNT` functions; the cost of the
+decoration is paid at import time of modules with many cached functions.
+"""
+
+import pytest
+
+import ring
+
+FUNCTION_COUNT = 10000
+
+
+def _functions():
+    functions = []
+    for i in range(FUNCTION_COUNT):
+
+        def f(a, b):
+            return a + b
+
+        f.__name__ = f.__qualname__ = "f{}".format(i)
+        functions.append(f)
+    return functions
+
+
+DECORATORS = {
+    # a new factory call for each function
+    "lru": lambda: ring.lru(),
+    "dict": lambda storage=dict(): ring.dict(storage),
+    "dict-expire": lambda storage=dict(): ring.dict(storage, expire=60),
+    "dict-composed": lambda storage=dict(): ring.dict(
+        storage, user_interface=(ring.func.sync.CacheUserInterface,)
+    ),
+}
+
+
+@pytest.mark.parametrize("name", sorted(DECORATORS))
+def test_decorate(benchmark, name):
+    benchmark.group = "decorate-{}".format(FUNCTION_COUNT)
+    create_decorator = DECORATORS[name]
+    functions = _functions()
+
+    def decorate_all():
+        return [create_decorator()(f) for f in functions]
+
+    benchmark.pedantic(decorate_all, rounds=3)
+
+
+def test_decorate_shared(benchmark):
+    """Decorate functions with a decorator object."""
+    benchmark.group = "decorate-{}".format(FUNCTION_COUNT)
+    functions = _functions()
+
+    def decorate_all():
+        decorator = ring.dict({})
+        return [decorator(f) for f in functions]
+
+    benchmark.pedantic(decorate_all, rounds=3)
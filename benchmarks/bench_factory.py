@@ -0,0 +1,180 @@
+"""Factory benchmarks.
+
+Run with pytest-benchmark::
+
+    $ pip install -e '.[benchmarks]'
+    $ pytest benchmarks/bench_factory.py
+
+Redis and Memcached run against in-process stand-ins: :mod:`fakeredis` and
+:class:`pymemcache.test.utils.MockMemcacheClient`. They measure the overhead
+of **Ring** rather than the network.
+"""
+
+import functools
+import shelve
+
+import pytest
+
+import ring
+
+BULK_SIZE = 100
+
+
+def _lru(tmpdir):
+    return ring.lru(maxsize=None)
+
+
+def _weak(tmpdir):
+    return ring.weak()
+
+
+def _dict(tmpdir):
+    return ring.dict({})
+
+
+def _shelve(tmpdir):
+    return ring.shelve(shelve.open(str(tmpdir.join("shelve"))))
+
+
+def _disk(tmpdir):
+    diskcache = pytest.importorskip("diskcache")
+    return ring.disk(diskcache.Cache(str(tmpdir.join("diskcache"))))
+
+
+def _sqlite(tmpdir):
+    return ring.sqlite(str(tmpdir.join("cache.db")))
+
+
+def _mmap(tmpdir):
+    return ring.mmap(str(tmpdir.join("cache.mmap")), coder="pickle")
+
+
+def _redis(tmpdir):
+    fakeredis = pytest.importorskip("fakeredis")
+    return ring.redis(fakeredis.FakeRedis(), coder="pickle")
+
+
+def _memcache(tmpdir):
+    utils = pytest.importorskip("pymemcache.test.utils")
+    return ring.memcache(utils.MockMemcacheClient(), coder="pickle")
+
+
+FACTORIES = {
+    "lru": _lru,
+    "weak": _weak,
+    "dict": _dict,
+    "shelve": _shelve,
+    "disk": _disk,
+    "sqlite": _sqlite,
+    "mmap": _mmap,
+    "redis": _redis,
+    "memcache": _memcache,
+}
+BULK_FACTORIES = ("sqlite", "redis", "memcache")
+
+
+@pytest.fixture(params=sorted(FACTORIES))
+def factory(request, tmpdir):
+    return request.param, FACTORIES[request.param](tmpdir)
+
+
+@pytest.fixture(params=BULK_FACTORIES)
+def bulk_factory(request, tmpdir):
+    return request.param, FACTORIES[request.param](tmpdir)
+
+
+def test_hit(benchmark, factory):
+    name, decorator = factory
+    benchmark.group = "hit"
+
+    @decorator
+    def f(a, b):
+        return a * 100 + b
+
+    f(1, 2)
+    assert benchmark(f, 1, 2) == 102
+
+
+def test_miss(benchmark, factory):
+    name, decorator = factory
+    benchmark.group = "miss"
+
+    @decorator
+    def f(a, b):
+        return a * 100 + b
+
+    assert benchmark(f.get, 1, 2) is None
+
+
+def test_update(benchmark, factory):
+    name, decorator = factory
+    benchmark.group = "update"
+
+    @decorator
+    def f(a, b):
+        return a * 100 + b
+
+    assert benchmark(f.update, 1, 2) == 102
+
+
+def test_lru_cache_hit(benchmark):
+    """The baseline of :func:`functools.lru_cache`."""
+    benchmark.group = "hit"
+
+    @functools.lru_cache(maxsize=None)
+    def f(a, b):
+        return a * 100 + b
+
+    f(1, 2)
+    assert benchmark(f, 1, 2) == 102
+
+
+@pytest.mark.parametrize("mode", ["single", "many"])
+def test_bulk_hit(benchmark, bulk_factory, mode):
+    name, decorator = bulk_factory
+    benchmark.group = "bulk-hit-{}".format(name)
+
+    @decorator
+    def f(a):
+        return a
+
+    args_list = [(i,) for i in range(BULK_SIZE)]
+    f.update_many(*args_list)
+
+    if mode == "single":
+
+        def get_all():
+            return [f.get(*args) for args in args_list]
+
+    else:
+
+        def get_all():
+            return f.get_many(*args_list)
+
+    assert benchmark(get_all) == list(range(BULK_SIZE))
+
+
+@pytest.mark.parametrize("mode", ["single", "many"])
+def test_bulk_set(benchmark, bulk_factory, mode):
+    name, decorator = bulk_factory
+    benchmark.group = "bulk-set-{}".format(name)
+
+    @decorator
+    def f(a):
+        return a
+
+    args_list = [(i,) for i in range(BULK_SIZE)]
+    values = list(range(BULK_SIZE))
+
+    if mode == "single":
+
+        def set_all():
+            for args, value in zip(args_list, values):
+                f.set(value, *args)
+
+    else:
+
+        def set_all():
+            f.set_many(args_list, values)
+
+    benchmark(set_all)
@@ -0,0 +1,30 @@
+"""Import time benchmarks.
+
+Run with pytest-benchmark::
+
+    $ pip install -e '.[benchmarks]'
+    $ pytest benchmarks/bench_import.py
+
+Each round runs a fresh interpreter, so the timings include the interpreter
+startup. ``pass`` is the baseline of it.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+STATEMENTS = {
+    "baseline": "pass",
+    "ring": "import ring",
+    "ring-lru": "import ring; ring.lru",
+    "ring-redis": "import ring; ring.redis",
+    "ring-aioredis": "import ring; ring.aioredis",
+}
+
+
+@pytest.mark.parametrize("name", list(STATEMENTS))
+def test_import(benchmark, name):
+    benchmark.group = "import"
+    command = [sys.executable, "-c", STATEMENTS[name]]
+    benchmark.pedantic(subprocess.check_call, args=(command,), rounds=10)
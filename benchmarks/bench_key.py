@@ -0,0 +1,141 @@
+"""Key building benchmarks.
+
+Run with pytest-benchmark::
+
+    $ pip install -e '.[benchmarks]'
+    $ pytest benchmarks/bench_key.py
+
+The size of the built key is reported as ``key_size`` in the extra info of
+each benchmark.
+"""
+
+import pytest
+
+import ring
+from ring.func.base import coerce
+from ring.key import KeyHash
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+ARGUMENT_SIZES = {
+    "short": 8,
+    "long": 512,
+}
+
+KEY_HASHES = {
+    "none": None,
+    "blake2b": "blake2b",
+    "blake2b-8": KeyHash("blake2b", digest_size=8),
+    "blake2b-readable": KeyHash("blake2b", readable_prefix=True),
+    "sha1": "sha1",
+}
+
+try:
+    KEY_HASHES["xxhash"] = KeyHash("xxhash")
+except TypeError:  # xxhash is not installed
+    pass
+
+
+@pytest.fixture(params=sorted(ARGUMENT_SIZES, key=ARGUMENT_SIZES.get))
+def argument(request):
+    return "x" * ARGUMENT_SIZES[request.param]
+
+
+@pytest.mark.parametrize("key_hash_name", sorted(KEY_HASHES))
+def test_key(benchmark, argument, key_hash_name):
+    benchmark.group = "key-{}".format(len(argument))
+
+    @ring.dict({}, key_hash=KEY_HASHES[key_hash_name])
+    def f(a, b, c):
+        return None
+
+    key = benchmark(f.key, argument, 10, c=argument)
+    benchmark.extra_info["key_size"] = len(key)
+
+
+@pytest.mark.skipif(numpy is None, reason="numpy is not installed")
+@pytest.mark.parametrize("size", [2**6, 2**12, 2**18])
+@pytest.mark.parametrize("coerce_digest", [False, True])
+def test_ndarray_key(benchmark, size, coerce_digest):
+    benchmark.group = "ndarray-key-{}".format(size)
+
+    @ring.dict({}, coerce_digest=coerce_digest)
+    def f(a):
+        return None
+
+    key = benchmark(f.key, numpy.random.random_sample(size))
+    benchmark.extra_info["key_size"] = len(key)
+
+
+@pytest.mark.parametrize("size", [2**4, 2**10])
+@pytest.mark.parametrize("coerce_digest", [False, True])
+def test_container_key(benchmark, size, coerce_digest):
+    benchmark.group = "container-key-{}".format(size)
+
+    @ring.dict({}, coerce_digest=coerce_digest)
+    def f(a, b):
+        return None
+
+    argument = {str(i): i for i in range(size)}
+    key = benchmark(f.key, argument, list(argument))
+    benchmark.extra_info["key_size"] = len(key)
+
+
+def test_coerce_many_types(benchmark):
+    """Coerce arguments of more types than the old 128-entry type cache."""
+    types = [
+        type("Type{}".format(i), (object,), {"__str__": lambda self: "v"})
+        for i in range(256)
+    ]
+    values = [t() for t in types] + [1, "s", (1, 2), [1], {1: 2}, {1}]
+
+    def coerce_all():
+        for value in values:
+            coerce(value, False)
+
+    benchmark(coerce_all)
+
+
+class RingKeyObject(object):
+    def __init__(self, id):
+        self.id = id
+
+    def __ring_key__(self):
+        return "object{}".format(self.id)
+
+
+def _dataclass_argument():
+    import dataclasses
+
+    @dataclasses.dataclass
+    class Point:
+        x: int
+        y: int
+
+    return Point(1, 2)
+
+
+ARGUMENTS = {
+    "int": lambda: 42,
+    "str": lambda: "argument",
+    "tuple": lambda: (1, 2, 3),
+    "list": lambda: [1, 2, 3],
+    "dict": lambda: {"a": 1, "b": 2},
+    "set": lambda: {1, 2, 3},
+    "ring_key": lambda: RingKeyObject(42),
+    "dataclass": _dataclass_argument,
+}
+
+
+@pytest.mark.parametrize("argument_type", sorted(ARGUMENTS))
+def test_key_argument_type(benchmark, argument_type):
+    benchmark.group = "key-argument-type"
+
+    @ring.dict({})
+    def f(a):
+        return None
+
+    benchmark(f.key, ARGUMENTS[argument_type]())
@@ -0,0 +1,111 @@
+"""Bound wire benchmarks.
+
+Run with pytest-benchmark::
+
+    $ pip install -e '.[benchmarks]'
+    $ pytest benchmarks/bench_wire.py
+
+Methods create a wire for each bound object. The memory of the wires of
+:data:`INSTANCE_COUNT` objects is reported as ``wire_bytes`` in the extra
+info of each benchmark.
+"""
+
+import tracemalloc
+
+import pytest
+
+import ring
+
+INSTANCE_COUNT = 10000
+
+WIRE_SLOTS = {
+    "slots": Ellipsis,
+    "dict": False,
+}
+
+
+def _create_class(wire_slots):
+    class A(object):
+        def __init__(self, id):
+            self.id = id
+
+        def __ring_key__(self):
+            return str(self.id)
+
+        @ring.dict({}, wire_slots=wire_slots)
+        def f(self, a):
+            return self.id + a
+
+    return A
+
+
+@pytest.fixture(params=sorted(WIRE_SLOTS))
+def cls(request):
+    return _create_class(WIRE_SLOTS[request.param])
+
+
+def _wire_objects(cls):
+    objects = [cls(i) for i in range(INSTANCE_COUNT)]
+    for obj in objects:
+        obj.f(1)
+    return objects
+
+
+def test_wire_memory(benchmark, cls):
+    benchmark.group = "wire-memory"
+    objects = [cls(i) for i in range(INSTANCE_COUNT)]
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for obj in objects:
+        obj.f.get(1)
+    benchmark.extra_info["wire_bytes"] = (
+        tracemalloc.get_traced_memory()[0] - before
+    ) // INSTANCE_COUNT
+    tracemalloc.stop()
+
+    benchmark.pedantic(_wire_objects, args=(cls,), rounds=3)
+
+
+def test_wire_attribute(benchmark, cls):
+    benchmark.group = "wire-attribute"
+    obj = cls(1)
+    wire = obj.f
+    wire.get(1)
+
+    benchmark(getattr, wire, "get")
+
+
+def test_wire_call(benchmark, cls):
+    benchmark.group = "wire-call"
+    obj = cls(1)
+    obj.f(1)
+
+    assert benchmark(obj.f, 1) == 2
+
+
+class RingKeyUser(object):
+    def __init__(self, id):
+        self.id = id
+
+    def __ring_key__(self):
+        return "user{}".format(self.id)
+
+    @ring.lru(maxsize=None)
+    def shared(self, a):
+        return self.id + a
+
+    @ring.lru(maxsize=16, instance_local=True)
+    def local(self, a):
+        return self.id + a
+
+
+@pytest.mark.parametrize("method", ["shared", "local"])
+def test_method_hit(benchmark, method):
+    """Hit of a method cached in a shared or an instance-local storage."""
+    benchmark.group = "method-hit"
+    user = RingKeyUser(1)
+    wire = getattr(user, method)
+    wire(1)
+
+    assert benchmark(wire, 1) == 2
@@ -2,34 +2,67 @@
 ====================================================
 
 Common ring decorators are aliased in this level as shortcuts.
+
+The decorators and submodules are imported at the first access, so
+``import ring`` doesn't pay for unused backends and integrations.
 """
 
-import ring.coder  # noqa
-from ring.__version__ import __version__  # noqa
-from ring.func import lru, dict, shelve, disk, memcache, redis, redis_hash
+import importlib
 
-try:
-    import asyncio
-    from ring.func.asyncio import aiomcache, aioredis, aioredis_hash
-except ImportError:
-    pass
-else:
-    del asyncio
-try:
-    import ring.django  # noqa
-except ImportError:  # pragma: no cover
-    pass
+from ring.__version__ import __version__  # noqa
 
 
 __all__ = (
     "lru",
+    "weak",
     "dict",
     "shelve",
     "memcache",
     "redis",
     "redis_hash",
     "disk",
+    "mmap",
+    "sqlite",
     "aiomcache",
     "aioredis",
     "aioredis_hash",
+    "invalidate_tags",
 )
+
+_factory_modules = {
+    "lru": "ring.func",
+    "weak": "ring.func",
+    "dict": "ring.func",
+    "shelve": "ring.func",
+    "memcache": "ring.func",
+    "redis": "ring.func",
+    "redis_hash": "ring.func",
+    "disk": "ring.func",
+    "mmap": "ring.func",
+    "sqlite": "ring.func",
+    "aiomcache": "ring.func.asyncio",
+    "aioredis": "ring.func.asyncio",
+    "aioredis_hash": "ring.func.asyncio",
+    "invalidate_tags": "ring.func.tags",
+}
+
+
+def __getattr__(name):
+    if name in _factory_modules:
+        factory = getattr(importlib.import_module(_factory_modules[name]), name)
+        globals()[name] = factory
+        return factory
+    if not name.startswith("__"):
+        module_name = __name__ + "." + name
+        try:
+            return importlib.import_module(module_name)
+        except ImportError as e:
+            # `ring.django` without Django is not an attribute as well
+            raise AttributeError(
+                "module '{}' has no attribute '{}'".format(__name__, name)
+            ) from e
+    raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,130 @@
+import zlib
+
+#: The number of hash slots of Redis Cluster.
+SLOTS = 16384
+
+
+def _crc16_table():
+    table = []
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            if crc & 0x8000:
+                crc = ((crc << 1) ^ 0x1021) & 0xFFFF
+            else:
+                crc = (crc << 1) & 0xFFFF
+        table.append(crc)
+    return table
+
+
+_crc16_lookup = _crc16_table()
+
+
+def crc16(data):
+    """CRC16/XMODEM, the checksum of Redis Cluster key slots."""
+    crc = 0
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFF) ^ _crc16_lookup[((crc >> 8) ^ byte) & 0xFF]
+    return crc
+
+
+def key_slot(key):
+    """Return the Redis Cluster hash slot of the key.
+
+    Only the first non-empty ``{...}`` hash tag is hashed when the key has one.
+    """
+    if isinstance(key, str):
+        key = key.encode("utf-8")
+    start = key.find(b"{")
+    if start >= 0:
+        end = key.find(b"}", start + 1)
+        if end > start + 1:
+            key = key[start + 1 : end]
+    return crc16(key) % SLOTS
+
+
+def batches_by(keys, group_of):
+    """Group the keys by `group_of` of each key.
+
+    :return: The positions of the keys and the keys for each group.
+    :rtype: Dict[Any,Tuple[List[int],List[str]]]
+    """
+    batches = {}
+    for position, key in enumerate(keys):
+        group = group_of(key)
+        batch = batches.get(group)
+        if batch is None:
+            batch = batches[group] = ([], [])
+        batch[0].append(position)
+        batch[1].append(key)
+    return batches
+
+
+def slot_batches(keys):
+    """Group the keys by their hash slots.
+
+    :return: The pairs of the positions of the keys and the keys of each slot.
+    :rtype: List[Tuple[List[int],List[str]]]
+    """
+    return list(batches_by(keys, key_slot).values())
+
+
+def bucket_keys(hash_key, buckets):
+    """Return the hash keys of the buckets of `hash_key`."""
+    if buckets < 1:
+        raise ValueError("'buckets' must be a positive integer")
+    return ["{}:{}".format(hash_key, index) for index in range(buckets)]
+
+
+def bucket_of(bucket_keys, key):
+    """Return the hash key of the bucket of the field `key`."""
+    if isinstance(key, str):
+        key = key.encode("utf-8")
+    return bucket_keys[zlib.crc32(key) % len(bucket_keys)]
+
+
+def bucket_batches(bucket_keys, keys):
+    """Group the fields by the hash keys of their buckets.
+
+    :see: :func:`batches_by` for the return value.
+    """
+    return batches_by(keys, lambda key: bucket_of(bucket_keys, key))
+
+
+def tag_key(prefix, tag):
+    """Return the key of the ``SET`` of the keys tagged by `tag`."""
+    return prefix + str(tag)
+
+
+def tag_batches(prefix, keys, tags_list):
+    """Group the keys by the keys of their tags.
+
+    :return: The tagged keys for each key of the tags.
+    :rtype: Dict[str,List[str]]
+    """
+    batches = {}
+    for key, tags in zip(keys, tags_list):
+        for tag in tags:
+            batches.setdefault(tag_key(prefix, tag), []).append(key)
+    return batches
+
+
+def chunks(iterable, size):
+    """Split `iterable` into lists of `size` items."""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def merge_batches(batches, results, size):
+    """Reassemble the results of :func:`slot_batches` in the order of keys."""
+    merged = [None] * size
+    for (positions, _), values in zip(batches, results):
+        for position, value in zip(positions, values):
+            merged[position] = value
+    return merged
@@ -6,7 +6,11 @@ stored cache data.
 """
 
 import abc
+import bz2
+import functools
 import six
+import struct
+import zlib
 from collections import namedtuple
 
 try:
@@ -24,6 +28,21 @@ try:
 except ImportError:
     dataclasses = None
 
+try:
+    import lzma
+except ImportError:  # pragma: no cover
+    lzma = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 
 @six.add_metaclass(abc.ABCMeta)
 class Coder(object):
@@ -65,6 +84,41 @@ def coderize(raw_coder):
     return coder
 
 
+class PipelineCoder(Coder):
+    """Coder composing multiple coders as a pipeline.
+
+    `encode` runs the stages in the given order and `decode` runs them in the
+    reverse order. The output of a stage is passed to the next one as it is,
+    so a stage accepting buffers like :class:`memoryview` gets it without an
+    intermediate copy.
+
+    :see: :meth:`ring.coder.Registry.chain` to create one with coder names.
+    """
+
+    __slots__ = ("coders", "_encoders", "_decoders")
+
+    def __init__(self, coders):
+        self.coders = tuple(coders)
+        self._encoders = tuple(coder.encode for coder in self.coders)
+        self._decoders = tuple(coder.decode for coder in reversed(self.coders))
+
+    def encode(self, data):
+        for encode in self._encoders:
+            data = encode(data)
+        return data
+
+    def decode(self, binary):
+        for decode in self._decoders:
+            binary = decode(binary)
+        return binary
+
+
+def _is_pipeline(raw_coder):
+    return isinstance(raw_coder, (tuple, list)) and all(
+        isinstance(c, (str, Coder)) for c in raw_coder
+    )
+
+
 class Registry(object):
     """Coder registry.
 
@@ -101,7 +155,24 @@ class Registry(object):
         coder = self.coders.get(coder_name)
         return coder
 
+    def chain(self, *raw_coders):
+        """Create a :class:`PipelineCoder` of the given coders.
+
+            >>> coder = registry.chain('pickle', 'zlib')
+            >>> @ring.redis(client, coder=coder)
+            ...     ...
+
+        A tuple of coder names is also accepted as `coder` parameter of
+        factories as a shortcut: ``coder=('pickle', 'zlib')``.
+
+        :param Union[str,ring.coder.Coder] raw_coders: Registered coder names
+            or coder objects in encoding order.
+        """
+        return PipelineCoder(self.get_or_coderize(c) for c in raw_coders)
+
     def get_or_coderize(self, raw_coder):
+        if _is_pipeline(raw_coder):
+            return self.chain(*raw_coder)
         coder = self.get(raw_coder)
         if coder is None:
             if isinstance(raw_coder, str):  # py2 support
@@ -149,21 +220,285 @@ class JsonCoder(Coder):
 if dataclasses:
 
     class DataclassCoder(Coder):
-        @staticmethod
-        def encode(data):
-            """Serialize dataclass object to json encoded dictionary"""
-            target_dict = (type(data).__name__, dataclasses.asdict(data))
-            return JsonCoder.encode(target_dict)
+        """Dataclass coder backed by a type registry.
+
+        The encoded data is a JSON array of the type name and the fields.
+        Registered dataclasses are decoded straight into the original class
+        by their names; Otherwise, a substitute dataclass with the same name
+        and fields is created once and reused.
+
+            >>> coder = ring.coder.registry.get('dataclass')
+            >>> @coder.register
+            >>> @dataclasses.dataclass
+            >>> class User:
+            ...     ...
 
-        @staticmethod
-        def decode(binary):
+        :param bool as_tuple: Encode fields of registered dataclasses as a
+            list in the field order instead of a dict for compactness.
+        """
+
+        def __init__(self, as_tuple=False):
+            self.as_tuple = as_tuple
+            self.types = {}
+            self._names = {}
+            self._fields = {}
+            self._init_fields = {}
+            self._substitutes = {}
+
+        def register(self, cls, name=None):
+            """Register `cls` to decode by the `name`.
+
+            The default name is the qualified name of the class. This method
+            returns `cls` to be used as a class decorator.
+            """
+            if not dataclasses.is_dataclass(cls):
+                raise TypeError("'{}' is not a dataclass".format(cls))
+            if name is None:
+                name = "{}.{}".format(cls.__module__, cls.__qualname__)
+            self.types[name] = cls
+            self._names[cls] = name
+            fields = dataclasses.fields(cls)
+            self._fields[cls] = tuple(field.name for field in fields)
+            self._init_fields[cls] = frozenset(
+                field.name for field in fields if field.init
+            )
+            return cls
+
+        def encode(self, data):
+            """Serialize dataclass object to json encoded dictionary"""
+            cls = type(data)
+            name = self._names.get(cls)
+            if name is None:
+                return JsonCoder.encode((cls.__name__, dataclasses.asdict(data)))
+            fields = dataclasses.asdict(data)
+            if self.as_tuple:
+                fields = [fields[key] for key in self._fields[cls]]
+            return JsonCoder.encode((name, fields))
+
+        def decode(self, binary):
             """Deserialize json encoded dictionary to dataclass object"""
             name, fields = JsonCoder.decode(binary)
-            dataclass = dataclasses.make_dataclass(
-                name, [(key, type(value)) for key, value in fields.items()]
+            cls = self.types.get(name)
+            if cls is None:
+                return self._substitute(name, fields)(**fields)
+            if isinstance(fields, list):
+                fields = dict(zip(self._fields[cls], fields))
+            # every init field is given by keyword for `kw_only` fields, and
+            # the others are restored after the construction
+            init_fields = self._init_fields[cls]
+            data = cls(**{k: v for k, v in fields.items() if k in init_fields})
+            for key, value in fields.items():
+                if key not in init_fields:
+                    object.__setattr__(data, key, value)
+            return data
+
+        def _substitute(self, name, fields):
+            spec = tuple((key, type(value)) for key, value in fields.items())
+            key = name, spec
+            cls = self._substitutes.get(key)
+            if cls is None:
+                cls = self._substitutes[key] = dataclasses.make_dataclass(name, spec)
+            return cls
+
+
+# the number of out-of-band buffers, pickle stream length
+_pickle5_header = struct.Struct("<IQ")
+
+
+class Pickle5Coder(Coder):
+    """Pickle protocol 5 coder with out-of-band buffers.
+
+    Buffers of the objects supporting :class:`pickle.PickleBuffer`, like
+    :class:`bytearray` or :class:`numpy.ndarray`, are not copied into the
+    pickle stream. They are laid out after the stream in a single payload:
+
+    - header: the number of buffers and the stream length
+    - the length of each buffer
+    - the pickle stream
+    - the buffers
+
+    Decoding passes :class:`memoryview` slices of the payload as the
+    buffers, so such objects are restored with minimal copying.
+
+    :note: Python 3.8 or later is required.
+    """
+
+    @staticmethod
+    def encode(data):
+        """Dump data to protocol 5 pickle and lay out its buffers."""
+        buffers = []
+        stream = pickle_mod.dumps(data, protocol=5, buffer_callback=buffers.append)
+        raws = [buffer.raw() for buffer in buffers]
+        header = _pickle5_header.pack(len(raws), len(stream))
+        lengths = struct.pack("<{}Q".format(len(raws)), *(r.nbytes for r in raws))
+        return b"".join([header, lengths, stream] + raws)
+
+    @staticmethod
+    def decode(binary):
+        """Load data from the pickle stream and the buffers in the payload."""
+        view = memoryview(binary)
+        count, stream_length = _pickle5_header.unpack_from(view, 0)
+        offset = _pickle5_header.size
+        lengths = struct.unpack_from("<{}Q".format(count), view, offset)
+        offset += 8 * count
+        stream = view[offset : offset + stream_length]
+        offset += stream_length
+        buffers = []
+        for length in lengths:
+            buffers.append(view[offset : offset + length])
+            offset += length
+        return pickle_mod.loads(stream, buffers=buffers)
+
+
+# ndim, order, dtype length
+_numpy_header = struct.Struct("<BcB")
+#: The alignment of the array buffer from the beginning of the data.
+_numpy_alignment = 16
+
+
+def _numpy_padding(size):
+    return -size % _numpy_alignment
+
+
+class NumpyCoder(Coder):
+    """Zero-copy :class:`numpy.ndarray` coder.
+
+    The encoded data is a tiny header of the number of dimensions, memory
+    order, dtype and shape followed by the raw array buffer. The header is
+    padded to 16 bytes, so the decoded arrays are aligned when the data
+    itself is aligned, like :class:`bytes` objects. Decoding creates
+    the array by :func:`numpy.frombuffer` on the given data without copying,
+    so the decoded array is read-only when the data is :class:`bytes`.
+
+    Only arrays of plain dtypes are supported; Use pickle coder for object or
+    structured arrays. :mod:`numpy` is imported at the first use.
+    """
+
+    @staticmethod
+    def encode(data):
+        """Dump the header and the raw buffer of the array to bytes."""
+        import numpy
+
+        dtype = data.dtype
+        if dtype.hasobject or dtype.fields is not None or dtype.subdtype:
+            raise ValueError(
+                "NumpyCoder doesn't support dtype '{}'. Use pickle coder.".format(
+                    dtype
+                )
             )
-            instance = dataclass(**fields)
-            return instance
+        if data.flags.c_contiguous:
+            order = b"C"
+        elif data.flags.f_contiguous:
+            order = b"F"
+        else:
+            data = numpy.ascontiguousarray(data)
+            order = b"C"
+        dtype_str = dtype.str.encode("ascii")
+        header = _numpy_header.pack(data.ndim, order, len(dtype_str))
+        shape = struct.pack("<{}Q".format(data.ndim), *data.shape)
+        padding = _numpy_padding(len(header) + len(dtype_str) + len(shape))
+        buffer = data.ravel(order="K").view(numpy.uint8).data
+        return b"".join((header, dtype_str, shape, b"\0" * padding, buffer))
+
+    @staticmethod
+    def decode(binary):
+        """Create an array on the buffer of the given data without copying."""
+        import numpy
+
+        ndim, order, dtype_len = _numpy_header.unpack_from(binary, 0)
+        offset = _numpy_header.size
+        dtype = numpy.dtype(bytes(binary[offset : offset + dtype_len]).decode())
+        offset += dtype_len
+        shape = struct.unpack_from("<{}Q".format(ndim), binary, offset)
+        offset += 8 * ndim
+        offset += _numpy_padding(offset)
+        array = numpy.frombuffer(binary, dtype=dtype, offset=offset)
+        return array.reshape(shape, order=order.decode())
+
+
+#: Compression codec with the one-byte payload header `tag`.
+#: `level_keyword` is the keyword parameter name of `compress` for the level.
+Codec = namedtuple("Codec", ["tag", "compress", "decompress", "level_keyword"])
+
+#: Available compression codecs by name. :mod:`zlib`, :mod:`bz2` and
+#: :mod:`lzma` are always available; `lz4` and `zstd` are available when
+#: :mod:`lz4` or :mod:`zstandard` packages are installed.
+codecs = {
+    "zlib": Codec(1, zlib.compress, zlib.decompress, "level"),
+    "bz2": Codec(2, bz2.compress, bz2.decompress, "compresslevel"),
+}
+if lzma:
+    codecs["lzma"] = Codec(3, lzma.compress, lzma.decompress, "preset")
+if lz4_frame:
+    codecs["lz4"] = Codec(
+        4, lz4_frame.compress, lz4_frame.decompress, "compression_level"
+    )
+if zstandard:
+    codecs["zstd"] = Codec(
+        5,
+        lambda data, level=3: zstandard.ZstdCompressor(level=level).compress(data),
+        lambda data: zstandard.ZstdDecompressor().decompress(data),
+        "level",
+    )
+
+_decompressors = {codec.tag: codec.decompress for codec in codecs.values()}
+_RAW_TAG = b"\x00"
+
+
+class CompressionCoder(Coder):
+    """Compressing coder wrapping another coder.
+
+    The encoded payload of the wrapped coder is compressed only when it is
+    larger than `threshold` bytes. The result is prefixed by a one-byte header
+    of the codec tag, so that decode works regardless of the codec and the
+    threshold of the encoder.
+
+        >>> coder = CompressionCoder('pickle', 'zlib', threshold=1024)
+        >>> @ring.memcache(client, coder=coder)
+        >>> def f(...):
+        ...     ...
+
+    :param Union[str,ring.coder.Coder] coder: A registered coder name or
+        a coder object which encodes data to :class:`bytes`. The default value
+        :data:`None` is the bypass coder for :class:`bytes` data.
+    :param str codec: A name in :data:`ring.coder.codecs`.
+    :param int threshold: The minimum payload bytes to compress.
+    :param Optional[int] level: The compression level of the codec.
+    """
+
+    def __init__(self, coder=None, codec="zlib", threshold=1024, level=None):
+        try:
+            self.codec = codecs[codec]
+        except KeyError:
+            raise TypeError("The given codec '{}' is not available".format(codec))
+        self.coder = registry.get_or_coderize(coder)
+        self.threshold = threshold
+        self._compress = self.codec.compress
+        if level is not None:
+            self._compress = functools.partial(
+                self._compress, **{self.codec.level_keyword: level}
+            )
+        self._tag = six.int2byte(self.codec.tag)
+
+    def encode(self, data):
+        """Encode data by the wrapped coder and compress it if it is large."""
+        payload = self.coder.encode(data)
+        if len(payload) < self.threshold:
+            return _RAW_TAG + payload
+        return self._tag + self._compress(payload)
+
+    def decode(self, binary):
+        """Decompress data by its header and decode it by the wrapped coder."""
+        tag = six.indexbytes(binary, 0)
+        if tag == 0:
+            payload = binary[1:]
+        else:
+            try:
+                decompress = _decompressors[tag]
+            except KeyError:
+                raise ValueError("Unknown compression header '{}'".format(tag))
+            payload = decompress(memoryview(binary)[1:])
+        return self.coder.decode(payload)
 
 
 #: The default coder registry with pre-registered coders.
@@ -177,3 +512,9 @@ registry.register("pickle", pickle_coder)
 
 if dataclasses:
     registry.register("dataclass", DataclassCoder())
+registry.register("numpy", NumpyCoder())
+if pickle_mod.HIGHEST_PROTOCOL >= 5:
+    registry.register("pickle5", Pickle5Coder())
+
+for _codec in codecs:
+    registry.register(_codec, CompressionCoder(None, _codec))
@@ -2,57 +2,77 @@
 ==========================================
 
 Ring object factory functions are aggregated in this module.
+
+Each factory is created at the first access with its backend modules.
 """
 
 from __future__ import absolute_import
-from ring.func import sync
 
-try:
-    import asyncio as _has_asyncio
-except ImportError:
-    _has_asyncio = False
-else:
-    from ring.func import asyncio
+import importlib
 
 
-__all__ = ("lru", "dict", "memcache", "redis", "redis_hash", "shelve", "disk")
+__all__ = (
+    "lru",
+    "weak",
+    "dict",
+    "memcache",
+    "redis",
+    "redis_hash",
+    "shelve",
+    "disk",
+    "mmap",
+    "sqlite",
+)
 
+# name: (sync factory, asyncio factory or storage class, support_asyncio)
+_factory_specs = {
+    "lru": ("lru", "LruStorage", False),
+    "weak": ("weak", "WeakValueStorage", False),
+    "dict": ("dict", "dict", True),
+    "shelve": ("shelve", "ShelveStorage", False),
+    "disk": ("diskcache", "DiskCacheStorage", False),
+    "mmap": ("mmap", "MmapStorage", False),
+    "sqlite": ("sqlite", "sqlite", True),
+    "memcache": ("memcache", "aiomcache", True),
+    "redis": ("redis_py", "aioredis", True),
+    "redis_hash": ("redis_py_hash", "aioredis_hash", True),
+}
 
-if _has_asyncio:
-    lru = asyncio.create_asyncio_factory_proxy(
-        (sync.lru, asyncio.create_factory_from(sync.lru, sync.LruStorage)),
-        support_asyncio=False,
-    )
-    dict = asyncio.create_asyncio_factory_proxy(
-        (sync.dict, asyncio.dict), support_asyncio=True
-    )
-    shelve = asyncio.create_asyncio_factory_proxy(
-        (sync.shelve, asyncio.create_factory_from(sync.shelve, sync.ShelveStorage)),
-        support_asyncio=False,
-    )
-    disk = asyncio.create_asyncio_factory_proxy(
-        (
-            sync.diskcache,
-            asyncio.create_factory_from(sync.diskcache, sync.DiskCacheStorage),
-        ),
-        support_asyncio=False,
-    )
-    memcache = asyncio.create_asyncio_factory_proxy(
-        (sync.memcache, asyncio.aiomcache), support_asyncio=True
-    )
-    redis = asyncio.create_asyncio_factory_proxy(
-        (sync.redis_py, asyncio.aioredis), support_asyncio=True
-    )
-    redis_hash = asyncio.create_asyncio_factory_proxy(
-        (sync.redis_py_hash, asyncio.aioredis_hash), support_asyncio=True
-    )
-else:
-    from .sync import (
-        lru,
-        dict,
-        shelve,
-        diskcache as disk,
-        memcache,
-        redis_py as redis,
-        redis_py_hash as redis_hash,
+
+def _create_factory(name):
+    sync_name, asyncio_name, support_asyncio = _factory_specs[name]
+    sync = importlib.import_module("ring.func.sync")
+    sync_factory = getattr(sync, sync_name)
+    try:
+        asyncio = importlib.import_module("ring.func.asyncio")
+    except ImportError:  # pragma: no cover
+        return sync_factory
+
+    if support_asyncio:
+        asyncio_factory = getattr(asyncio, asyncio_name)
+    else:
+        asyncio_factory = asyncio.create_factory_from(
+            sync_factory, getattr(sync, asyncio_name)
+        )
+    return asyncio.create_asyncio_factory_proxy(
+        (sync_factory, asyncio_factory), support_asyncio=support_asyncio
     )
+
+
+def __getattr__(name):
+    if name in _factory_specs:
+        factory = _create_factory(name)
+        globals()[name] = factory
+        return factory
+    if not name.startswith("__"):
+        try:
+            return importlib.import_module(__name__ + "." + name)
+        except ImportError as e:
+            raise AttributeError(
+                "module '{}' has no attribute '{}'".format(__name__, name)
+            ) from e
+    raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -13,11 +13,13 @@ import asyncio
 import inspect
 import itertools
 from . import base as fbase, sync as fsync
+from .. import _redis
 from asyncio import Lock
 
 __all__ = (
     "aiomcache",
     "aioredis",
+    "sqlite",
 )
 
 inspect_iscoroutinefunction = getattr(inspect, "iscoroutinefunction", lambda f: False)
@@ -89,7 +91,7 @@ def create_asyncio_factory_proxy(factory_table, *, support_asyncio):
 def async_wrap(func):
     @wraps(func)
     async def run(*args, _executor=None, **kwargs):
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         pfunc = partial(func, *args, **kwargs)
         return await loop.run_in_executor(_executor, pfunc)
 
@@ -118,12 +120,13 @@ def convert_storage(storage_class):
 
 def create_factory_from(sync_factory, _storage_class):
     """Create :mod:`asyncio` compatible factory from synchronous storage."""
+    storage_class = convert_storage(_storage_class)
 
     def factory(*args, **kwargs):
         if "user_interface" not in kwargs:
             kwargs["user_interface"] = CacheUserInterface
         if "storage_class" not in kwargs:
-            kwargs["storage_class"] = convert_storage(_storage_class)
+            kwargs["storage_class"] = storage_class
         return sync_factory(*args, **kwargs)
 
     return factory
@@ -139,17 +142,32 @@ def factory_doctor(wire_rope) -> None:
         )
 
 
+async def _offload(config, func, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(config.offload_executor, func, *args)
+
+
 class CommonMixinStorage(fbase.BaseStorage):  # Working only as mixin
-    """General :mod:`asyncio` storage root for BaseStorageMixin."""
+    """General :mod:`asyncio` storage root for BaseStorageMixin.
+
+    Large payloads are decoded in the executor instead of the event loop by
+    `offload_threshold` and `offload_executor` factory parameters.
+    """
 
     async def get(self, key):
         value = await self.get_value(key)
+        threshold = self.rope.config.offload_threshold
+        if threshold is not None and fbase.payload_size(value) >= threshold:
+            return await _offload(self.rope.config, self.rope.decode, value)
         return self.rope.decode(value)
 
     async def set(self, key, value, expire=...):
         if expire is ...:
             expire = self.rope.config.expire_default
-        encoded = self.rope.encode(value)
+        if self.rope.config.offload_threshold == 0:
+            encoded = await _offload(self.rope.config, self.rope.encode, value)
+        else:
+            encoded = self.rope.encode(value)
         result = await self.set_value(key, encoded, expire)
         return result
 
@@ -187,6 +205,7 @@ class CacheUserInterface(fbase.BaseUserInterface):
     async def update(self, wire, **kwargs):
         key = self.key(wire, **kwargs)
         result = await self.execute(wire, **kwargs)
+        await _tag(wire, [key], [kwargs["pargs"]])
         await wire.storage.set(key, result)
         return result
 
@@ -196,6 +215,7 @@ class CacheUserInterface(fbase.BaseUserInterface):
             result = await wire.storage.get(key)
         except fbase.NotFound:
             result = await self.execute(wire, **kwargs)
+            await _tag(wire, [key], [kwargs["pargs"]])
             await wire.storage.set(key, result)
         return result
 
@@ -205,11 +225,17 @@ class CacheUserInterface(fbase.BaseUserInterface):
     )
     def set(self, wire, _value, **kwargs):
         key = self.key(wire, **kwargs)
+        tagged = wire._rope.tag(wire, [key], [kwargs["pargs"]])
+        if tagged is not None:
+            return _chain(tagged, wire.storage.set, key, _value)
         return wire.storage.set(key, _value)
 
     @fbase.interface_attrs(return_annotation=None)
     def delete(self, wire, **kwargs):
         key = self.key(wire, **kwargs)
+        untagged = wire._rope.untag(wire, [key], [kwargs["pargs"]])
+        if untagged is not None:
+            return _chain(untagged, wire.storage.delete, key)
         return wire.storage.delete(key)
 
     @fbase.interface_attrs(return_annotation=bool)
@@ -254,6 +280,7 @@ class BulkInterfaceMixin(fbase.AbstractBulkUserInterfaceMixin):
     async def update_many(self, wire, pargs):
         keys = self.key_many(wire, pargs)
         values = await self.execute_many(wire, pargs)
+        await _tag(wire, keys, pargs.args)
         await wire.storage.set_many(keys, values)
         return values
 
@@ -277,6 +304,7 @@ class BulkInterfaceMixin(fbase.AbstractBulkUserInterfaceMixin):
             *(fbase.execute_bulk_item(wire, pargs.args[i]) for i in miss_indices)
         )
         new_keys = [keys[i] for i in miss_indices]
+        await _tag(wire, new_keys, [pargs.args[i] for i in miss_indices])
         await wire.storage.set_many(new_keys, new_results)
 
         for new_i, old_i in enumerate(miss_indices):
@@ -289,6 +317,9 @@ class BulkInterfaceMixin(fbase.AbstractBulkUserInterfaceMixin):
     def set_many(self, wire, pargs):
         args_list, value_list = pargs.args
         keys = self.key_many(wire, fbase.ArgPack((), args_list, {}))
+        tagged = wire._rope.tag(wire, keys, args_list)
+        if tagged is not None:
+            return _chain(tagged, wire.storage.set_many, keys, value_list)
         return wire.storage.set_many(keys, value_list)
 
     @fbase.interface_attrs(
@@ -296,6 +327,9 @@ class BulkInterfaceMixin(fbase.AbstractBulkUserInterfaceMixin):
     )
     def delete_many(self, wire, pargs):
         keys = self.key_many(wire, pargs)
+        untagged = wire._rope.untag(wire, keys, pargs.args)
+        if untagged is not None:
+            return _chain(untagged, wire.storage.delete_many, keys)
         return wire.storage.delete_many(keys)
 
     @fbase.interface_attrs(
@@ -313,21 +347,62 @@ class BulkInterfaceMixin(fbase.AbstractBulkUserInterfaceMixin):
         return wire.storage.touch_many(keys)
 
 
+async def _tag(wire, keys, args_list):
+    tagged = wire._rope.tag(wire, keys, args_list)
+    if tagged is not None:
+        await tagged
+
+
+async def _chain(awaitable, func, *args):
+    await awaitable
+    return await func(*args)
+
+
+async def _achunks(aiterable, size):
+    chunk = []
+    async for item in aiterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _decode_many(decode, values, miss_value):
+    return [decode(v) if v is not fbase.NotFound else miss_value for v in values]
+
+
+def _encode_many(encode, values):
+    return [encode(v) for v in values]
+
+
 class BulkStorageMixin(object):
     async def get_many(self, keys, miss_value):
         """Get and return values for the given key."""
         values = await self.get_many_values(keys)
-        results = [
-            self.rope.decode(v) if v is not fbase.NotFound else miss_value  # noqa
-            for v in values
-        ]
-        return results
+        config = self.rope.config
+        threshold = config.offload_threshold
+        if threshold is not None and (
+            sum(fbase.payload_size(v) for v in values if v is not fbase.NotFound)
+            >= threshold
+        ):
+            return await _offload(
+                config, _decode_many, self.rope.decode, values, miss_value
+            )
+        return _decode_many(self.rope.decode, values, miss_value)
 
-    def set_many(self, keys, values, expire=Ellipsis):
+    async def set_many(self, keys, values, expire=Ellipsis):
         """Set values for the given keys."""
         if expire is Ellipsis:
             expire = self.rope.config.expire_default
-        return self.set_many_values(keys, [self.rope.encode(v) for v in values], expire)
+        if self.rope.config.offload_threshold == 0:
+            encoded = await _offload(
+                self.rope.config, _encode_many, self.rope.encode, values
+            )
+        else:
+            encoded = _encode_many(self.rope.encode, values)
+        return await self.set_many_values(keys, encoded, expire)
 
     def delete_many(self, keys):
         """Delete values for the given keys."""
@@ -424,6 +499,44 @@ class Aioredis1Storage(CommonMixinStorage, fbase.StorageMixin, BulkStorageMixin)
             )
 
 
+class Aioredis1ClusterStorage(Aioredis1Storage):
+    """Storage implementation for :class:`aioredis.Redis` of Redis Cluster.
+
+    :see: :class:`ring.func.sync.RedisClusterStorage` for the bulk operations.
+    """
+
+    async def get_many_values(self, keys):
+        backend = await self._get_backend()
+        batches = _redis.slot_batches(keys)
+        results = await asyncio.gather(
+            *(backend.mget(*batch_keys) for _, batch_keys in batches)
+        )
+        values = _redis.merge_batches(batches, results, len(keys))
+        return [v if v is not None else fbase.NotFound for v in values]
+
+    async def set_many_values(self, keys, values, expire):
+        backend = await self._get_backend()
+        await asyncio.gather(
+            *(
+                backend.mset(
+                    *itertools.chain.from_iterable(
+                        (k, values[p]) for p, k in zip(positions, batch_keys)
+                    )
+                )
+                for positions, batch_keys in _redis.slot_batches(keys)
+            )
+        )
+        if expire is not None:
+            asyncio.ensure_future(
+                asyncio.gather(*(backend.expire(key, expire) for key in keys))
+            )
+
+    async def delete_many_values(self, keys):
+        backend = await self._get_backend()
+        batches = _redis.slot_batches(keys)
+        await asyncio.gather(*(backend.delete(*bkeys) for _, bkeys in batches))
+
+
 class Aioredis1HashStorage(Aioredis1Storage):
     """Storage implementation for :class:`aioredis.Redis`."""
 
@@ -465,6 +578,84 @@ class Aioredis1HashStorage(Aioredis1Storage):
         await backend.hmset(self.hash_key, *params)
 
 
+class Aioredis1BucketedHashStorage(Aioredis1HashStorage):
+    """Storage implementation for :class:`aioredis.Redis` over bucket hashes.
+
+    :see: :class:`ring.func.sync.RedisBucketedHashStorage` for the buckets.
+    """
+
+    def __init__(self, rope, backend):
+        self.bucket_keys = _redis.bucket_keys(backend[1], backend[2])
+        super(Aioredis1BucketedHashStorage, self).__init__(rope, backend)
+
+    def _bucket_of(self, key):
+        return _redis.bucket_of(self.bucket_keys, key)
+
+    async def get_value(self, key):
+        backend = await self._get_backend()
+        value = await backend.hget(self._bucket_of(key), key)
+        if value is None:
+            raise fbase.NotFound
+        return value
+
+    async def set_value(self, key, value, expire):
+        bucket = self._bucket_of(key)
+        backend = await self._get_backend()
+        pipeline = backend.pipeline()
+        pipeline.hset(bucket, key, value)
+        if expire is not None:
+            pipeline.expire(bucket, expire)
+        await pipeline.execute()
+
+    async def delete_value(self, key):
+        backend = await self._get_backend()
+        result = await backend.hdel(self._bucket_of(key), key)
+        return result
+
+    async def has_value(self, key):
+        backend = await self._get_backend()
+        result = await backend.hexists(self._bucket_of(key), key)
+        return bool(result)
+
+    async def touch_value(self, key, expire):
+        if expire is None:
+            raise TypeError("'touch' is requested for persistent cache")
+        backend = await self._get_backend()
+        result = await backend.expire(self._bucket_of(key), expire)
+        return result
+
+    async def get_many_values(self, keys):
+        batches = _redis.bucket_batches(self.bucket_keys, keys)
+        backend = await self._get_backend()
+        pipeline = backend.pipeline()
+        for bucket, (_, batch_keys) in batches.items():
+            pipeline.hmget(bucket, *batch_keys)
+        results = await pipeline.execute()
+        values = _redis.merge_batches(list(batches.values()), results, len(keys))
+        return [v if v is not None else fbase.NotFound for v in values]
+
+    async def set_many_values(self, keys, values, expire):
+        batches = _redis.bucket_batches(self.bucket_keys, keys)
+        backend = await self._get_backend()
+        pipeline = backend.pipeline()
+        for bucket, (positions, batch_keys) in batches.items():
+            params = itertools.chain.from_iterable(
+                (k, values[p]) for p, k in zip(positions, batch_keys)
+            )
+            pipeline.hmset(bucket, *params)
+            if expire is not None:
+                pipeline.expire(bucket, expire)
+        await pipeline.execute()
+
+    async def delete_many_values(self, keys):
+        batches = _redis.bucket_batches(self.bucket_keys, keys)
+        backend = await self._get_backend()
+        pipeline = backend.pipeline()
+        for bucket, (_, batch_keys) in batches.items():
+            pipeline.hdel(bucket, *batch_keys)
+        await pipeline.execute()
+
+
 class Aioredis2Storage(CommonMixinStorage, fbase.StorageMixin, BulkStorageMixin):
     """Storage implementation for :class:`aioredis.Redis`."""
 
@@ -515,10 +706,119 @@ class Aioredis2Storage(CommonMixinStorage, fbase.StorageMixin, BulkStorageMixin)
                 asyncio.gather(*(backend.expire(key, expire) for key in keys))
             )
 
+    async def get_generation_value(self, key):
+        backend = await self._get_backend()
+        return int(await backend.get(key) or 0)
+
+    async def incr_generation_value(self, key):
+        backend = await self._get_backend()
+        return await backend.incr(key)
+
+    async def scan_delete_values(self, pattern, count):
+        """Delete the keys matching `pattern` by ``SCAN`` and ``UNLINK``."""
+        backend = await self._get_backend()
+        keys = backend.scan_iter(match=pattern, count=count)
+        async for batch in _achunks(keys, count):
+            await self._unlink_many(batch, count)
+
+    async def tag_values(self, keys, tags_list):
+        """Add the keys to the ``SET`` of each of their tags."""
+        backend = await self._get_backend()
+        pipeline = backend.pipeline(transaction=False)
+        batches = _redis.tag_batches(self.rope.tag_key_prefix, keys, tags_list)
+        for tag_key, tagged_keys in batches.items():
+            pipeline.sadd(tag_key, *tagged_keys)
+        await pipeline.execute()
+
+    async def untag_values(self, keys, tags_list):
+        """Remove the keys from the ``SET`` of each of their tags."""
+        backend = await self._get_backend()
+        pipeline = backend.pipeline(transaction=False)
+        batches = _redis.tag_batches(self.rope.tag_key_prefix, keys, tags_list)
+        for tag_key, tagged_keys in batches.items():
+            pipeline.srem(tag_key, *tagged_keys)
+        await pipeline.execute()
+
+    async def invalidate_tag_values(self, tags, batch_size):
+        """Delete the keys in the ``SET`` of the tags and the sets."""
+        prefix = self.rope.tag_key_prefix
+        tag_keys = [_redis.tag_key(prefix, tag) for tag in tags]
+        if not tag_keys:
+            return
+        await self._unlink_many(await self._pop_members(tag_keys), batch_size)
+
+    async def _pop_members(self, set_keys):
+        backend = await self._get_backend()
+        pipeline = backend.pipeline()
+        for set_key in set_keys:
+            pipeline.smembers(set_key)
+        pipeline.unlink(*set_keys)
+        return set().union(*(await pipeline.execute())[:-1])
+
+    async def _unlink_many(self, keys, batch_size):
+        backend = await self._get_backend()
+        pipeline = backend.pipeline(transaction=False)
+        for batch in _redis.chunks(keys, batch_size):
+            pipeline.unlink(*batch)
+        await pipeline.execute()
+
+
+class Aioredis2ClusterStorage(Aioredis2Storage):
+    """Storage implementation for :class:`aioredis.Redis` of Redis Cluster.
+
+    :see: :class:`ring.func.sync.RedisClusterStorage` for the bulk operations.
+    """
+
+    async def get_many_values(self, keys):
+        backend = await self._get_backend()
+        batches = _redis.slot_batches(keys)
+        results = await asyncio.gather(
+            *(backend.mget(*batch_keys) for _, batch_keys in batches)
+        )
+        values = _redis.merge_batches(batches, results, len(keys))
+        return [v if v is not None else fbase.NotFound for v in values]
+
+    async def set_many_values(self, keys, values, expire):
+        backend = await self._get_backend()
+        await asyncio.gather(
+            *(
+                backend.mset({k: values[p] for p, k in zip(positions, batch_keys)})
+                for positions, batch_keys in _redis.slot_batches(keys)
+            )
+        )
+        if expire is not None:
+            asyncio.ensure_future(
+                asyncio.gather(*(backend.expire(key, expire) for key in keys))
+            )
+
+    async def delete_many_values(self, keys):
+        backend = await self._get_backend()
+        batches = _redis.slot_batches(keys)
+        await asyncio.gather(*(backend.delete(*bkeys) for _, bkeys in batches))
+
+    async def _pop_members(self, set_keys):
+        backend = await self._get_backend()
+        results = await asyncio.gather(*(backend.smembers(k) for k in set_keys))
+        return set().union(*results).union(set_keys)
+
+    async def _unlink_many(self, keys, batch_size):
+        backend = await self._get_backend()
+        batches = [
+            batch_keys
+            for batch in _redis.chunks(keys, batch_size)
+            for _, batch_keys in _redis.slot_batches(batch)
+        ]
+        await asyncio.gather(*(backend.unlink(*bkeys) for bkeys in batches))
+
 
 class Aioredis2HashStorage(Aioredis2Storage):
     """Storage implementation for :class:`aioredis.Redis`."""
 
+    # the entries are the fields of a hash, which can't be unlinked
+    tag_values = None
+    untag_values = None
+    invalidate_tag_values = None
+
     def __init__(self, rope, backend):
         storage_backend = backend[0]
         self.hash_key = backend[1]
@@ -556,6 +856,117 @@ class Aioredis2HashStorage(Aioredis2Storage):
         backend = await self._get_backend()
         await backend.hmset(self.hash_key, params)
 
+    async def scan_delete_values(self, pattern, count):
+        """Delete the fields matching `pattern` by ``HSCAN`` and ``HDEL``."""
+        await self._scan_delete_fields(self.hash_key, pattern, count)
+
+    async def _scan_delete_fields(self, hash_key, pattern, count):
+        backend = await self._get_backend()
+        items = backend.hscan_iter(hash_key, match=pattern, count=count)
+        async for batch in _achunks(items, count):
+            await backend.hdel(hash_key, *(field for field, _ in batch))
+
+
+class Aioredis2BucketedHashStorage(Aioredis2HashStorage):
+    """Storage implementation for :class:`aioredis.Redis` over bucket hashes.
+
+    :see: :class:`ring.func.sync.RedisBucketedHashStorage` for the buckets.
+    """
+
+    def __init__(self, rope, backend):
+        self.bucket_keys = _redis.bucket_keys(backend[1], backend[2])
+        super(Aioredis2BucketedHashStorage, self).__init__(rope, backend)
+
+    def _bucket_of(self, key):
+        return _redis.bucket_of(self.bucket_keys, key)
+
+    async def get_value(self, key):
+        backend = await self._get_backend()
+        value = await backend.hget(self._bucket_of(key), key)
+        if value is None:
+            raise fbase.NotFound
+        return value
+
+    async def set_value(self, key, value, expire):
+        bucket = self._bucket_of(key)
+        backend = await self._get_backend()
+        pipeline = backend.pipeline(transaction=False)
+        pipeline.hset(bucket, key, value)
+        if expire is not None:
+            pipeline.expire(bucket, expire)
+        await pipeline.execute()
+
+    async def delete_value(self, key):
+        backend = await self._get_backend()
+        result = await backend.hdel(self._bucket_of(key), key)
+        return result
+
+    async def has_value(self, key):
+        backend = await self._get_backend()
+        result = await backend.hexists(self._bucket_of(key), key)
+        return bool(result)
+
+    async def touch_value(self, key, expire):
+        if expire is None:
+            raise TypeError("'touch' is requested for persistent cache")
+        backend = await self._get_backend()
+        result = await backend.expire(self._bucket_of(key), expire)
+        return result
+
+    async def get_many_values(self, keys):
+        batches = _redis.bucket_batches(self.bucket_keys, keys)
+        backend = await self._get_backend()
+        pipeline = backend.pipeline(transaction=False)
+        for bucket, (_, batch_keys) in batches.items():
+            pipeline.hmget(bucket, batch_keys)
+        results = await pipeline.execute()
+        values = _redis.merge_batches(list(batches.values()), results, len(keys))
+        return [v if v is not None else fbase.NotFound for v in values]
+
+    async def set_many_values(self, keys, values, expire):
+        batches = _redis.bucket_batches(self.bucket_keys, keys)
+        backend = await self._get_backend()
+        pipeline = backend.pipeline(transaction=False)
+        for bucket, (positions, batch_keys) in batches.items():
+            mapping = {k: values[p] for p, k in zip(positions, batch_keys)}
+            pipeline.hset(bucket, mapping=mapping)
+            if expire is not None:
+                pipeline.expire(bucket, expire)
+        await pipeline.execute()
+
+    async def delete_many_values(self, keys):
+        batches = _redis.bucket_batches(self.bucket_keys, keys)
+        backend = await self._get_backend()
+        pipeline = backend.pipeline(transaction=False)
+        for bucket, (_, batch_keys) in batches.items():
+            pipeline.hdel(bucket, *batch_keys)
+        await pipeline.execute()
+
+    async def scan_delete_values(self, pattern, count):
+        for bucket in self.bucket_keys:
+            await self._scan_delete_fields(bucket, pattern, count)
+
+
+class SqliteStorage(CommonMixinStorage, BulkStorageMixin, fsync.SqliteStorage):
+    """Storage implementation for :mod:`sqlite3` for :mod:`asyncio`.
+
+    Every statement runs in the default executor not to block the event loop.
+
+    :see: :class:`ring.func.sync.SqliteStorage` for the table layout.
+    """
+
+    get_value = async_wrap(fsync.SqliteStorage.get_value)
+    set_value = async_wrap(fsync.SqliteStorage.set_value)
+    delete_value = async_wrap(fsync.SqliteStorage.delete_value)
+    has_value = async_wrap(fsync.SqliteStorage.has_value)
+    touch_value = async_wrap(fsync.SqliteStorage.touch_value)
+    get_many_values = async_wrap(fsync.SqliteStorage.get_many_values)
+    set_many_values = async_wrap(fsync.SqliteStorage.set_many_values)
+    delete_many_values = async_wrap(fsync.SqliteStorage.delete_many_values)
+    has_many_values = async_wrap(fsync.SqliteStorage.has_many_values)
+    touch_many_values = async_wrap(fsync.SqliteStorage.touch_many_values)
+    sweep = async_wrap(fsync.SqliteStorage.sweep)
+
 
 def dict(
     obj,
@@ -590,6 +1001,33 @@ def dict(
     )
 
 
+def sqlite(
+    db,
+    key_prefix=None,
+    expire=None,
+    coder=None,
+    table="ring_cache",
+    user_interface=(CacheUserInterface, BulkInterfaceMixin),
+    storage_class=SqliteStorage,
+    **kwargs,
+):
+    """:mod:`sqlite3` interface for :mod:`asyncio`.
+
+    :see: :func:`ring.func.sync.sqlite` for common description.
+    """
+    return fbase.factory(
+        (db, table),
+        key_prefix=key_prefix,
+        on_manufactured=factory_doctor,
+        user_interface=user_interface,
+        storage_class=storage_class,
+        miss_value=None,
+        expire_default=expire,
+        coder=coder,
+        **kwargs,
+    )
+
+
 def aiomcache(
     client,
     key_prefix=None,
@@ -717,7 +1155,9 @@ def aioredis1_hash(
     key_prefix=None,
     coder=None,
     user_interface=(CacheUserInterface, BulkInterfaceMixin),
-    storage_class=Aioredis1HashStorage,
+    storage_class=None,
+    buckets=None,
+    expire=None,
     **kwargs,
 ):
     """Redis interface for :mod:`asyncio`.
@@ -751,19 +1191,34 @@ def aioredis1_hash(
             >>> async def by_coroutine(...):
             >>>     ...
 
+    :param Optional[int] buckets: Spread the fields over the given number
+        of hashes instead of the single `hash_key`.
+    :param Optional[float] expire: The TTL of each bucket, refreshed by every
+        write to the bucket. It requires `buckets`.
+
     :see: :func:`ring.func.asyncio.CacheUserInterface` for single access
         sub-functions.
     :see: :func:`ring.func.asyncio.BulkInterfaceMixin` for bulk access
         sub-functions.
+    :see: :class:`ring.func.sync.RedisBucketedHashStorage` for the buckets.
 
     :see: :func:`ring.redis` for non-asyncio version.
     """
-    expire = None
     if asyncio.iscoroutine(redis):
         redis = SingletonCoroutineProxy(redis)
 
+    if buckets is None:
+        if expire is not None:
+            raise TypeError("'expire' requires 'buckets'")
+        backend = (redis, hash_key)
+        if storage_class is None:
+            storage_class = Aioredis1HashStorage
+    else:
+        backend = (redis, hash_key, buckets)
+        if storage_class is None:
+            storage_class = Aioredis1BucketedHashStorage
     return fbase.factory(
-        (redis, hash_key),
+        backend,
         key_prefix=key_prefix,
         on_manufactured=factory_doctor,
         user_interface=user_interface,
@@ -850,7 +1305,9 @@ def aioredis2_hash(
     key_prefix=None,
     coder=None,
     user_interface=(CacheUserInterface, BulkInterfaceMixin),
-    storage_class=Aioredis2HashStorage,
+    storage_class=None,
+    buckets=None,
+    expire=None,
     **kwargs,
 ):
     """Redis interface for :mod:`asyncio`.
@@ -884,19 +1341,34 @@ def aioredis2_hash(
             >>> async def by_coroutine(...):
             >>>     ...
 
+    :param Optional[int] buckets: Spread the fields over the given number
+        of hashes instead of the single `hash_key`.
+    :param Optional[float] expire: The TTL of each bucket, refreshed by every
+        write to the bucket. It requires `buckets`.
+
     :see: :func:`ring.func.asyncio.CacheUserInterface` for single access
         sub-functions.
     :see: :func:`ring.func.asyncio.BulkInterfaceMixin` for bulk access
         sub-functions.
+    :see: :class:`ring.func.sync.RedisBucketedHashStorage` for the buckets.
 
     :see: :func:`ring.redis` for non-asyncio version.
     """
-    expire = None
     if asyncio.iscoroutine(redis):
         redis = SingletonCoroutineProxy(redis)
 
+    if buckets is None:
+        if expire is not None:
+            raise TypeError("'expire' requires 'buckets'")
+        backend = (redis, hash_key)
+        if storage_class is None:
+            storage_class = Aioredis2HashStorage
+    else:
+        backend = (redis, hash_key, buckets)
+        if storage_class is None:
+            storage_class = Aioredis2BucketedHashStorage
     return fbase.factory(
-        (redis, hash_key),
+        backend,
         key_prefix=key_prefix,
         on_manufactured=factory_doctor,
         user_interface=user_interface,
@@ -5,7 +5,11 @@
 
 import abc
 import collections
+import hashlib
+import string
+import sys
 import types
+import weakref
 from typing import List
 
 import attr
@@ -13,15 +17,10 @@ import six
 from wirerope import Wire, WireRope, RopeCore
 from .._compat import functools, inspect, qualname
 from ..callable import Callable
-from ..key import CallableKey
+from ..key import CallableKey, key_hash_of
 from ..coder import registry as default_registry
 from .._util import cached_property
 
-try:
-    import numpy
-except ImportError:
-    numpy = None
-
 try:
     import dataclasses
     import contextvars
@@ -199,13 +198,66 @@ def _coerce_ring_key(v):
     return v.__ring_key__()
 
 
+def _has_hashable_fields(v):
+    try:
+        hash(tuple(getattr(v, f.name) for f in dataclasses.fields(v)))
+    except TypeError:
+        return False
+    return True
+
+
+#: The memoized keys of the frozen dataclass objects.
+_frozen_ring_keys = weakref.WeakKeyDictionary()
+#: The frozen dataclasses whose keys can't be memoized.
+_unmemoizable_types = weakref.WeakSet()
+
+
+def _coerce_frozen_ring_key(v):
+    # frozen objects of hashable fields always have the same key; memoize it
+    # by the object. the fields like lists still can be changed in place.
+    t = type(v)
+    if t in _unmemoizable_types:
+        return v.__ring_key__()
+    try:
+        memo = _frozen_ring_keys.get(v)
+    except TypeError:  # unhashable or not weakly referenceable
+        _unmemoizable_types.add(t)
+        return v.__ring_key__()
+    # the memo of an equal object may be found; it is not the key of `v`
+    if memo is not None and memo[0]() is v:
+        return memo[1]
+    key = v.__ring_key__()
+    if _has_hashable_fields(v):
+        _frozen_ring_keys[v] = weakref.ref(v), key
+    else:
+        _unmemoizable_types.add(t)
+    return key
+
+
 def _coerce_dataclass(v):
     return type(v).__name__ + _coerce_dict(dataclasses.asdict(v))
 
 
-@functools.lru_cache(maxsize=128)
+def _coerce_hash(v):
+    return "{}:hash:{}".format(qualname(type(v)), hash(v))
+
+
+def _coerce_str(v):
+    return str(v)
+
+
+def _is_frozen_dataclass(t):
+    return (
+        dataclasses is not None
+        and dataclasses.is_dataclass(t)
+        and t.__dataclass_params__.frozen
+    )
+
+
 def coerce_function(t):
     if hasattr(t, "__ring_key__"):
+        if _is_frozen_dataclass(t):
+            return _coerce_frozen_ring_key
         return _coerce_ring_key
 
     if issubclass(t, (int, str, bool, type(None), type(Ellipsis))):
@@ -223,6 +275,8 @@ def coerce_function(t):
     if issubclass(t, (set, frozenset)):
         return _coerce_set
 
+    # An ndarray can't exist before numpy is imported by someone else
+    numpy = sys.modules.get("numpy")
     if numpy:
         if issubclass(t, numpy.ndarray):
             return _coerce_ndarray
@@ -235,34 +289,218 @@ def coerce_function(t):
     # but NEVER add a general iterator processing. it will cause user bugs.
 
 
-def coerce(v, in_memory_storage):
-    """Transform the given value to cache-friendly string data."""
+_digest_bypass_types = (str, bytes, int, float, bool, type(None), type(Ellipsis))
 
-    type_coerce = coerce_function(type(v))
-    if type_coerce:
-        return type_coerce(v)
 
-    if hasattr(v, "__ring_key__"):
-        return v.__ring_key__()
+def _digest(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
 
-    if in_memory_storage and type(v).__hash__ != object.__hash__:
-        return "{}:hash:{}".format(qualname(type(v)), hash(v))
 
-    cls = type(v)
-    if cls.__str__ != object.__str__:
-        return str(v)
+def _digest_element(v, in_memory_storage):
+    if type(v) in _digest_bypass_types:
+        element = repr(v)
+    else:
+        element = "{}={}".format(
+            qualname(type(v)), coerce(v, in_memory_storage, digest=True)
+        )
+    return "{}:{}".format(len(element), element)
 
-    msg = "Add __ring_key__() or __str__()."
-    if in_memory_storage:
-        msg = "Add __ring_key__(), __str__() or __hash__()."
 
-    raise TypeError(
-        "The given value '{}' of type '{}' is not a key-compatible type. {}".format(
-            v, cls, msg
+def _digest_elements(elements, in_memory_storage):
+    return _digest(
+        "".join([_digest_element(e, in_memory_storage) for e in elements]).encode(
+            "utf-8"
         )
     )
 
 
+def _digest_ndarray(v, in_memory_storage):
+    if v.dtype.hasobject:
+        return "ndarray:" + _digest_elements(
+            [v.shape] + v.ravel().tolist(), in_memory_storage
+        )
+    h = hashlib.blake2b(digest_size=16)
+    h.update("{}{}".format(v.dtype.descr, v.shape).encode("utf-8"))
+    numpy = sys.modules["numpy"]
+    h.update(numpy.ascontiguousarray(v).reshape(-1).view(numpy.uint8))
+    return "ndarray:" + h.hexdigest()
+
+
+def _digest_list_and_tuple(v, in_memory_storage):
+    return "{}:{}".format(type(v).__name__, _digest_elements(v, in_memory_storage))
+
+
+def _digest_dict(v, in_memory_storage):
+    items = sorted(
+        _digest_element(k, in_memory_storage) + _digest_element(e, in_memory_storage)
+        for k, e in v.items()
+    )
+    return "dict:" + _digest("".join(items).encode("utf-8"))
+
+
+def _digest_set(v, in_memory_storage):
+    elements = sorted(_digest_element(e, in_memory_storage) for e in v)
+    return "set:" + _digest("".join(elements).encode("utf-8"))
+
+
+def _digest_dataclass(v, in_memory_storage):
+    return type(v).__name__ + _digest_dict(dataclasses.asdict(v), in_memory_storage)
+
+
+def digest_coerce_function(t):
+    if hasattr(t, "__ring_key__"):
+        return None
+
+    if issubclass(t, (list, tuple)):
+        return _digest_list_and_tuple
+
+    if issubclass(t, dict):
+        return _digest_dict
+
+    if issubclass(t, (set, frozenset)):
+        return _digest_set
+
+    numpy = sys.modules.get("numpy")
+    if numpy:
+        if issubclass(t, numpy.ndarray):
+            return _digest_ndarray
+
+    if dataclasses:
+        if dataclasses.is_dataclass(t):
+            return _digest_dataclass
+
+
+def _unsupported_coercer(in_memory_storage):
+    def _coerce_unsupported(v):
+        if hasattr(v, "__ring_key__"):
+            return v.__ring_key__()
+
+        msg = "Add __ring_key__() or __str__()."
+        if in_memory_storage:
+            msg = "Add __ring_key__(), __str__() or __hash__()."
+
+        raise TypeError(
+            "The given value '{}' of type '{}' is not a key-compatible type. "
+            "{}".format(v, type(v), msg)
+        )
+
+    return _coerce_unsupported
+
+
+class CoercerRegistry(object):
+    """Registry of coercers which transform arguments to key components.
+
+    A coercer is a function which takes an argument and returns a
+    cache-friendly :class:`str` or a primitive value. Registered coercers
+    take precedence over the built-in coercion rules and are looked up
+    through the MRO of the argument type like :func:`functools.singledispatch`.
+
+    The resolved coercer of each type is cached, so coercion is a dict lookup
+    after the first call for the type.
+
+    :see: :data:`ring.func.base.coercer_registry` for the default registry.
+    """
+
+    def __init__(self):
+        self.coercers = {}
+        self._caches = {
+            (in_memory_storage, digest): {}
+            for in_memory_storage in (False, True)
+            for digest in (False, True)
+        }
+
+    def register(self, t, coercer=None):
+        """Register `coercer` for the type `t`.
+
+        Without `coercer`, return a decorator to register the decorated
+        function.
+
+        .. code-block:: python
+
+            @ring.func.base.coercer_registry.register(uuid.UUID)
+            def coerce_uuid(v):
+                return v.hex
+
+        :param type t: The argument type. Its subclasses also use `coercer`
+            unless they have their own registered coercer.
+        :param Callable[[Any],Any] coercer: The coercer function.
+        """
+        if coercer is None:
+            return functools.partial(self.register, t)
+        self.coercers[t] = coercer
+        for cache in self._caches.values():
+            cache.clear()
+        return coercer
+
+    def find(self, t):
+        """Return the registered coercer of the nearest type in MRO of `t`.
+
+        :rtype: Optional[Callable[[Any],Any]]
+        """
+        coercers = self.coercers
+        for base in t.__mro__:
+            if base in coercers:
+                return coercers[base]
+        for base, coercer in coercers.items():  # virtual subclasses
+            if isinstance(base, abc.ABCMeta) and issubclass(t, base):
+                return coercer
+        return None
+
+    def dispatch(self, t, in_memory_storage, digest=False):
+        """Resolve and cache the coercer for the type `t`.
+
+        :rtype: Callable[[Any],Any]
+        """
+        cache = self._caches.setdefault((in_memory_storage, digest), {})
+        try:
+            return cache[t]
+        except KeyError:
+            pass
+
+        coercer = self.find(t)
+        if coercer is None and digest:
+            type_digest = digest_coerce_function(t)
+            if type_digest is not None:
+                coercer = functools.partial(
+                    type_digest, in_memory_storage=in_memory_storage
+                )
+        if coercer is None:
+            coercer = coerce_function(t)
+        if coercer is None:
+            if in_memory_storage and t.__hash__ != object.__hash__:
+                coercer = _coerce_hash
+            elif t.__str__ != object.__str__:
+                coercer = _coerce_str
+            else:
+                coercer = _unsupported_coercer(in_memory_storage)
+        cache[t] = coercer
+        return coercer
+
+
+#: The default :class:`ring.func.base.CoercerRegistry` object.
+coercer_registry = CoercerRegistry()
+
+
+def coerce(v, in_memory_storage, digest=False):
+    """Transform the given value to cache-friendly string data.
+
+    When `digest` is set, containers, dataclasses and :class:`numpy.ndarray`
+    are transformed to the digest of their content instead of the full
+    string representation.
+
+    The `__ring_key__` of a frozen dataclass is memoized in the instance when
+    every field is hashable. The hash of a field must reflect its content
+    when `__ring_key__` depends on it.
+
+    :see: :class:`ring.func.base.CoercerRegistry` to add coercers.
+    """
+    try:
+        type_coerce = coercer_registry._caches[in_memory_storage, digest][type(v)]
+    except KeyError:
+        type_coerce = coercer_registry.dispatch(type(v), in_memory_storage, digest)
+    return type_coerce(v)
+
+
 def interface_attrs(**kwargs):
     if "return_annotation" in kwargs:
         kwargs["__annotations_override__"] = {"return": kwargs.pop("return_annotation")}
@@ -471,27 +709,43 @@ class BaseUserInterface(object):
         raise NotImplementedError
 
 
-def create_bulk_key(interface, wire, args):
-    if isinstance(args, tuple):
-        args_pack = wire._pack_args(args, {})
+def payload_size(value):
+    """Return the size of the encoded `value` in bytes.
+
+    The values which are not binary or text are counted as ``0``.
+    """
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    if isinstance(value, memoryview):
+        return value.nbytes
+    return 0
+
+
+def pack_bulk_args(wire, args):
+    if isinstance(args, ArgPack):  # a namedtuple
+        return args
+    elif isinstance(args, tuple):
+        return wire._pack_args(args, {})
     elif isinstance(args, dict):
-        args_pack = wire._pack_args((), args)
-    elif isinstance(args, ArgPack):
-        args_pack = args
+        return wire._pack_args((), args)
     else:
         raise TypeError(
             "Each parameter of '_many' suffixed sub-functions must be an "
             "instance of 'tuple' or 'dict'"
         )
 
-    return interface.key(wire, args_pack)
+
+def create_bulk_key(interface, wire, args):
+    return interface.key(wire, pack_bulk_args(wire, args))
 
 
 def execute_bulk_item(wire, args):
+    # through `execute` of the user interface for the hooks and statistics
+    execute = wire._rope.user_interface.execute
     if isinstance(args, tuple):
-        return wire.__func__(*args)
+        return execute(wire, pargs=ArgPack((), args, {}))
     elif isinstance(args, dict):
-        return wire.__func__(**args)
+        return execute(wire, pargs=ArgPack((), (), args))
     else:
         raise TypeError(
             "Each parameter of '_many' suffixed sub-functions must be an "
@@ -622,8 +876,14 @@ class AbstractBulkUserInterfaceMixin(object):
         raise NotImplementedError
 
 
-@attr.s
+@attr.s(frozen=True)
 class Config(object):
+    """The configuration of a ring.
+
+    The functions decorated by the same factory arguments share a config, so
+    it is immutable.
+    """
+
     coder = attr.ib()
     user_interface = attr.ib()
     storage_backend = attr.ib()
@@ -635,6 +895,14 @@ class Config(object):
     key_refactor = attr.ib()
     key_prefix = attr.ib()
     ignorable_keys = attr.ib()
+    offload_threshold = attr.ib(default=None)
+    offload_executor = attr.ib(default=None)
+    key_hash = attr.ib(default=None)
+    key_hashtag = attr.ib(default=False)
+    coerce_digest = attr.ib(default=False)
+    stats = attr.ib(default=False)
+    instance_local = attr.ib(default=False)
+    generation = attr.ib(default=None)
     # wire_class = attr.ib()
 
 
@@ -654,6 +922,41 @@ class RingWire(Wire):
     def decode(self, v):
         return self._rope.decode(v)
 
+    def stats(self, reset=False):
+        """Return the statistics of the ring.
+
+        The statistics are collected only when the factory is created with
+        ``stats=True``.
+
+        :param bool reset: Reset the statistics after taking the snapshot.
+        :return: The counters of hits, misses, sets, deletes, errors,
+            bytes in/out and the latency histograms of key building, storage
+            I/O, coder and function execution; :data:`None` when the
+            statistics are not enabled.
+        :rtype: Optional[dict]
+        """
+        stats = self._rope._stats
+        if stats is None:
+            return None
+        snapshot = stats.snapshot()
+        if reset:
+            stats.reset()
+        return snapshot
+
+    def clear(self):
+        """Invalidate every entry of the function.
+
+        The generation of the ring is incremented, so the entries of the old
+        generation are not read anymore. The factory must be created with
+        `generation`.
+
+        :see: :mod:`ring.func.generation`
+        """
+        storage = self.storage
+        if not hasattr(storage, "generation_key"):
+            raise TypeError("'clear' requires 'generation' of the factory")
+        return storage.clear()
+
     def _pack_args(self, args, kwargs):
         """Create a fake kwargs object by merging actual arguments.
 
@@ -684,7 +987,7 @@ class RingWire(Wire):
         except AttributeError:
             pass
 
-        attr = getattr(self._rope.config.user_interface, name)
+        attr = getattr(self._rope.user_interface, name)
         if callable(attr):
             transform_args = getattr(attr, "transform_args", None)
 
@@ -699,9 +1002,10 @@ class RingWire(Wire):
 
             cc = self._callable.wrapped_callable
             functools.wraps(cc)(impl_f)
-            impl_f.__name__ = ".".join((cc.__name__, name))
+            # interned not to keep the same names for each bound wire
+            impl_f.__name__ = sys.intern(".".join((cc.__name__, name)))
             if six.PY34:
-                impl_f.__qualname__ = ".".join((cc.__qualname__, name))
+                impl_f.__qualname__ = sys.intern(".".join((cc.__qualname__, name)))
 
             annotations = getattr(impl_f, "__annotations__", {})
             annotations_override = getattr(attr, "__annotations_override__", {})
@@ -717,9 +1021,37 @@ class RingWire(Wire):
         return self.__getattribute__(name)
 
 
+def _shallow_copy(obj):
+    """Lighter :func:`copy.copy` for objects with plain `__dict__`."""
+    new = object.__new__(type(obj))
+    new.__dict__.update(obj.__dict__)
+    return new
+
+
+_hook_miss = object()  # unique object to detect misses in bulk access
+
+
+def _then(result, callback):
+    """Run `callback` with `result`; Awaitable results are awaited first."""
+    if inspect.isawaitable(result):
+
+        async def _await():
+            return callback(await result)
+
+        return _await()
+    return callback(result)
+
+
 class PublicRing(object):
+    """The public controller of a ring object as `ring` attribute of wires.
+
+    The event hooks are installed by the first registered hook, so rings
+    without hooks don't pay any cost for them.
+    """
+
     def __init__(self, rope):
         self._rope = rope
+        self._hooks = None
 
     def key(self, func):
         self._rope.compose_key = lambda pargs: func(
@@ -727,11 +1059,202 @@ class PublicRing(object):
         )
 
     def encode(self, func):
+        stats = self._rope._stats
+        if stats is not None:
+            func = stats.timed("coder", func)
         self._rope._encode = func
 
     def decode(self, func):
+        stats = self._rope._stats
+        if stats is not None:
+            func = stats.timed("coder", func)
         self._rope._decode = func
 
+    def on_hit(self, func):
+        """Register `func` to be called as ``func(key, value)`` on a hit."""
+        self._add_hook("hit", func)
+        return func
+
+    def on_miss(self, func):
+        """Register `func` to be called as ``func(key)`` on a miss."""
+        self._add_hook("miss", func)
+        return func
+
+    def on_execute(self, func):
+        """Register `func` to be called as ``func(args, kwargs, result)``
+        after the original function is executed."""
+        self._add_hook("execute", func)
+        return func
+
+    def on_set(self, func):
+        """Register `func` to be called as ``func(key, value)`` when a value
+        is set to the storage."""
+        self._add_hook("set", func)
+        return func
+
+    def on_evict(self, func):
+        """Register `func` to be called as ``func(key)`` when the backend
+        evicts a key to make room for new items.
+
+        Only backends with `on_evict` callback like
+        :class:`ring.func.lru_cache.LruCache` support this event. When a
+        backend is shared by rings, the keys are routed to the rings by their
+        key prefixes; So the rings with `key_refactor` or a `key_hash`
+        without readable prefix don't receive the events of a shared backend.
+        """
+        self._add_hook("evict", func)
+        return func
+
+    def tags(self, func):
+        """Register `func` to return the tags of the entry for the arguments.
+
+        The tags are attached to the keys whenever the values are set, and
+        :func:`ring.invalidate_tags` deletes the entries of the tags.
+
+        :see: :mod:`ring.func.tags`
+        """
+        from . import tags  # circular
+
+        tags.check_support(self._rope.storage_class)
+        self._rope._tags = func
+        tags.register(self._rope)
+        return func
+
+    def _add_hook(self, event, func):
+        if self._hooks is None:
+            self._hooks = {
+                "hit": [],
+                "miss": [],
+                "execute": [],
+                "set": [],
+                "evict": [],
+            }
+            self._install_hooks()
+        self._hooks[event].append(func)
+
+    def _fire(self, event, *args):
+        for hook in self._hooks[event]:
+            hook(*args)
+
+    def _install_hooks(self):
+        rope = self._rope
+        fire = self._fire
+
+        for storage in list(rope._storages):
+            self._install_storage_hooks(storage)
+
+        user_interface = rope.user_interface
+        interface_execute = user_interface.execute
+
+        def execute(wire, pargs):
+            def _fire_execute(result):
+                fire("execute", pargs.args, pargs.kwargs, result)
+                return result
+
+            return _then(interface_execute(wire, pargs=pargs), _fire_execute)
+
+        user_interface.execute = execute
+
+    def _install_storage_hooks(self, storage):
+        fire = self._fire
+
+        storage_get = storage.get
+
+        def get(key):
+            try:
+                result = storage_get(key)
+            except NotFound:
+                fire("miss", key)
+                raise
+            if inspect.isawaitable(result):
+                return _await_get(result, key)
+            fire("hit", key, result)
+            return result
+
+        async def _await_get(result, key):
+            try:
+                value = await result
+            except NotFound:
+                fire("miss", key)
+                raise
+            fire("hit", key, value)
+            return value
+
+        storage.get = get
+
+        storage_set = storage.set
+
+        def set(key, value, *args, **kwargs):
+            fire("set", key, value)
+            return storage_set(key, value, *args, **kwargs)
+
+        storage.set = set
+
+        if hasattr(storage, "get_many"):
+            storage_get_many = storage.get_many
+
+            def get_many(keys, miss_value):
+                def _fire_many(values):
+                    results = []
+                    for key, value in zip(keys, values):
+                        if value is _hook_miss:
+                            fire("miss", key)
+                            value = miss_value
+                        else:
+                            fire("hit", key, value)
+                        results.append(value)
+                    return results
+
+                return _then(storage_get_many(keys, _hook_miss), _fire_many)
+
+            storage.get_many = get_many
+
+            storage_set_many = storage.set_many
+
+            def set_many(keys, values, *args, **kwargs):
+                for key, value in zip(keys, values):
+                    fire("set", key, value)
+                return storage_set_many(keys, values, *args, **kwargs)
+
+            storage.set_many = set_many
+
+        backend = storage.backend
+        if hasattr(backend, "on_evict"):
+            evict_dispatcher(backend).rings.add(self)
+
+
+class _EvictDispatcher(object):
+    """The `on_evict` callback of a backend to fire the evict hooks of the
+    rings sharing the backend.
+
+    The evicted key is routed to the ring of its key prefix when more than
+    one ring shares the backend. The `listeners` receive every evicted key
+    by their `on_evict` methods.
+    """
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.rings = weakref.WeakSet()
+        self.listeners = weakref.WeakSet()
+
+    def __call__(self, key, value):
+        if self.callback is not None:
+            self.callback(key, value)
+        for listener in list(self.listeners):
+            listener.on_evict(key)
+        rings = list(self.rings)
+        for ring in rings:
+            if len(rings) == 1 or ring._rope.owns_key(key):
+                ring._fire("evict", key)
+
+
+def evict_dispatcher(backend):
+    """Return the `on_evict` dispatcher of `backend`, installing it if needed."""
+    dispatcher = backend.on_evict
+    if not isinstance(dispatcher, _EvictDispatcher):
+        dispatcher = backend.on_evict = _EvictDispatcher(dispatcher)
+    return dispatcher
+
 
 class RingRope(RopeCore):
     def __init__(self, *args, **kwargs):
@@ -739,9 +1262,21 @@ class RingRope(RopeCore):
 
         self._encode = None
         self._decode = None
+        self._stats = None
+        self._tags = None
+        self._storages = weakref.WeakSet()
 
+        # The config is shared by the ropes of the same configuration, but
+        # hooks and statistics replace methods of the user interface per rope.
+        self.user_interface = _shallow_copy(self.config.user_interface)
         self.ring = PublicRing(self)
 
+        if self.config.stats:
+            from .stats import RingStats
+
+            self._stats = RingStats()
+            self._stats.instrument(self)
+
     def compose_key(self, pargs):
         config = self.config
 
@@ -749,8 +1284,15 @@ class RingRope(RopeCore):
             self.callable, self.config.ignorable_keys
         )
         _key_prefix = suggest_key_prefix(self.callable, config.key_prefix)
+        if config.key_hashtag:
+            _key_prefix = "{{" + _key_prefix + "}}"
 
         c = self.callable
+        if config.instance_local and (
+            c.is_membermethod or c.is_classmethod or c.is_property
+        ):
+            # the storage belongs to the bound object
+            _ignorable_keys = list(_ignorable_keys) + [c.first_parameter.name]
         key_generator = CallableKey(
             c, format_prefix=_key_prefix, ignorable_keys=_ignorable_keys
         )
@@ -758,14 +1300,21 @@ class RingRope(RopeCore):
         in_memory_storage = hasattr(config.storage_class, "in_memory_storage")
         labels = pargs.labels(key_generator.provider)
         coerced_kwargs = {
-            k: coerce(v, in_memory_storage)
+            k: coerce(v, in_memory_storage, config.coerce_digest)
             for k, v in labels.items()
             if k not in _ignorable_keys
         }
         key = key_generator.build(coerced_kwargs)
+        key_hash = config.key_hash
+        if key_hash is not None:
+            if key_hash.readable_prefix:
+                key = key_hash.hash(key, _key_prefix.format(**coerced_kwargs))
+            else:
+                key = key_hash.hash(key)
         if config.key_encoding:
             key = key.encode(config.key_encoding)
-        if config.key_refactor:
+        if config.key_refactor and config.generation is None:
+            # the generational storages refactor the keys after versioning
             key = config.key_refactor(key)
         return key
 
@@ -789,34 +1338,171 @@ class RingRope(RopeCore):
     def set_decode(self, value):
         self._decode = value
 
+    @cached_property
+    def _literal_key_prefix(self):
+        config = self.config
+        prefix = suggest_key_prefix(self.callable, config.key_prefix)
+        if config.key_hashtag:
+            prefix = "{{" + prefix + "}}"
+        literal = []
+        complete = True
+        for text, field, _, _ in string.Formatter().parse(prefix):
+            literal.append(text)
+            if field is not None:
+                complete = False
+                break
+        literal = "".join(literal)
+        separator = ":"
+        if config.key_encoding:
+            literal = literal.encode(config.key_encoding)
+            separator = separator.encode(config.key_encoding)
+        return literal, complete, separator
+
+    @cached_property
+    def tag_key_prefix(self):
+        """The prefix of the keys of the tag indexes of this rope in backends."""
+        prefix = self._literal_key_prefix[0]
+        if isinstance(prefix, bytes):
+            prefix = prefix.decode(self.config.key_encoding)
+        return prefix + "@tag:"
+
+    def owns_key(self, key):
+        """Test if `key` is composed by this rope by its key prefix."""
+        prefix, complete, separator = self._literal_key_prefix
+        if type(key) is not type(prefix) or not key.startswith(prefix):
+            return False
+        rest = key[len(prefix) :]
+        return not complete or not rest or rest.startswith(separator)
+
+    def tag(self, wire, keys, args_list):
+        """Attach the registered tags of `args_list` to `keys`.
+
+        :return: An awaitable object for :mod:`asyncio` storages, or
+            :data:`None` when nothing to wait.
+        """
+        if self._tags is None:
+            return None
+        from .tags import tag_keys  # circular
+
+        return tag_keys(wire.storage, keys, self._tags_list(wire, args_list))
+
+    def untag(self, wire, keys, args_list):
+        """Detach the registered tags of `args_list` from the deleted `keys`.
+
+        :see: :meth:`ring.func.base.RingRope.tag` for the return value.
+        """
+        if self._tags is None:
+            return None
+        from .tags import untag_keys  # circular
+
+        return untag_keys(wire.storage, keys, self._tags_list(wire, args_list))
+
+    def _tags_list(self, wire, args_list):
+        tags_list = []
+        for args in args_list:
+            pargs = pack_bulk_args(wire, args)
+            tags = self._tags(*(pargs.bounds + pargs.args), **pargs.kwargs)
+            tags_list.append([str(tag) for tag in tags])
+        return tags_list
+
+    @cached_property
+    def storage_class(self):
+        from . import generation, sharding  # circular
+
+        storage_class = self.config.storage_class
+        if isinstance(self.config.storage_backend, sharding.Shards):
+            storage_class = sharding.sharded_storage_class(storage_class)
+        if self.config.generation is not None:
+            storage_class = generation.generational_storage_class(storage_class)
+        if self._stats is not None:
+            storage_class = self._stats.storage_class(storage_class)
+        return storage_class
+
+    def create_storage(self, backend):
+        """Create a new storage of this rope for the given backend."""
+        storage = self.storage_class(self.ring, backend)
+        self._storages.add(storage)
+        if self.ring._hooks is not None:
+            self.ring._install_storage_hooks(storage)
+        return storage
+
     @cached_property
     def storage(self):
         # FIXME:
-        return self.config.storage_class(self.ring, self.config.storage_backend)
+        return self.create_storage(self.config.storage_backend)
 
 
-class Ring(object):
-    def __init__(self, allows_default_action=True, wire_slots=Ellipsis):
-        self._config = None
-        self._allows_default_action = allows_default_action
+def _create_wire_rope(
+    allows_default_action, wire_slots, user_interface, instance_local
+):
+    if wire_slots is Ellipsis:
+        wire_slots = ()
+
+    if wire_slots is not False:
+        assert isinstance(wire_slots, tuple)
+        # The sub-functions are cached in the slots by `RingWire.__getattr__`.
+        # Names of `RingWire` attributes are excluded not to shadow them.
+        interface_keys = tuple(
+            k
+            for k in dir(user_interface)
+            if k[0] != "_" and not hasattr(RingWire, k) and k not in wire_slots
+        )
+
+    class _RingWire(RingWire):
+        if wire_slots is not False:
+            __slots__ = interface_keys + wire_slots
+            if instance_local:
+                __slots__ += ("_storage",)
 
-        # if wire_slots is Ellipsis:
-        #     wire_slots = ()
+        if instance_local:
 
-        # func = self.__func__ if type(self.__func__) is types.FunctionType else Callable(self.__func__).wrapped_callable  # noqa
-        # interface_keys = tuple(k for k in dir(user_interface) if k[0] != '_')
+            @property
+            def storage(self):
+                try:
+                    return self._storage
+                except AttributeError:
+                    rope = self._rope
+                    self._storage = rope.create_storage(rope.config.storage_backend())
+                    return self._storage
 
-        class _RingWire(RingWire):
-            # if wire_slots is not False:
-            #     assert isinstance(wire_slots, tuple)
-            #     __slots__ = interface_keys + wire_slots
+        if allows_default_action:
+            # @functools.wraps(func)
+            def __call__(self, *args, **kwargs):
+                return self.run(self._rope.config.default_action, *args, **kwargs)
 
-            if allows_default_action:
-                # @functools.wraps(func)
-                def __call__(self, *args, **kwargs):
-                    return self.run(self._rope.config.default_action, *args, **kwargs)
+    return WireRope(_RingWire, RingRope)
 
-        self.wire_rope = WireRope(_RingWire, RingRope)
+
+#: The wire ropes sharing wire and rope classes between rings.
+_wire_ropes = {}
+
+#: The composed user interface classes by their bases.
+_composed_user_interfaces = {}
+
+#: The interned rings by the identities of factory arguments.
+_rings = weakref.WeakValueDictionary()
+
+
+class Ring(object):
+    def __init__(self, allows_default_action=True, wire_slots=Ellipsis):
+        self._config = None
+        self._allows_default_action = allows_default_action
+        self._wire_slots = wire_slots
+        self.wire_rope = None
+
+    def _bind_wire_rope(self, user_interface, instance_local):
+        wire_rope_key = (
+            self._allows_default_action,
+            self._wire_slots,
+            user_interface,
+            instance_local,
+        )
+        wire_rope = _wire_ropes.get(wire_rope_key)
+        if wire_rope is None:
+            wire_rope = _create_wire_rope(*wire_rope_key)
+            _wire_ropes[wire_rope_key] = wire_rope
+        # The wire rope only refers the shared classes; copy it to bind self.
+        self.wire_rope = _shallow_copy(wire_rope)
         self.wire_rope._ring_object = self
 
     @property
@@ -840,6 +1526,18 @@ class Ring(object):
         ignorable_keys=None,
         key_encoding=None,
         key_refactor=None,
+        key_hash=None,
+        key_hashtag=False,
+        coerce_digest=False,
+        # asyncio coder offloading
+        offload_threshold=None,
+        offload_executor=None,
+        # statistics
+        stats=False,
+        # storage for each bound object
+        instance_local=False,
+        # namespace invalidation
+        generation=None,
     ):
         """Configure ring object.
 
@@ -858,7 +1556,8 @@ class Ring(object):
             not support expiration or persistent saving.
 
         :param Union[str,ring.coder.Coder] coder: A registered coder name or a
-            coder object. See :doc:`coder` for details.
+            coder object. A tuple of them composes a coder pipeline. See
+            :doc:`coder` for details.
         :param Any miss_value: The default value when storage misses a given key.
         :param type user_interface: Injective implementation of sub-functions.
         :param type storage_class: Injective implementation of storage.
@@ -880,6 +1579,42 @@ class Ring(object):
         :param Optional[Callable[[str],str]] key_refactor: Roughly,
             ``key = key_refactor(key)`` will be run when `key_refactor` is not
             :data:`None`; Otherwise it is omitted.
+        :param Optional[Union[str,ring.key.KeyHash]] key_hash: Hash the
+            composed key into a short fixed-length key before `key_encoding`
+            and `key_refactor`. An algorithm name like ``blake2b`` or
+            ``xxhash``, ``auto`` for the fastest available one, or a
+            :class:`ring.key.KeyHash` object for digest size and readable
+            prefix options.
+        :param bool key_hashtag: Wrap the key prefix in ``{...}`` as a Redis
+            Cluster hash tag, so that every key of the function is in the
+            same hash slot. With `key_hash`, the tag is kept only by
+            `readable_prefix`.
+        :param bool coerce_digest: Coerce containers, dataclasses and
+            :class:`numpy.ndarray` arguments into the digest of their content
+            instead of their full string representation.
+
+        :param Optional[int] offload_threshold: (:mod:`asyncio` only) The
+            minimum payload bytes to decode in `offload_executor` instead of
+            the event loop. When ``0`` is given, encoding is also always
+            offloaded. The default value :data:`None` never offloads.
+            Encoding is offloaded only by ``0`` because the size is unknown
+            before encoding; Give ``0`` to the rings of the heavy coders to
+            always offload them.
+        :param Optional[concurrent.futures.Executor] offload_executor:
+            (:mod:`asyncio` only) The executor to run offloaded coder works.
+            The default executor of the event loop is used for :data:`None`.
+
+        :param bool stats: Collect the statistics of the ring. See
+            :meth:`ring.func.base.RingWire.stats` to read them.
+        :param bool instance_local: Create a storage for each wire with the
+            backend of ``storage_backend()``. For methods, a wire is created
+            for each bound object and dies with it, so the storage is local
+            to the object; the bound object is not a part of the key.
+        :param Optional[Union[bool,ring.func.generation.Generation]]
+            generation: Insert a generation number stored in the backend into
+            the keys, so :meth:`ring.func.base.RingWire.clear` invalidates
+            every entry of the function at once. See
+            :mod:`ring.func.generation`.
 
         :return: The factory decorator to create new ring wire or wire bridge.
         :rtype: (Callable)->ring.wire.RopeCore
@@ -894,7 +1629,22 @@ class Ring(object):
         ring_coder = coder_registry.get_or_coderize(raw_coder)
 
         if isinstance(user_interface, (tuple, list)):
-            user_interface = type("_ComposedUserInterface", user_interface, {})
+            bases = tuple(user_interface)
+            user_interface = _composed_user_interfaces.get(bases)
+            if user_interface is None:
+                user_interface = type("_ComposedUserInterface", bases, {})
+                _composed_user_interfaces[bases] = user_interface
+        if instance_local and not callable(storage_backend):
+            # a backend object would be shared by the storages of the wires
+            raise TypeError("'instance_local' requires a callable 'storage_backend'")
+        self._bind_wire_rope(user_interface, instance_local)
+        if generation is not None:
+            from .generation import generation_of  # circular
+
+            generation = generation_of(generation)
+            if generation is not None and generation.cleanup and key_refactor:
+                # the refactored keys don't match the pattern of generations
+                raise TypeError("'cleanup' of 'generation' requires no 'key_refactor'")
 
         self._config = Config(
             coder=ring_coder,
@@ -908,6 +1658,14 @@ class Ring(object):
             key_refactor=key_refactor,
             key_prefix=key_prefix,
             ignorable_keys=ignorable_keys,
+            offload_threshold=offload_threshold,
+            offload_executor=offload_executor,
+            key_hash=key_hash_of(key_hash),
+            key_hashtag=key_hashtag,
+            coerce_digest=coerce_digest,
+            stats=stats,
+            instance_local=instance_local,
+            generation=generation,
         )
 
     def create_rope(self, func, callback=None):
@@ -939,6 +1697,18 @@ def factory(
     ignorable_keys=None,
     key_encoding=None,
     key_refactor=None,
+    key_hash=None,
+    key_hashtag=False,
+    coerce_digest=False,
+    # asyncio coder offloading
+    offload_threshold=None,
+    offload_executor=None,
+    # statistics
+    stats=False,
+    # storage for each bound object
+    instance_local=False,
+    # namespace invalidation
+    generation=None,
 ):
     """Create a decorator which turns a function into ring wire or wire bridge.
 
@@ -957,7 +1727,8 @@ def factory(
         not support expiration or persistent saving.
 
     :param Union[str,ring.coder.Coder] coder: A registered coder name or a
-        coder object. See :doc:`coder` for details.
+        coder object. A tuple of them composes a coder pipeline. See
+        :doc:`coder` for details.
     :param Any miss_value: The default value when storage misses a given key.
     :param type user_interface: Injective implementation of sub-functions.
     :param type storage_class: Injective implementation of storage.
@@ -970,6 +1741,10 @@ def factory(
 
     :param Optional[Callable[[type(Wire),type(Ring)],None]] on_manufactured:
         The callback function when a new ring wire or wire bridge is created.
+    :param Union[Tuple[str],bool] wire_slots: Additional `__slots__` of the
+        ring wires. The wires of methods are created for each bound object,
+        so they have slots for the sub-functions instead of `__dict__` by
+        default. :data:`False` gives them `__dict__` instead.
 
     :param List[str] ignorable_keys: (experimental) Parameter names not to
         use to create storage key.
@@ -979,32 +1754,88 @@ def factory(
     :param Optional[Callable[[str],str]] key_refactor: Roughly,
         ``key = key_refactor(key)`` will be run when `key_refactor` is not
         :data:`None`; Otherwise it is omitted.
+    :param Optional[Union[str,ring.key.KeyHash]] key_hash: Hash the composed
+        key into a short fixed-length key before `key_encoding` and
+        `key_refactor`. An algorithm name like ``blake2b`` or ``xxhash``,
+        ``auto`` for the fastest available one, or a
+        :class:`ring.key.KeyHash` object for digest size and readable prefix
+        options.
+    :param bool key_hashtag: Wrap the key prefix in ``{...}`` as a Redis
+        Cluster hash tag, so that every key of the function is in the same
+        hash slot. With `key_hash`, the tag is kept only by `readable_prefix`.
+    :param bool coerce_digest: Coerce containers, dataclasses and
+        :class:`numpy.ndarray` arguments into the digest of their content
+        instead of their full string representation.
+
+    :param Optional[int] offload_threshold: (:mod:`asyncio` only) The
+        minimum payload bytes to decode in `offload_executor` instead of the
+        event loop. When ``0`` is given, encoding is also always offloaded.
+        The default value :data:`None` never offloads. Encoding is offloaded
+        only by ``0`` because the size is unknown before encoding; Give ``0``
+        to the rings of the heavy coders to always offload them.
+    :param Optional[concurrent.futures.Executor] offload_executor:
+        (:mod:`asyncio` only) The executor to run offloaded coder works. The
+        default executor of the event loop is used for :data:`None`.
+
+    :param bool stats: Collect the statistics of the ring. See
+        :meth:`ring.func.base.RingWire.stats` to read them.
+    :param bool instance_local: Create a storage for each wire with the
+        backend of ``storage_backend()``. For methods, a wire is created for
+        each bound object and dies with it, so the storage is local to the
+        object; the bound object is not a part of the key.
+    :param Optional[Union[bool,ring.func.generation.Generation]] generation:
+        Insert a generation number stored in the backend into the keys, so
+        :meth:`ring.func.base.RingWire.clear` invalidates every entry of the
+        function at once. See :mod:`ring.func.generation`.
 
     :return: The factory decorator to create new ring wire or wire bridge.
     :rtype: (Callable)->ring.wire.RopeCore
+
+    The ring object is built once and shared by every function decorated
+    with the same arguments. Arguments are compared by identity.
     """
+    ring_args = (
+        storage_backend,
+        key_prefix,
+        expire_default,
+        # keyword-only arguments from here
+        # building blocks
+        coder,
+        miss_value,
+        user_interface,
+        storage_class,
+        default_action,
+        coder_registry,
+        # key builder related parameters
+        ignorable_keys,
+        key_encoding,
+        key_refactor,
+        key_hash,
+        key_hashtag,
+        coerce_digest,
+        offload_threshold,
+        offload_executor,
+        stats,
+        instance_local,
+        generation,
+    )
+    ring_key = (wire_slots,) + tuple(map(id, ring_args))
+    rings = []
 
     def _decorator(f):
-        ring = Ring(allows_default_action=bool(default_action), wire_slots=wire_slots)
-        ring.configure(
-            storage_backend,
-            key_prefix,
-            expire_default,
-            # keyword-only arguments from here
-            # building blocks
-            coder,
-            miss_value,
-            user_interface,
-            storage_class,
-            default_action,
-            coder_registry,
-            # key builder related parameters
-            ignorable_keys,
-            key_encoding,
-            key_refactor,
-        )
+        if not rings:
+            ring = _rings.get(ring_key)
+            if ring is None:
+                ring = Ring(
+                    allows_default_action=bool(default_action), wire_slots=wire_slots
+                )
+                ring.configure(*ring_args)
+                # keep the arguments alive to keep their ids unique
+                ring._ring_args = ring_args
+                _rings[ring_key] = ring
+            rings.append(ring)
 
-        return ring.create_rope(f, on_manufactured)
+        return rings[0].create_rope(f, on_manufactured)
 
     return _decorator
 
@@ -1180,13 +2011,12 @@ class FactoryProxyBase(six.with_metaclass(FactoryProxyMetaclass, object)):
 
     def __call__(self, func):
         key = self.classifier(func)
-        if key not in self.rings:
+        ring = self.rings.get(key)
+        if ring is None:
             factory = self.factory_table[key]
             args, kwargs = self.pargs
             ring = factory(*args, **kwargs)
-            self.rings[key] = factory
-        else:
-            ring = self.rings[key]
+            self.rings[key] = ring
         return ring(func)
 
     def __repr__(self):
@@ -0,0 +1,332 @@
+""":mod:`ring.func.generation` --- Namespace invalidation by generations.
+=======================================================================
+
+The keys of a function include a generation number stored in the backend.
+Clearing the function only increments the generation, and the entries of
+the old generation are never read again:
+
+    >>> @ring.redis(client, generation=True)
+    ... def f(a):
+    ...     ...
+    >>> f.clear()
+
+Each storage caches the generation for :attr:`Generation.ttl` seconds, so
+the other processes see the new generation after at most that long.
+"""
+
+import asyncio
+import inspect
+import threading
+import time
+
+from . import base as fbase
+
+__all__ = ("Generation", "generation_of", "generational_storage_class")
+
+
+class Generation(object):
+    """Options of the generation counter of a ring.
+
+    :param float ttl: The seconds to cache the generation in the process.
+    :param bool cleanup: Delete the entries of the old generation in
+        background after `clear`. The storage must support scanning keys,
+        like Redis by ``SCAN`` and ``UNLINK``. It can't be used with
+        `key_refactor`, which hides the generations of the keys.
+    :param int scan_count: The ``COUNT`` hint for each ``SCAN`` of cleanup.
+    """
+
+    def __init__(self, ttl=1.0, cleanup=False, scan_count=1000):
+        self.ttl = ttl
+        self.cleanup = cleanup
+        self.scan_count = scan_count
+
+
+def generation_of(generation):
+    """Return :class:`Generation` object for the given `generation` parameter.
+
+    :param generation: :data:`None`, :class:`bool` or :class:`Generation`.
+    :rtype: Optional[Generation]
+    """
+    if generation is None or generation is False:
+        return None
+    if generation is True:
+        return Generation()
+    if isinstance(generation, Generation):
+        return generation
+    raise TypeError(
+        "'generation' must be one of None, bool or Generation. "
+        "Given: {!r}".format(generation)
+    )
+
+
+def _escape_pattern(prefix):
+    for c in "\\[]*?":
+        prefix = prefix.replace(c, "\\" + c)
+    return prefix
+
+
+def _versioned(name):
+    def versioned(self, key, *args):
+        key = self.versioned_key(key, self.generation())
+        return getattr(self.raw_storage_class, name)(self, key, *args)
+
+    versioned.__name__ = name
+    return versioned
+
+
+def _versioned_many(name):
+    def versioned(self, keys, *args):
+        generation = self.generation()
+        keys = [self.versioned_key(key, generation) for key in keys]
+        return getattr(self.raw_storage_class, name)(self, keys, *args)
+
+    versioned.__name__ = name
+    return versioned
+
+
+def _aversioned(name):
+    async def versioned(self, key, *args):
+        key = self.versioned_key(key, await self.generation())
+        method = getattr(self.raw_storage_class, name)
+        return await _awaitable(method(self, key, *args))
+
+    versioned.__name__ = name
+    return versioned
+
+
+def _aversioned_many(name):
+    async def versioned(self, keys, *args):
+        generation = await self.generation()
+        keys = [self.versioned_key(key, generation) for key in keys]
+        method = getattr(self.raw_storage_class, name)
+        return await _awaitable(method(self, keys, *args))
+
+    versioned.__name__ = name
+    return versioned
+
+
+async def _awaitable(result):
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+class GenerationalStorageMixinBase(object):
+    """Common parts of the generational storages."""
+
+    #: The storage class to read and write the versioned keys.
+    raw_storage_class = None
+
+    def __init__(self, ring, backend):
+        super(GenerationalStorageMixinBase, self).__init__(ring, backend)
+        config = self.rope.config
+        self.options = config.generation
+        prefix = fbase.suggest_key_prefix(self.rope.callable, config.key_prefix)
+        if config.key_hashtag:
+            prefix = "{{" + prefix + "}}"
+        self.key_prefix = self._refine(prefix.format())
+        self.generation_key = self.key_prefix + self._refine("@generation")
+        self._generation = None
+        self._expires_at = 0.0
+
+    def _refine(self, key):
+        encoding = self.rope.config.key_encoding
+        if encoding:
+            key = key.encode(encoding)
+        return key
+
+    def versioned_key(self, key, generation):
+        """Insert the generation after the key prefix of `key`.
+
+        `key_refactor` is applied to the versioned key; The given `key` is not
+        refactored yet.
+        """
+        mark = self._refine("@{}".format(generation))
+        prefix = self.key_prefix
+        if key[: len(prefix)] == prefix:
+            key = prefix + mark + key[len(prefix) :]
+        else:  # hashed keys without readable prefix
+            key = prefix + mark + self._refine(":") + key
+        key_refactor = self.rope.config.key_refactor
+        if key_refactor:
+            key = key_refactor(key)
+        return key
+
+    def _cache_generation(self, generation):
+        self._generation = generation
+        self._expires_at = time.monotonic() + self.options.ttl
+        return generation
+
+    def _cleanup_pattern(self, generation):
+        prefix = self.key_prefix
+        if isinstance(prefix, bytes):
+            prefix = prefix.decode(self.rope.config.key_encoding)
+        return "{}@{}:*".format(_escape_pattern(prefix), generation)
+
+    def _cleanup_args(self, generation):
+        # the key without arguments doesn't match the pattern
+        return (
+            self.versioned_key(self.key_prefix, generation),
+            self._cleanup_pattern(generation),
+            self.options.scan_count,
+        )
+
+    def _check_cleanup(self):
+        if getattr(self.raw_storage_class, "scan_delete_values", None) is None:
+            raise TypeError(
+                "{} doesn't support 'cleanup' of generations".format(
+                    self.raw_storage_class.__name__
+                )
+            )
+
+
+class GenerationalStorageMixin(GenerationalStorageMixinBase):
+    """Insert the generation of the ring into the keys of the storage."""
+
+    get_value = _versioned("get_value")
+    set_value = _versioned("set_value")
+    delete_value = _versioned("delete_value")
+    has_value = _versioned("has_value")
+    touch_value = _versioned("touch_value")
+
+    get_many_values = _versioned_many("get_many_values")
+    set_many_values = _versioned_many("set_many_values")
+    delete_many_values = _versioned_many("delete_many_values")
+    has_many_values = _versioned_many("has_many_values")
+    touch_many_values = _versioned_many("touch_many_values")
+
+    def generation(self):
+        """Return the current generation."""
+        if time.monotonic() < self._expires_at:
+            return self._generation
+        getter = getattr(self.raw_storage_class, "get_generation_value", None)
+        if getter is not None:
+            generation = getter(self, self.generation_key)
+        else:
+            try:
+                value = self.raw_storage_class.get_value(self, self.generation_key)
+                generation = int(value)
+            except fbase.NotFound:
+                generation = 0
+        return self._cache_generation(generation)
+
+    def clear(self):
+        """Invalidate every entry by incrementing the generation."""
+        if self.options.cleanup:
+            self._check_cleanup()
+        incr = getattr(self.raw_storage_class, "incr_generation_value", None)
+        if incr is not None:
+            generation = incr(self, self.generation_key)
+        else:
+            generation = self.generation() + 1
+            self.raw_storage_class.set_value(
+                self, self.generation_key, str(generation).encode(), None
+            )
+        self._cache_generation(generation)
+        if self.options.cleanup:
+            thread = threading.Thread(
+                target=self._cleanup, args=self._cleanup_args(generation - 1)
+            )
+            thread.daemon = True
+            thread.start()
+
+    def _cleanup(self, key, pattern, count):
+        self.raw_storage_class.delete_value(self, key)
+        self.raw_storage_class.scan_delete_values(self, pattern, count)
+
+
+class ConvertedGenerationalStorageMixin(GenerationalStorageMixin):
+    """:class:`GenerationalStorageMixin` with :mod:`asyncio` `clear`."""
+
+    async def clear(self):
+        return super(ConvertedGenerationalStorageMixin, self).clear()
+
+
+class AsyncGenerationalStorageMixin(GenerationalStorageMixinBase):
+    """Insert the generation of the ring into the keys of the storage.
+
+    :see: :class:`ring.func.generation.GenerationalStorageMixin`
+    """
+
+    get_value = _aversioned("get_value")
+    set_value = _aversioned("set_value")
+    delete_value = _aversioned("delete_value")
+    has_value = _aversioned("has_value")
+    touch_value = _aversioned("touch_value")
+
+    get_many_values = _aversioned_many("get_many_values")
+    set_many_values = _aversioned_many("set_many_values")
+    delete_many_values = _aversioned_many("delete_many_values")
+    has_many_values = _aversioned_many("has_many_values")
+    touch_many_values = _aversioned_many("touch_many_values")
+
+    async def generation(self):
+        """Return the current generation."""
+        if time.monotonic() < self._expires_at:
+            return self._generation
+        getter = getattr(self.raw_storage_class, "get_generation_value", None)
+        if getter is not None:
+            generation = await getter(self, self.generation_key)
+        else:
+            try:
+                value = await _awaitable(
+                    self.raw_storage_class.get_value(self, self.generation_key)
+                )
+                generation = int(value)
+            except fbase.NotFound:
+                generation = 0
+        return self._cache_generation(generation)
+
+    async def clear(self):
+        """Invalidate every entry by incrementing the generation."""
+        if self.options.cleanup:
+            self._check_cleanup()
+        incr = getattr(self.raw_storage_class, "incr_generation_value", None)
+        if incr is not None:
+            generation = await incr(self, self.generation_key)
+        else:
+            generation = await self.generation() + 1
+            await _awaitable(
+                self.raw_storage_class.set_value(
+                    self, self.generation_key, str(generation).encode(), None
+                )
+            )
+        self._cache_generation(generation)
+        if self.options.cleanup:
+            self.cleanup_task = asyncio.ensure_future(
+                self._cleanup(*self._cleanup_args(generation - 1))
+            )
+
+    async def _cleanup(self, key, pattern, count):
+        await _awaitable(self.raw_storage_class.delete_value(self, key))
+        await self.raw_storage_class.scan_delete_values(self, pattern, count)
+
+
+_generational_storage_classes = {}
+
+
+def generational_storage_class(storage_class):
+    """Create a subclass of `storage_class` with generations in the keys."""
+    generational_class = _generational_storage_classes.get(storage_class)
+    if generational_class is None:
+        if inspect.iscoroutinefunction(getattr(storage_class, "get_value", None)):
+            mixin = AsyncGenerationalStorageMixin
+        elif inspect.iscoroutinefunction(getattr(storage_class, "get", None)):
+            # synchronous storages converted for asyncio
+            mixin = ConvertedGenerationalStorageMixin
+        else:
+            mixin = GenerationalStorageMixin
+        attrs = {"raw_storage_class": storage_class}
+        for name in ("tag_values", "untag_values"):
+            if getattr(storage_class, name, None) is not None:
+                if mixin is AsyncGenerationalStorageMixin:
+                    attrs[name] = _aversioned_many(name)
+                else:
+                    attrs[name] = _versioned_many(name)
+        generational_class = type(
+            "Generational" + storage_class.__name__,
+            (mixin, storage_class),
+            attrs,
+        )
+        _generational_storage_classes[storage_class] = generational_class
+    return generational_class
@@ -21,6 +21,9 @@ class LruCache(object):
     """Created by breaking down functools.lru_cache from CPython 3.7.0."""
 
     now = time.time
+    #: The callback ``on_evict(key, result)`` called when the least recently
+    #: used item is evicted to make room for a new item.
+    on_evict = None
 
     def __init__(self, maxsize):
         cache = {}
@@ -79,6 +82,7 @@ class LruCache(object):
             expired_time = expiration_time(expire)
             if maxsize == 0:
                 return
+            oldkey = SENTINEL
             with lock:
                 link = cache_get(key)
                 if link is not None:
@@ -119,6 +123,9 @@ class LruCache(object):
                         raise TypeError("Expected maxsize to be an integer or None")
                     if maxsize is not None:
                         stat[FULL] = cache_len() >= maxsize
+            # call outside of the lock to allow the callback to use the cache
+            if oldkey is not SENTINEL and self.on_evict is not None:
+                self.on_evict(oldkey, oldresult)
 
         def cache_info():
             """Report cache statistics"""
@@ -0,0 +1,361 @@
+""":mod:`ring.func.mmap_cache` --- memory-mapped persistent hash table.
+=======================================================================
+
+An open-addressing hash table of fixed-size slots in a memory-mapped file.
+Every process opening the same file shares the same pages, so a value written
+by a process is visible to the others without any serialization layer.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import time
+from threading import RLock
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+MAGIC = b"RINGMMAP"
+VERSION = 1
+# magic, version, slot_size, slot_count
+HEADER = struct.Struct("<8sIIQ")
+HEADER_SIZE = 64
+# state, key length, value length, key hash, expiration time
+SLOT_HEADER = struct.Struct("<BHIQd")
+EMPTY, USED, DELETED = 0, 1, 2  # names for the slot states
+
+
+def _hash(key):
+    return struct.unpack("<Q", hashlib.blake2b(key, digest_size=8).digest())[0]
+
+
+class MmapCache(object):
+    """Persistent hash table in a memory-mapped file.
+
+    The table has `slot_count` slots and each slot stores a key and a
+    :class:`bytes` value up to `slot_size` bytes in total. A key lives within
+    `max_probe` slots from its home slot; When there is no free slot in the
+    range, the home slot is evicted. Deleted and expired slots are reused by
+    later writes and :meth:`compact` rebuilds the table to clean them up.
+
+    When the file already exists, the table layout is loaded from the file
+    and `slot_size` and `slot_count` are ignored.
+
+    :param str path: The file path of the table.
+    :param int slot_count: The number of slots.
+    :param int slot_size: The maximum bytes of key and value in a slot.
+    :param int max_probe: The maximum number of slots to probe for a key.
+    """
+
+    now = time.time
+
+    def __init__(self, path, slot_count=4096, slot_size=1024, max_probe=16):
+        self.path = path
+        self.max_probe = max_probe
+        self._lock = RLock()
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            with self._file_lock(exclusive=True):
+                if os.fstat(self._fd).st_size < HEADER_SIZE:
+                    total_size = (
+                        HEADER_SIZE + (SLOT_HEADER.size + slot_size) * slot_count
+                    )
+                    os.ftruncate(self._fd, total_size)
+                    header = HEADER.pack(MAGIC, VERSION, slot_size, slot_count)
+                    os.lseek(self._fd, 0, os.SEEK_SET)
+                    os.write(self._fd, header)
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                header = os.read(self._fd, HEADER.size)
+            magic, version, slot_size, slot_count = HEADER.unpack(header)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError("'{}' is not a ring mmap cache file".format(path))
+            self.slot_size = slot_size
+            self.slot_count = slot_count
+            self._slot_total = SLOT_HEADER.size + slot_size
+            self._map = mmap.mmap(self._fd, 0)
+        except Exception:
+            os.close(self._fd)
+            raise
+
+    def _file_lock(self, exclusive):
+        return _FileLock(self._fd, exclusive)
+
+    def _locked(self, exclusive=False):
+        return _Locked(self._lock, self._file_lock(exclusive))
+
+    def _offset(self, index):
+        return HEADER_SIZE + index * self._slot_total
+
+    def _find(self, bkey, keyhash, _now):
+        """Return the slot index of `bkey`, or :data:`None`."""
+        _map = self._map
+        key_len = len(bkey)
+        home = keyhash % self.slot_count
+        for i in range(min(self.max_probe, self.slot_count)):
+            index = (home + i) % self.slot_count
+            offset = self._offset(index)
+            state, slot_key_len, _, slot_hash, expire = SLOT_HEADER.unpack_from(
+                _map, offset
+            )
+            if state == EMPTY:
+                return None
+            if state != USED or slot_hash != keyhash or slot_key_len != key_len:
+                continue
+            key_offset = offset + SLOT_HEADER.size
+            if _map[key_offset : key_offset + key_len] != bkey:
+                continue
+            if expire and expire < _now:
+                return None
+            return index
+        return None
+
+    def _slot_for_write(self, bkey, keyhash, _now):
+        """Return the slot index to write `bkey`."""
+        _map = self._map
+        home = keyhash % self.slot_count
+        reusable = None
+        for i in range(min(self.max_probe, self.slot_count)):
+            index = (home + i) % self.slot_count
+            offset = self._offset(index)
+            state, slot_key_len, _, slot_hash, expire = SLOT_HEADER.unpack_from(
+                _map, offset
+            )
+            if state == EMPTY:
+                return index if reusable is None else reusable
+            if state == USED and slot_hash == keyhash:
+                key_offset = offset + SLOT_HEADER.size
+                if _map[key_offset : key_offset + slot_key_len] == bkey:
+                    return index
+            if reusable is None and (state == DELETED or (expire and expire < _now)):
+                reusable = index
+        return home if reusable is None else reusable
+
+    def _write(self, index, bkey, keyhash, value, expired_time):
+        _map = self._map
+        offset = self._offset(index)
+        key_offset = offset + SLOT_HEADER.size
+        value_offset = key_offset + len(bkey)
+        _map[key_offset:value_offset] = bkey
+        _map[value_offset : value_offset + len(value)] = value
+        SLOT_HEADER.pack_into(
+            _map, offset, USED, len(bkey), len(value), keyhash, expired_time
+        )
+
+    def _value_range(self, index):
+        offset = self._offset(index)
+        _, key_len, value_len, _, _ = SLOT_HEADER.unpack_from(self._map, offset)
+        value_offset = offset + SLOT_HEADER.size + key_len
+        return value_offset, value_offset + value_len
+
+    def get(self, key):
+        """Return a copy of the value for the given key.
+
+        :raise KeyError: When the key doesn't exist or is expired.
+        """
+        bkey = _to_bytes(key)
+        keyhash = _hash(bkey)
+        _now = self.now()
+        with self._locked():
+            index = self._find(bkey, keyhash, _now)
+            if index is None:
+                raise KeyError(key)
+            begin, end = self._value_range(index)
+            return self._map[begin:end]
+
+    def view(self, key):
+        """Return a zero-copy :class:`memoryview` of the value for the key.
+
+        :note: The view refers the shared memory. Only the lookup is locked;
+            Reading the view is not, so later writes of the same slot from
+            any thread or process change the content of the view, even while
+            it is read. Use :meth:`get` for a consistent copy.
+        :note: :meth:`close` fails with :exc:`BufferError` while any view is
+            alive. Release the views by :meth:`memoryview.release` or drop
+            them before closing.
+        :raise KeyError: When the key doesn't exist or is expired.
+        """
+        bkey = _to_bytes(key)
+        keyhash = _hash(bkey)
+        _now = self.now()
+        with self._locked():
+            index = self._find(bkey, keyhash, _now)
+            if index is None:
+                raise KeyError(key)
+            begin, end = self._value_range(index)
+            return memoryview(self._map)[begin:end]
+
+    def set(self, key, value, expire=None):
+        """Set the value for the given key with optional expiration seconds."""
+        bkey = _to_bytes(key)
+        value = memoryview(value).cast("B")
+        if len(bkey) + len(value) > self.slot_size:
+            raise ValueError(
+                "The key and value size {} exceeds the slot size {}".format(
+                    len(bkey) + len(value), self.slot_size
+                )
+            )
+        keyhash = _hash(bkey)
+        _now = self.now()
+        expired_time = 0.0 if expire is None else _now + expire
+        with self._locked(exclusive=True):
+            index = self._slot_for_write(bkey, keyhash, _now)
+            self._write(index, bkey, keyhash, value, expired_time)
+
+    def delete(self, key):
+        """Delete the given key.
+
+        :raise KeyError: When the key doesn't exist.
+        """
+        bkey = _to_bytes(key)
+        keyhash = _hash(bkey)
+        with self._locked(exclusive=True):
+            index = self._find(bkey, keyhash, self.now())
+            if index is None:
+                raise KeyError(key)
+            self._map[self._offset(index)] = DELETED
+
+    def has(self, key):
+        bkey = _to_bytes(key)
+        with self._locked():
+            return self._find(bkey, _hash(bkey), self.now()) is not None
+
+    def touch(self, key, expire=None):
+        """Reset the expiration of the given key.
+
+        :raise KeyError: When the key doesn't exist.
+        """
+        bkey = _to_bytes(key)
+        keyhash = _hash(bkey)
+        _now = self.now()
+        with self._locked(exclusive=True):
+            index = self._find(bkey, keyhash, _now)
+            if index is None:
+                raise KeyError(key)
+            expired_time = 0.0 if expire is None else _now + expire
+            expire_offset = self._offset(index) + SLOT_HEADER.size - 8
+            struct.pack_into("<d", self._map, expire_offset, expired_time)
+
+    def compact(self):
+        """Rebuild the table to clean up deleted and expired slots."""
+        _now = self.now()
+        with self._locked(exclusive=True):
+            _map = self._map
+            items = []
+            for index in range(self.slot_count):
+                offset = self._offset(index)
+                state, key_len, value_len, _, expire = SLOT_HEADER.unpack_from(
+                    _map, offset
+                )
+                if state != USED or (expire and expire < _now):
+                    continue
+                key_offset = offset + SLOT_HEADER.size
+                value_offset = key_offset + key_len
+                items.append(
+                    (
+                        _map[key_offset:value_offset],
+                        _map[value_offset : value_offset + value_len],
+                        expire,
+                    )
+                )
+            self._clear()
+            for bkey, value, expire in items:
+                keyhash = _hash(bkey)
+                index = self._slot_for_write(bkey, keyhash, _now)
+                self._write(index, bkey, keyhash, value, expire)
+
+    def _clear(self):
+        for index in range(self.slot_count):
+            self._map[self._offset(index)] = EMPTY
+
+    def clear(self):
+        """Delete every key in the table."""
+        with self._locked(exclusive=True):
+            self._clear()
+
+    def flush(self):
+        """Flush the memory-mapped pages to the file."""
+        self._map.flush()
+
+    def close(self):
+        """Close the memory map and the file.
+
+        :raise BufferError: When any view from :meth:`view` is not released
+            yet. The table stays open and can be closed again after the views
+            are released.
+        """
+        if self._map.closed:
+            return
+        self._map.close()
+        os.close(self._fd)
+
+    def __len__(self):
+        _now = self.now()
+        count = 0
+        with self._locked():
+            for index in range(self.slot_count):
+                state, _, _, _, expire = SLOT_HEADER.unpack_from(
+                    self._map, self._offset(index)
+                )
+                if state == USED and not (expire and expire < _now):
+                    count += 1
+        return count
+
+    def __getitem__(self, key):
+        return self.get(key)
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def __delitem__(self, key):
+        self.delete(key)
+
+    def __contains__(self, key):
+        return self.has(key)
+
+
+def _to_bytes(key):
+    if isinstance(key, bytes):
+        return key
+    return key.encode("utf-8")
+
+
+class _FileLock(object):
+    __slots__ = ("fd", "operation")
+
+    def __init__(self, fd, exclusive):
+        self.fd = fd
+        if fcntl is not None:
+            self.operation = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+
+    def __enter__(self):
+        if fcntl is not None:
+            fcntl.flock(self.fd, self.operation)
+
+    def __exit__(self, *exc_info):
+        if fcntl is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+
+
+class _Locked(object):
+    __slots__ = ("lock", "file_lock")
+
+    def __init__(self, lock, file_lock):
+        self.lock = lock
+        self.file_lock = file_lock
+
+    def __enter__(self):
+        self.lock.acquire()
+        try:
+            self.file_lock.__enter__()
+        except Exception:
+            self.lock.release()
+            raise
+
+    def __exit__(self, *exc_info):
+        try:
+            self.file_lock.__exit__(*exc_info)
+        finally:
+            self.lock.release()
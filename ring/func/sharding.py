@@ -0,0 +1,256 @@
+""":mod:`ring.func.sharding` --- Sharded storages over multiple clients.
+=======================================================================
+
+One logical cache over several nodes. Give a :class:`Shards` of clients to a
+factory instead of a single client:
+
+    >>> shards = ring.func.sharding.Shards([client1, client2, client3])
+    >>> @ring.redis(shards)
+    ... def f(...):
+    ...     ...
+
+The keys are routed to the nodes by consistent hashing. The bulk operations
+are split into batches for each node and run concurrently.
+"""
+
+import asyncio
+import bisect
+import collections
+import concurrent.futures
+import hashlib
+import inspect
+import threading
+
+from . import base as fbase
+
+__all__ = ("ConsistentHash", "Shards", "sharded_storage_class")
+
+
+def _hash(value):
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(value, digest_size=8).digest(), "big")
+
+
+class ConsistentHash(object):
+    """Consistent hashing of keys onto named nodes.
+
+    Each node is placed on the hash ring `replicas` times as virtual nodes.
+    Adding or removing a node only moves the keys of the node.
+
+    :param List[str] names: The stable names of the nodes.
+    :param int replicas: The number of virtual nodes for each node.
+    """
+
+    def __init__(self, names, replicas=160):
+        if not names:
+            raise ValueError("'names' must not be empty")
+        points = sorted(
+            (_hash("{}-{}".format(name, replica)), index)
+            for index, name in enumerate(names)
+            for replica in range(replicas)
+        )
+        self.points = [point for point, _ in points]
+        self.indices = [index for _, index in points]
+
+    def index_of(self, key):
+        """Return the index of the node for the given key."""
+        i = bisect.bisect(self.points, _hash(key))
+        if i == len(self.points):
+            i = 0
+        return self.indices[i]
+
+    def partition(self, keys):
+        """Group the positions of the keys by the indices of their nodes.
+
+        :rtype: Dict[int,List[int]]
+        """
+        partitions = collections.defaultdict(list)
+        for position, key in enumerate(keys):
+            partitions[self.index_of(key)].append(position)
+        return partitions
+
+
+class Shards(object):
+    """Storage backend of multiple clients routed by consistent hashing.
+
+    :param Union[List[Any],Dict[str,Any]] clients: The clients of the nodes.
+        A :class:`dict` gives the names of the nodes; Otherwise the positions
+        are the names. Keep the names stable, because they decide the nodes
+        of the keys.
+    :param int replicas: The number of virtual nodes for each node.
+    :param Optional[concurrent.futures.Executor] executor: The executor to
+        run the batches of synchronous clients concurrently. A thread pool
+        for the nodes is created at the first use when :data:`None` is
+        given.
+    """
+
+    def __init__(self, clients, replicas=160, executor=None):
+        if isinstance(clients, dict):
+            names = [str(name) for name in clients]
+            clients = list(clients.values())
+        else:
+            clients = list(clients)
+            names = [str(index) for index in range(len(clients))]
+        self.clients = clients
+        self.hash = ConsistentHash(names, replicas)
+        self._executor = executor
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=len(self.clients)
+                    )
+        return self._executor
+
+    def client_of(self, key):
+        """Return the client of the node for the given key."""
+        return self.clients[self.hash.index_of(key)]
+
+
+def _route(name):
+    def routed(self, key, *args):
+        return getattr(self._shard_of(key), name)(key, *args)
+
+    routed.__name__ = name
+    return routed
+
+
+def _route_many(name, returns, aligned=0):
+    # the first `aligned` arguments are lists aligned with `keys`
+    def routed(self, keys, *args):
+        return self._run_many(name, returns, aligned, keys, args)
+
+    routed.__name__ = name
+    return routed
+
+
+class ShardedStorageMixin(object):
+    """Route the storage operations to the storages of the nodes.
+
+    The single key operations go to the storage of the node of the key. The
+    bulk operations are split into batches for each node, run concurrently
+    and their results are reassembled in the order of the keys.
+    """
+
+    #: The storage class of each node.
+    node_storage_class = None
+    #: The node storages are asynchronous.
+    is_asyncio = False
+
+    def __init__(self, ring, backend):
+        super(ShardedStorageMixin, self).__init__(ring, backend)
+        self.nodes = [
+            self.node_storage_class(ring, client) for client in backend.clients
+        ]
+
+    def _shard_of(self, key):
+        return self.nodes[self.backend.hash.index_of(key)]
+
+    get_value = _route("get_value")
+    set_value = _route("set_value")
+    delete_value = _route("delete_value")
+    has_value = _route("has_value")
+    touch_value = _route("touch_value")
+
+    get_many_values = _route_many("get_many_values", True)
+    set_many_values = _route_many("set_many_values", False, aligned=1)
+    delete_many_values = _route_many("delete_many_values", False)
+    has_many_values = _route_many("has_many_values", True)
+    touch_many_values = _route_many("touch_many_values", False)
+
+    def _batches(self, name, aligned, keys, args):
+        lists = (keys,) + args[:aligned]
+        rest = args[aligned:]
+        batches = []
+        for index, positions in self.backend.hash.partition(keys).items():
+            method = getattr(self.nodes[index], name)
+            batch_args = tuple([items[p] for p in positions] for items in lists)
+            batches.append((positions, method, batch_args + rest))
+        return batches
+
+    def _run_many(self, name, returns, aligned, keys, args):
+        batches = self._batches(name, aligned, keys, args)
+        if self.is_asyncio:
+            return self._gather_many(batches, returns, len(keys))
+        if len(batches) == 1:
+            results = [method(*margs) for _, method, margs in batches]
+        else:
+            submit = self.backend.executor.submit
+            futures = [submit(method, *margs) for _, method, margs in batches]
+            results = [future.result() for future in futures]
+        if returns:
+            return _reassemble(batches, results, len(keys))
+
+    async def _gather_many(self, batches, returns, size):
+        results = await asyncio.gather(
+            *(_awaitable(method(*margs)) for _, method, margs in batches)
+        )
+        if returns:
+            return _reassemble(batches, results, size)
+
+
+async def _awaitable(result):
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+def _reassemble(batches, results, size):
+    merged = [fbase.NotFound] * size
+    for (positions, _, _), values in zip(batches, results):
+        for position, value in zip(positions, values):
+            merged[position] = value
+    return merged
+
+
+def _broadcast(name):
+    def broadcast(self, *args):
+        results = [getattr(node, name)(*args) for node in self.nodes]
+        if self.is_asyncio:
+            return asyncio.gather(*results)
+        return results
+
+    broadcast.__name__ = name
+    return broadcast
+
+
+#: The optional operations of the storages routed by their keys.
+_routed_optionals = ("get_generation_value", "incr_generation_value")
+#: The optional operations of the storages for every node.
+_broadcast_optionals = ("scan_delete_values", "invalidate_tag_values")
+
+_sharded_storage_classes = {}
+
+
+def sharded_storage_class(storage_class):
+    """Create a subclass of `storage_class` for :class:`Shards` backends."""
+    sharded_class = _sharded_storage_classes.get(storage_class)
+    if sharded_class is None:
+        attrs = {
+            "node_storage_class": storage_class,
+            "is_asyncio": inspect.iscoroutinefunction(
+                getattr(storage_class, "get_value", None)
+            ),
+        }
+        for name in _routed_optionals:
+            if getattr(storage_class, name, None) is not None:
+                attrs[name] = _route(name)
+        for name in ("tag_values", "untag_values"):
+            if getattr(storage_class, name, None) is not None:
+                # each node keeps the tags of its own keys
+                attrs[name] = _route_many(name, False, aligned=1)
+        for name in _broadcast_optionals:
+            if getattr(storage_class, name, None) is not None:
+                attrs[name] = _broadcast(name)
+        sharded_class = type(
+            "Sharded" + storage_class.__name__,
+            (ShardedStorageMixin, storage_class),
+            attrs,
+        )
+        _sharded_storage_classes[storage_class] = sharded_class
+    return sharded_class
@@ -0,0 +1,208 @@
+""":mod:`ring.func.stats` --- Statistics of ring wires.
+======================================================
+
+Opt-in statistics layer enabled by `stats` parameter of factories. Nothing in
+this module runs when it is not enabled.
+"""
+
+import inspect
+import time
+
+from . import base as fbase
+
+#: The storage methods counted as storage I/O.
+STORAGE_METHODS = (
+    "get_value",
+    "set_value",
+    "delete_value",
+    "get_many_values",
+    "set_many_values",
+    "delete_many_values",
+)
+
+#: The names of latency histograms.
+LATENCY_NAMES = ("key", "storage", "coder", "execute")
+
+#: The number of buckets of :class:`LatencyHistogram`.
+BUCKET_COUNT = 32
+
+
+class LatencyHistogram(object):
+    """Histogram of latencies in power-of-two microsecond buckets.
+
+    The bucket ``i`` counts latencies under ``2 ** i`` microseconds. The last
+    bucket also counts every longer latency.
+    """
+
+    __slots__ = ("count", "total", "buckets")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.total = 0.0
+        self.buckets = [0] * BUCKET_COUNT
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        index = int(seconds * 1000000).bit_length()
+        if index >= BUCKET_COUNT:
+            index = BUCKET_COUNT - 1
+        self.buckets[index] += 1
+
+    def percentile(self, ratio):
+        """Return the upper bound seconds of the bucket at the given ratio."""
+        if not self.count:
+            return 0.0
+        threshold = self.count * ratio
+        accumulated = 0
+        for index, count in enumerate(self.buckets):
+            accumulated += count
+            if accumulated >= threshold:
+                break
+        return (2**index) / 1000000.0
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(0.5),
+            "p99": self.percentile(0.99),
+            "buckets": {
+                (2**index) / 1000000.0: count
+                for index, count in enumerate(self.buckets)
+                if count
+            },
+        }
+
+
+class RingStats(object):
+    """Counters and latency histograms of a ring rope.
+
+    :see: :meth:`ring.func.base.RingWire.stats` for the snapshot.
+    """
+
+    now = time.perf_counter
+
+    def __init__(self):
+        self.latencies = {name: LatencyHistogram() for name in LATENCY_NAMES}
+        self.reset()
+
+    def reset(self):
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.deletes = 0
+        self.errors = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        for histogram in self.latencies.values():
+            histogram.reset()
+
+    def snapshot(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "sets": self.sets,
+            "deletes": self.deletes,
+            "errors": self.errors,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "latency": {
+                name: histogram.as_dict()
+                for name, histogram in self.latencies.items()
+            },
+        }
+
+    def timed(self, name, func, on_result=None):
+        """Wrap `func` to record its latency into the histogram `name`.
+
+        Awaitable results are awaited in the returned coroutine to record the
+        latency of the whole work.
+        """
+        histogram = self.latencies[name]
+        now = self.now
+
+        async def _await(awaitable, began, args, kwargs):
+            try:
+                result = await awaitable
+            except fbase.NotFound:
+                histogram.add(now() - began)
+                self.misses += 1
+                raise
+            except Exception:
+                histogram.add(now() - began)
+                self.errors += 1
+                raise
+            histogram.add(now() - began)
+            if on_result is not None:
+                on_result(result, *args, **kwargs)
+            return result
+
+        def _timed(*args, **kwargs):
+            began = now()
+            try:
+                result = func(*args, **kwargs)
+            except fbase.NotFound:
+                histogram.add(now() - began)
+                self.misses += 1
+                raise
+            except Exception:
+                histogram.add(now() - began)
+                self.errors += 1
+                raise
+            if inspect.isawaitable(result):
+                return _await(result, began, args, kwargs)
+            histogram.add(now() - began)
+            if on_result is not None:
+                on_result(result, *args, **kwargs)
+            return result
+
+        return _timed
+
+    def on_get_value(self, value, storage, key):
+        self.hits += 1
+        self.bytes_in += fbase.payload_size(value)
+
+    def on_set_value(self, result, storage, key, value, expire):
+        self.sets += 1
+        self.bytes_out += fbase.payload_size(value)
+
+    def on_delete_value(self, result, storage, key):
+        self.deletes += 1
+
+    def on_get_many_values(self, values, storage, keys):
+        for value in values:
+            if value is fbase.NotFound:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.bytes_in += fbase.payload_size(value)
+
+    def on_set_many_values(self, result, storage, keys, values, expire):
+        self.sets += len(values)
+        self.bytes_out += sum(fbase.payload_size(value) for value in values)
+
+    def on_delete_many_values(self, result, storage, keys):
+        self.deletes += len(keys)
+
+    def storage_class(self, storage_class):
+        """Create a subclass of `storage_class` recording the storage I/O."""
+        attrs = {}
+        for name in STORAGE_METHODS:
+            method = getattr(storage_class, name, None)
+            if method is None:
+                continue
+            attrs[name] = self.timed("storage", method, getattr(self, "on_" + name))
+        return type("Stats" + storage_class.__name__, (storage_class,), attrs)
+
+    def instrument(self, rope):
+        """Record key building, coder and function execution of `rope`."""
+        rope.compose_key = self.timed("key", rope.compose_key)
+        rope._encode = self.timed("coder", rope.config.coder.encode)
+        rope._decode = self.timed("coder", rope.config.coder.decode)
+        user_interface = rope.user_interface
+        user_interface.execute = self.timed("execute", user_interface.execute)
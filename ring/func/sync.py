@@ -6,20 +6,30 @@ factories.
 """
 
 from ring.typing import Any, Optional, List
+import atexit
+import functools
 import time
 import re
 import hashlib
+import sqlite3
+import threading
+import weakref
 
-from . import base as fbase, lru_cache as lru_mod
+from . import base as fbase, lru_cache as lru_mod, mmap_cache as mmap_mod
+from . import weak_cache as weak_mod
+from .. import _redis
 
 __all__ = (
     "lru",
+    "weak",
     "dict",
     "memcache",
     "redis_py",
     "redis_py_hash",
     "shelve",
     "diskcache",
+    "mmap",
+    "sqlite",
 )
 
 
@@ -42,6 +52,7 @@ class CacheUserInterface(fbase.BaseUserInterface):
     def update(self, wire, pargs):
         key = self.key(wire, pargs=pargs)
         result = self.execute(wire, pargs=pargs)
+        wire._rope.tag(wire, [key], [pargs])
         wire.storage.set(key, result)
         return result
 
@@ -51,6 +62,7 @@ class CacheUserInterface(fbase.BaseUserInterface):
             result = wire.storage.get(key)
         except fbase.NotFound:
             result = self.execute(wire, pargs=pargs)
+            wire._rope.tag(wire, [key], [pargs])
             wire.storage.set(key, result)
         return result
 
@@ -60,11 +72,13 @@ class CacheUserInterface(fbase.BaseUserInterface):
     )
     def set(self, wire, _value, pargs):
         key = self.key(wire, pargs=pargs)
+        wire._rope.tag(wire, [key], [pargs])
         wire.storage.set(key, _value)
 
     @fbase.interface_attrs(return_annotation=None)
     def delete(self, wire, pargs):
         key = self.key(wire, pargs=pargs)
+        wire._rope.untag(wire, [key], [pargs])
         wire.storage.delete(key)
 
     @fbase.interface_attrs(return_annotation=bool)
@@ -109,6 +123,7 @@ class BulkInterfaceMixin(fbase.AbstractBulkUserInterfaceMixin):
     def update_many(self, wire, pargs):
         keys = self.key_many(wire, pargs)
         values = self.execute_many(wire, pargs)
+        wire._rope.tag(wire, keys, pargs.args)
         wire.storage.set_many(keys, values)
         return values
 
@@ -132,6 +147,7 @@ class BulkInterfaceMixin(fbase.AbstractBulkUserInterfaceMixin):
             fbase.execute_bulk_item(wire, pargs.args[i]) for i in miss_indices
         ]
         new_keys = [keys[i] for i in miss_indices]
+        wire._rope.tag(wire, new_keys, [pargs.args[i] for i in miss_indices])
         wire.storage.set_many(new_keys, new_results)
 
         for new_i, old_i in enumerate(miss_indices):
@@ -144,6 +160,7 @@ class BulkInterfaceMixin(fbase.AbstractBulkUserInterfaceMixin):
     def set_many(self, wire, pargs):
         args_list, value_list = pargs.args
         keys = self.key_many(wire, fbase.ArgPack((), args_list, {}))
+        wire._rope.tag(wire, keys, args_list)
         wire.storage.set_many(keys, value_list)
 
     @fbase.interface_attrs(
@@ -151,6 +168,7 @@ class BulkInterfaceMixin(fbase.AbstractBulkUserInterfaceMixin):
     )
     def delete_many(self, wire, pargs):
         keys = self.key_many(wire, pargs)
+        wire._rope.untag(wire, keys, pargs.args)
         wire.storage.delete_many(keys)
 
     @fbase.interface_attrs(
@@ -222,6 +240,34 @@ class LruStorage(fbase.CommonMixinStorage, fbase.StorageMixin):
             pass
 
 
+class WeakValueStorage(fbase.CommonMixinStorage, fbase.StorageMixin):
+    """Storage implementation for :class:`ring.func.weak_cache.WeakValueCache`.
+
+    The values are stored as they are to be referenced weakly; Encoding
+    coders make new objects which are alive only in the strong window.
+    """
+
+    in_memory_storage = True
+
+    def get_value(self, key):
+        value = self.backend.get(key)
+        if value is weak_mod.SENTINEL:
+            raise fbase.NotFound
+        return value
+
+    def has_value(self, key):
+        return self.backend.has(key)
+
+    def set_value(self, key, value, expire):
+        self.backend.set(key, value)
+
+    def delete_value(self, key):
+        try:
+            self.backend.delete(key)
+        except KeyError:
+            pass
+
+
 class ExpirableDictStorage(fbase.CommonMixinStorage, fbase.StorageMixin):
     in_memory_storage = True
     now = time.time
@@ -289,16 +335,124 @@ class PersistentDictStorage(fbase.CommonMixinStorage, fbase.StorageMixin):
         return key in self.backend
 
 
-class ShelveStorage(PersistentDictStorage):
+_shelve_unbuffered = object()
+
+
+class ShelveStorage(PersistentDictStorage, BulkStorageMixin):
+    """Storage implementation for :class:`shelve.Shelf`.
+
+    Writes are buffered as dirty keys and written behind to the shelf. The
+    buffer is flushed and the shelf is synced when `flush_count` dirty keys
+    are collected, when a read or write finds `flush_interval` seconds passed
+    since the last flush, on explicit :meth:`flush` call or on interpreter
+    exit. No timer thread is involved, so an idle storage keeps its buffer
+    until the next access. Reads always see the buffered writes.
+
+    The default `flush_count` ``1`` syncs the shelf on every write.
+    """
+
+    #: The number of dirty keys to trigger flush. :data:`None` for no limit.
+    flush_count = 1
+    #: The seconds from the last flush to trigger flush on the next read or
+    #: write. :data:`None` for no limit.
+    flush_interval = None
+    now = time.time
+
+    def __init__(self, ring, backend):
+        super(ShelveStorage, self).__init__(ring, backend)
+        self._dirty = {}
+        self._lock = threading.RLock()
+        self._flushed_time = self.now()
+        if self.flush_count != 1:
+            ref = weakref.ref(self)
+
+            def _flush_at_exit():
+                storage = ref()
+                if storage is not None:
+                    storage.flush()
+
+            atexit.register(_flush_at_exit)
+
+    def _interval_passed(self):
+        return (
+            self.flush_interval is not None
+            and self.now() - self._flushed_time >= self.flush_interval
+        )
+
+    def _write_behind(self, items):
+        with self._lock:
+            self._dirty.update(items)
+            if (
+                self.flush_count is not None and len(self._dirty) >= self.flush_count
+            ) or self._interval_passed():
+                self.flush()
+
+    def _buffered(self, key):
+        # must be called with the lock
+        if self._dirty and self._interval_passed():
+            self.flush()
+        return self._dirty.get(key, _shelve_unbuffered)
+
+    def flush(self):
+        """Write the buffered dirty keys to the shelf and sync it."""
+        with self._lock:
+            self._flushed_time = self.now()
+            if not self._dirty:
+                return
+            dirty, self._dirty = self._dirty, {}
+            backend = self.backend
+            for key, value in dirty.items():
+                if value is fbase.NotFound:
+                    try:
+                        del backend[key]
+                    except KeyError:
+                        pass
+                else:
+                    backend[key] = value
+            backend.sync()
+
+    def get_value(self, key):
+        with self._lock:
+            value = self._buffered(key)
+            if value is _shelve_unbuffered:
+                return super(ShelveStorage, self).get_value(key)
+        if value is fbase.NotFound:
+            raise fbase.NotFound
+        return value
+
     def set_value(self, key, value, expire):
-        super(ShelveStorage, self).set_value(key, value, expire)
-        self.backend.sync()
+        self._write_behind(((key, value),))
 
     def delete_value(self, key):
-        super(ShelveStorage, self).delete_value(key)
-        self.backend.sync()
+        self._write_behind(((key, fbase.NotFound),))
+
+    def has_value(self, key):
+        with self._lock:
+            value = self._buffered(key)
+            if value is _shelve_unbuffered:
+                return super(ShelveStorage, self).has_value(key)
+        return value is not fbase.NotFound
+
+    def get_many_values(self, keys):
+        values = []
+        for key in keys:
+            try:
+                values.append(self.get_value(key))
+            except fbase.NotFound:
+                values.append(fbase.NotFound)
+        return values
+
+    def set_many_values(self, keys, values, expire):
+        self._write_behind(zip(keys, values))
+
+    def delete_many_values(self, keys):
+        self._write_behind((key, fbase.NotFound) for key in keys)
+
+    def has_many_values(self, keys):
+        return [self.has_value(key) for key in keys]
 
     def __del__(self):
+        self.flush()
         self.backend.close()
 
 
@@ -328,6 +482,16 @@ class MemcacheStorage(fbase.CommonMixinStorage, fbase.StorageMixin, BulkStorageM
     def delete_many_values(self, keys):
         return self.backend.delete_multi(keys)
 
+    def get_generation_value(self, key):
+        return int(self.backend.get(key) or 0)
+
+    def incr_generation_value(self, key):
+        generation = self.backend.incr(key, 1)
+        if generation is None:
+            self.backend.add(key, 0, 0)
+            generation = self.backend.incr(key, 1)
+        return int(generation)
+
 
 class RedisStorage(fbase.CommonMixinStorage, fbase.StorageMixin, BulkStorageMixin):
     def get_value(self, key):
@@ -360,8 +524,112 @@ class RedisStorage(fbase.CommonMixinStorage, fbase.StorageMixin, BulkStorageMixi
             for key in keys:
                 self.backend.expire(key, expire)
 
+    def get_generation_value(self, key):
+        return int(self.backend.get(key) or 0)
+
+    def incr_generation_value(self, key):
+        return self.backend.incr(key)
+
+    def scan_delete_values(self, pattern, count):
+        """Delete the keys matching `pattern` by ``SCAN`` and ``UNLINK``."""
+        keys = self.backend.scan_iter(match=pattern, count=count)
+        for batch in _redis.chunks(keys, count):
+            self._unlink_many(batch, count)
+
+    def tag_values(self, keys, tags_list):
+        """Add the keys to the ``SET`` of each of their tags."""
+        pipeline = self.backend.pipeline(transaction=False)
+        batches = _redis.tag_batches(self.rope.tag_key_prefix, keys, tags_list)
+        for tag_key, tagged_keys in batches.items():
+            pipeline.sadd(tag_key, *tagged_keys)
+        pipeline.execute()
+
+    def untag_values(self, keys, tags_list):
+        """Remove the keys from the ``SET`` of each of their tags."""
+        pipeline = self.backend.pipeline(transaction=False)
+        batches = _redis.tag_batches(self.rope.tag_key_prefix, keys, tags_list)
+        for tag_key, tagged_keys in batches.items():
+            pipeline.srem(tag_key, *tagged_keys)
+        pipeline.execute()
+
+    def invalidate_tag_values(self, tags, batch_size):
+        """Delete the keys in the ``SET`` of the tags and the sets."""
+        prefix = self.rope.tag_key_prefix
+        tag_keys = [_redis.tag_key(prefix, tag) for tag in tags]
+        if not tag_keys:
+            return
+        self._unlink_many(self._pop_members(tag_keys), batch_size)
+
+    def _pop_members(self, set_keys):
+        pipeline = self.backend.pipeline()
+        for set_key in set_keys:
+            pipeline.smembers(set_key)
+        pipeline.unlink(*set_keys)
+        return set().union(*pipeline.execute()[:-1])
+
+    def _unlink_many(self, keys, batch_size):
+        pipeline = self.backend.pipeline(transaction=False)
+        for batch in _redis.chunks(keys, batch_size):
+            pipeline.unlink(*batch)
+        pipeline.execute()
+
+
+class RedisClusterStorage(RedisStorage):
+    """Storage implementation for Redis Cluster clients.
+
+    The bulk operations group the keys by their hash slots and send a command
+    for each slot in a non-transactional pipeline, instead of a single
+    command over keys of different slots.
+
+    :see: `key_hashtag` of :func:`ring.func.base.factory` to keep every key
+        of a function in a slot.
+    """
+
+    def get_many_values(self, keys):
+        batches = _redis.slot_batches(keys)
+        pipeline = self.backend.pipeline(transaction=False)
+        for _, batch_keys in batches:
+            pipeline.mget(batch_keys)
+        values = _redis.merge_batches(batches, pipeline.execute(), len(keys))
+        return [v if v is not None else fbase.NotFound for v in values]
+
+    def set_many_values(self, keys, values, expire):
+        pipeline = self.backend.pipeline(transaction=False)
+        for positions, batch_keys in _redis.slot_batches(keys):
+            pipeline.mset({k: values[p] for p, k in zip(positions, batch_keys)})
+        if expire is not None:
+            for key in keys:
+                pipeline.expire(key, expire)
+        pipeline.execute()
+
+    def delete_many_values(self, keys):
+        pipeline = self.backend.pipeline(transaction=False)
+        for _, batch_keys in _redis.slot_batches(keys):
+            pipeline.delete(*batch_keys)
+        pipeline.execute()
+
+    def _pop_members(self, set_keys):
+        # the sets of different slots can't be in a transaction
+        pipeline = self.backend.pipeline(transaction=False)
+        for set_key in set_keys:
+            pipeline.smembers(set_key)
+        members = set().union(*pipeline.execute())
+        return members.union(set_keys)
+
+    def _unlink_many(self, keys, batch_size):
+        pipeline = self.backend.pipeline(transaction=False)
+        for batch in _redis.chunks(keys, batch_size):
+            for _, batch_keys in _redis.slot_batches(batch):
+                pipeline.unlink(*batch_keys)
+        pipeline.execute()
+
 
 class RedisHashStorage(RedisStorage):
+    # the entries are the fields of a hash, which can't be unlinked
+    tag_values = None
+    untag_values = None
+    invalidate_tag_values = None
+
     def __init__(self, rope, backend):
         storage_backend = backend[0]
         self.hash_key = backend[1]
@@ -389,6 +657,305 @@ class RedisHashStorage(RedisStorage):
     def set_many_values(self, keys, values, expire):
         self.backend.hmset(self.hash_key, {k: v for k, v in zip(keys, values)})
 
+    def scan_delete_values(self, pattern, count):
+        """Delete the fields matching `pattern` by ``HSCAN`` and ``HDEL``."""
+        self._scan_delete_fields(self.hash_key, pattern, count)
+
+    def _scan_delete_fields(self, hash_key, pattern, count):
+        items = self.backend.hscan_iter(hash_key, match=pattern, count=count)
+        for batch in _redis.chunks((field for field, _ in items), count):
+            self.backend.hdel(hash_key, *batch)
+
+
+class RedisBucketedHashStorage(RedisHashStorage):
+    """Storage implementation spreading the fields over bucket hashes.
+
+    A field is stored in the hash ``<hash_key>:<n>`` where ``n`` is the CRC32
+    of the field modulo the number of buckets, so the buckets are bounded and
+    may live on different cluster nodes. Each write refreshes the TTL of its
+    bucket when the expiration is given. The bulk operations send a command
+    for each bucket in a non-transactional pipeline.
+    """
+
+    def __init__(self, rope, backend):
+        self.bucket_keys = _redis.bucket_keys(backend[1], backend[2])
+        super(RedisBucketedHashStorage, self).__init__(rope, backend)
+
+    def _bucket_of(self, key):
+        return _redis.bucket_of(self.bucket_keys, key)
+
+    def get_value(self, key):
+        value = self.backend.hget(self._bucket_of(key), key)
+        if value is None:
+            raise fbase.NotFound
+        return value
+
+    def set_value(self, key, value, expire):
+        bucket = self._bucket_of(key)
+        pipeline = self.backend.pipeline(transaction=False)
+        pipeline.hset(bucket, key, value)
+        if expire is not None:
+            pipeline.expire(bucket, expire)
+        pipeline.execute()
+
+    def delete_value(self, key):
+        self.backend.hdel(self._bucket_of(key), key)
+
+    def has_value(self, key):
+        return bool(self.backend.hexists(self._bucket_of(key), key))
+
+    def touch_value(self, key, expire):
+        if expire is None:
+            raise TypeError("'touch' is requested for persistent cache")
+        self.backend.expire(self._bucket_of(key), expire)
+
+    def get_many_values(self, keys):
+        batches = _redis.bucket_batches(self.bucket_keys, keys)
+        pipeline = self.backend.pipeline(transaction=False)
+        for bucket, (_, batch_keys) in batches.items():
+            pipeline.hmget(bucket, batch_keys)
+        values = _redis.merge_batches(
+            list(batches.values()), pipeline.execute(), len(keys)
+        )
+        return [v if v is not None else fbase.NotFound for v in values]
+
+    def set_many_values(self, keys, values, expire):
+        batches = _redis.bucket_batches(self.bucket_keys, keys)
+        pipeline = self.backend.pipeline(transaction=False)
+        for bucket, (positions, batch_keys) in batches.items():
+            mapping = {k: values[p] for p, k in zip(positions, batch_keys)}
+            pipeline.hset(bucket, mapping=mapping)
+            if expire is not None:
+                pipeline.expire(bucket, expire)
+        pipeline.execute()
+
+    def delete_many_values(self, keys):
+        batches = _redis.bucket_batches(self.bucket_keys, keys)
+        pipeline = self.backend.pipeline(transaction=False)
+        for bucket, (_, batch_keys) in batches.items():
+            pipeline.hdel(bucket, *batch_keys)
+        pipeline.execute()
+
+    def scan_delete_values(self, pattern, count):
+        for bucket in self.bucket_keys:
+            self._scan_delete_fields(bucket, pattern, count)
+
+
+class MmapStorage(fbase.CommonMixinStorage, fbase.StorageMixin, BulkStorageMixin):
+    """Storage implementation for :class:`ring.func.mmap_cache.MmapCache`."""
+
+    #: Return zero-copy :class:`memoryview` of the shared memory for reads.
+    zero_copy = False
+
+    def get_value(self, key):
+        try:
+            if self.zero_copy:
+                return self.backend.view(key)
+            return self.backend.get(key)
+        except KeyError:
+            raise fbase.NotFound
+
+    def set_value(self, key, value, expire):
+        try:
+            self.backend.set(key, value, expire)
+        except ValueError:
+            # larger than a slot; the value is not cached, and the old one
+            # must not be served instead of it
+            self.delete_value(key)
+
+    def delete_value(self, key):
+        try:
+            self.backend.delete(key)
+        except KeyError:
+            pass
+
+    def has_value(self, key):
+        return self.backend.has(key)
+
+    def touch_value(self, key, expire):
+        try:
+            self.backend.touch(key, expire)
+        except KeyError:
+            pass
+
+    def get_many_values(self, keys):
+        values = []
+        for key in keys:
+            try:
+                values.append(self.get_value(key))
+            except fbase.NotFound:
+                values.append(fbase.NotFound)
+        return values
+
+    def set_many_values(self, keys, values, expire):
+        for key, value in zip(keys, values):
+            self.set_value(key, value, expire)
+
+    def delete_many_values(self, keys):
+        for key in keys:
+            self.delete_value(key)
+
+    def has_many_values(self, keys):
+        return [self.backend.has(key) for key in keys]
+
+    def touch_many_values(self, keys, expire):
+        for key in keys:
+            self.touch_value(key, expire)
+
+
+#: The live :mod:`sqlite3` storages to share the locks of their connections.
+_sqlite_storages = weakref.WeakSet()
+_sqlite_storages_lock = threading.Lock()
+
+
+class SqliteStorage(fbase.CommonMixinStorage, fbase.StorageMixin, BulkStorageMixin):
+    """Storage implementation for :mod:`sqlite3`.
+
+    Each entry is a row of `key`, `value` and `expire` columns in the given
+    table. The `expire` column is indexed so that :meth:`sweep` deletes
+    expired rows without a full scan. Every statement is a constant SQL text,
+    so :mod:`sqlite3` reuses its prepared statement cache.
+
+    The statements over a connection are serialized by a lock shared by the
+    live storages of the connection, so a transaction of a thread never
+    includes the statements of the other threads. A failed write is rolled
+    back before the lock is released.
+    """
+
+    now = time.time
+    #: The maximum number of keys in a single bulk read statement.
+    bulk_size = 500
+
+    def __init__(self, ring, backend):
+        connection, table = backend
+        if not re.match(r"^[A-Za-z_][A-Za-z_0-9]*$", table):
+            raise ValueError("'{}' is not a valid table name".format(table))
+        if isinstance(connection, str):
+            connection = self.connect(connection)
+        self.table = table
+        super(SqliteStorage, self).__init__(ring, connection)
+        with _sqlite_storages_lock:
+            self._lock = self._lock_of(connection)
+            _sqlite_storages.add(self)
+
+        self._select_sql = (
+            "SELECT value FROM {} WHERE key = ? AND (expire IS NULL OR expire > ?)"
+        ).format(table)
+        self._select_many_sql = (
+            "SELECT key, value FROM {} WHERE key IN ({{}}) "
+            "AND (expire IS NULL OR expire > ?)"
+        ).format(table)
+        self._insert_sql = (
+            "INSERT OR REPLACE INTO {} (key, value, expire) VALUES (?, ?, ?)"
+        ).format(table)
+        self._delete_sql = "DELETE FROM {} WHERE key = ?".format(table)
+        self._touch_sql = "UPDATE {} SET expire = ? WHERE key = ?".format(table)
+        self._sweep_sql = "DELETE FROM {} WHERE expire <= ?".format(table)
+
+        with self._lock:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS {} "
+                "(key PRIMARY KEY, value BLOB, expire REAL)".format(table)
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS {0}_expire ON {0} (expire)".format(table)
+            )
+            connection.commit()
+
+    @staticmethod
+    def connect(path, timeout=30.0):
+        """Open a WAL mode connection which can be shared by threads."""
+        connection = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    @staticmethod
+    def _lock_of(connection):
+        # the connections can't be weakly referenced, so the lock is kept by
+        # the storages which hold the connection alive
+        for storage in list(_sqlite_storages):
+            if storage.backend is connection:
+                return storage._lock
+        return threading.RLock()
+
+    def _expired_time(self, expire):
+        if expire is None:
+            return None
+        return self.now() + expire
+
+    def _write(self, sql, params, many=False):
+        connection = self.backend
+        with self._lock:
+            try:
+                if many:
+                    cursor = connection.executemany(sql, params)
+                else:
+                    cursor = connection.execute(sql, params)
+                connection.commit()
+            except BaseException:
+                connection.rollback()
+                raise
+        return cursor
+
+    def _fetchone(self, sql, params):
+        with self._lock:
+            return self.backend.execute(sql, params).fetchone()
+
+    def get_value(self, key):
+        row = self._fetchone(self._select_sql, (key, self.now()))
+        if row is None:
+            raise fbase.NotFound
+        return row[0]
+
+    def set_value(self, key, value, expire):
+        self._write(self._insert_sql, (key, value, self._expired_time(expire)))
+
+    def delete_value(self, key):
+        self._write(self._delete_sql, (key,))
+
+    def has_value(self, key):
+        row = self._fetchone(self._select_sql, (key, self.now()))
+        return row is not None
+
+    def touch_value(self, key, expire):
+        self._write(self._touch_sql, (self._expired_time(expire), key))
+
+    def _select_many(self, keys):
+        _now = self.now()
+        found = {}
+        for i in range(0, len(keys), self.bulk_size):
+            chunk = keys[i : i + self.bulk_size]
+            sql = self._select_many_sql.format(",".join("?" * len(chunk)))
+            with self._lock:
+                found.update(self.backend.execute(sql, tuple(chunk) + (_now,)))
+        return found
+
+    def get_many_values(self, keys):
+        found = self._select_many(keys)
+        return [found.get(k, fbase.NotFound) for k in keys]
+
+    def set_many_values(self, keys, values, expire):
+        expired_time = self._expired_time(expire)
+        params = [(k, v, expired_time) for k, v in zip(keys, values)]
+        self._write(self._insert_sql, params, many=True)
+
+    def delete_many_values(self, keys):
+        self._write(self._delete_sql, [(k,) for k in keys], many=True)
+
+    def has_many_values(self, keys):
+        found = self._select_many(keys)
+        return [k in found for k in keys]
+
+    def touch_many_values(self, keys, expire):
+        expired_time = self._expired_time(expire)
+        params = [(expired_time, k) for k in keys]
+        self._write(self._touch_sql, params, many=True)
+
+    def sweep(self):
+        """Delete expired rows and return the number of deleted rows."""
+        return self._write(self._sweep_sql, (self.now(),)).rowcount
+
 
 class DiskCacheStorage(fbase.CommonMixinStorage, fbase.StorageMixin):
     def get_value(self, key):
@@ -412,6 +979,7 @@ def lru(
     user_interface=CacheUserInterface,
     storage_class=LruStorage,
     maxsize=128,
+    instance_local=False,
     **kwargs,
 ):
     """LRU(Least-Recently-Used) cache interface.
@@ -435,28 +1003,108 @@ def lru(
 
     :param ring.func.lru_cache.LruCache lru: Cache storage. If the default
         value :data:`None` is given, a new `LruCache`
-        object will be created. (Recommended)
+        object will be created for each decorated function. (Recommended)
     :param int maxsize: The maximum size of the cache storage.
+    :param bool instance_local: Keep a separated `LruCache` of `maxsize` for
+        each bound object of the decorated method. The cache is keyed only
+        by the other arguments and freed with the object.
+
+            >>> class User(object):
+            ...     @ring.lru(maxsize=16, instance_local=True)
+            ...     def friends(self, limit):
+            ...         ...
 
     :see: :func:`functools.lru_cache` for LRU cache basics.
     :see: :func:`ring.func.sync.CacheUserInterface` for sub-functions.
     """
-    if lru is None:
-        lru = lru_mod.LruCache(maxsize)
+
+    def lru_factory(lru):
+        return fbase.factory(
+            lru,
+            key_prefix=key_prefix,
+            on_manufactured=None,
+            user_interface=user_interface,
+            storage_class=storage_class,
+            miss_value=None,
+            expire_default=expire,
+            coder=coder,
+            instance_local=instance_local,
+            **kwargs,
+        )
+
+    if instance_local:
+        if lru is not None:
+            raise TypeError("'lru' and 'instance_local' are exclusive")
         if key_prefix is None:
             key_prefix = ""
+        return lru_factory(functools.partial(lru_mod.LruCache, maxsize))
 
-    return fbase.factory(
-        lru,
-        key_prefix=key_prefix,
-        on_manufactured=None,
-        user_interface=user_interface,
-        storage_class=storage_class,
-        miss_value=None,
-        expire_default=expire,
-        coder=coder,
-        **kwargs,
-    )
+    if lru is not None:
+        return lru_factory(lru)
+
+    if key_prefix is None:
+        key_prefix = ""
+
+    def _decorator(f):
+        return lru_factory(lru_mod.LruCache(maxsize))(f)
+
+    return _decorator
+
+
+def weak(
+    cache=None,
+    key_prefix=None,
+    coder=None,
+    user_interface=CacheUserInterface,
+    storage_class=WeakValueStorage,
+    window=128,
+    **kwargs,
+):
+    """Weak-value in-memory cache.
+
+    The cache doesn't keep the results alive: a cached result is available
+    while anything else refers it. Only the `window` most recently used
+    results are referenced strongly not to be collected right after they are
+    cached. It fits large results which are also held elsewhere.
+
+        >>> @ring.weak(window=16)
+        >>> def load_document(document_id):
+        ...     ...
+
+    Results which cannot be weakly referenced, like :class:`tuple`,
+    :class:`str` or :data:`None`, are cached only in the window.
+
+    :param ring.func.weak_cache.WeakValueCache cache: Cache storage. If the
+        default value :data:`None` is given, a new `WeakValueCache` object
+        will be created for each decorated function.
+    :param int window: The size of the strong-reference window.
+
+    :see: :func:`ring.func.sync.CacheUserInterface` for sub-functions.
+    """
+
+    def weak_factory(cache):
+        return fbase.factory(
+            cache,
+            key_prefix=key_prefix,
+            on_manufactured=None,
+            user_interface=user_interface,
+            storage_class=storage_class,
+            miss_value=None,
+            expire_default=None,
+            coder=coder,
+            **kwargs,
+        )
+
+    if cache is not None:
+        return weak_factory(cache)
+
+    if key_prefix is None:
+        key_prefix = ""
+
+    def _decorator(f):
+        return weak_factory(weak_mod.WeakValueCache(window))(f)
+
+    return _decorator
 
 
 def dict(
@@ -509,8 +1157,10 @@ def shelve(
     shelf,
     key_prefix=None,
     coder=None,
-    user_interface=CacheUserInterface,
+    user_interface=(CacheUserInterface, BulkInterfaceMixin),
     storage_class=ShelveStorage,
+    flush_count=1,
+    flush_interval=None,
     **kwargs,
 ):
     """Python :mod:`shelve` based cache.
@@ -522,10 +1172,35 @@ def shelve(
         >>> @ring.shelve(shelf, ...)
         ...     ...
 
+    :param Optional[int] flush_count: The number of buffered dirty keys to
+        write and sync the shelf. The default value ``1`` syncs the shelf
+        on every write. Give a larger number or :data:`None` to enable
+        write-behind mode.
+    :param Optional[float] flush_interval: The seconds from the last flush
+        to write and sync the shelf on the next write.
+
+        >>> @ring.shelve(shelf, flush_count=100, flush_interval=1.0)
+        >>> def f(...):
+        ...     ...
+        >>> f.storage.flush()  # explicit flush
+
     :see: :mod:`shelve` for the backend.
-    :see: :func:`ring.func.sync.CacheUserInterface` for sub-functions.
+    :see: :class:`ring.func.sync.ShelveStorage` for write-behind details.
+    :see: :func:`ring.func.sync.CacheUserInterface` for single access
+        sub-functions.
+    :see: :func:`ring.func.sync.BulkInterfaceMixin` for bulk access
+        sub-functions.
     """
     expire = None
+    if (flush_count, flush_interval) != (
+        storage_class.flush_count,
+        storage_class.flush_interval,
+    ):
+        storage_class = type(
+            storage_class.__name__,
+            (storage_class,),
+            {"flush_count": flush_count, "flush_interval": flush_interval},
+        )
     return fbase.factory(
         shelf,
         key_prefix=key_prefix,
@@ -646,6 +1321,14 @@ def redis_py(
         >>> @ring.redis(client, ...)
         ...     ...
 
+        For Redis Cluster, give :class:`ring.func.sync.RedisClusterStorage`
+        to split the bulk operations by hash slots, or `key_hashtag` to keep
+        the keys of a function in a slot.
+
+        >>> client = redis.cluster.RedisCluster()
+        >>> @ring.redis(client, storage_class=RedisClusterStorage, ...)
+        ...     ...
+
     :see: :func:`ring.func.sync.CacheUserInterface` for single access
         sub-functions.
     :see: :func:`ring.func.sync.BulkInterfaceMixin` for bulk access
@@ -676,7 +1359,9 @@ def redis_py_hash(
     key_prefix=None,
     coder=None,
     user_interface=(CacheUserInterface, BulkInterfaceMixin),
-    storage_class=RedisHashStorage,
+    storage_class=None,
+    buckets=None,
+    expire=None,
     **kwargs,
 ):
     """
@@ -694,6 +1379,12 @@ def redis_py_hash(
         >>> @ring.redis_hash(client, ...)
         ...     ...
 
+    :param Optional[int] buckets: Spread the fields over the given number of
+        hashes instead of the single `hash_key`. See
+        :class:`ring.func.sync.RedisBucketedHashStorage`.
+    :param Optional[float] expire: The TTL of each bucket, refreshed by every
+        write to the bucket. It requires `buckets`.
+
     :see: :func:`ring.func.sync.CacheUserInterface` for single access
         sub-functions.
     :see: :func:`ring.func.sync.BulkInterfaceMixin` for bulk access
@@ -705,9 +1396,18 @@ def redis_py_hash(
     .. _Redis HASH commands: https://redis.io/commands#hash
     .. _redis-py: https://pypi.org/project/redis/
     """
-    expire = None
+    if buckets is None:
+        if expire is not None:
+            raise TypeError("'expire' requires 'buckets'")
+        backend = (client, hash_key)
+        if storage_class is None:
+            storage_class = RedisHashStorage
+    else:
+        backend = (client, hash_key, buckets)
+        if storage_class is None:
+            storage_class = RedisBucketedHashStorage
     return fbase.factory(
-        (client, hash_key),
+        backend,
         key_prefix=key_prefix,
         on_manufactured=None,
         user_interface=user_interface,
@@ -754,6 +1454,112 @@ def diskcache(
     )
 
 
+def mmap(
+    cache,
+    key_prefix=None,
+    expire=None,
+    coder=None,
+    user_interface=(CacheUserInterface, BulkInterfaceMixin),
+    storage_class=MmapStorage,
+    zero_copy=False,
+    **kwargs,
+):
+    """Memory-mapped persistent hash table based cache.
+
+    The table is a file shared by every process on the host. The expected
+    types for input and output are :class:`bytes` for `None` coder.
+
+    :param Union[str,ring.func.mmap_cache.MmapCache] cache: Cache storage or
+        a file path to open a new one with the default layout.
+
+        >>> cache = ring.func.mmap_cache.MmapCache('cache.ring', slot_size=4096)
+        >>> @ring.mmap(cache, coder='pickle')
+        >>> def f(...):
+        ...     ...
+
+    :param bool zero_copy: When it is :data:`True`, values are read as
+        :class:`memoryview` slices of the shared memory without copying.
+        The coder must accept :class:`memoryview`; And note that later writes
+        to the same slot change the content of the view. The cache can't be
+        closed while any of the views is alive.
+
+    :note: An entry must fit in a slot with its key. The results larger than
+        `slot_size` of the cache are returned but not cached.
+
+    :see: :class:`ring.func.mmap_cache.MmapCache` for the backend.
+    :see: :func:`ring.func.sync.CacheUserInterface` for single access
+        sub-functions.
+    :see: :func:`ring.func.sync.BulkInterfaceMixin` for bulk access
+        sub-functions.
+    """
+    if isinstance(cache, str):
+        cache = mmap_mod.MmapCache(cache)
+    if zero_copy != storage_class.zero_copy:
+        storage_class = type(
+            storage_class.__name__, (storage_class,), {"zero_copy": zero_copy}
+        )
+
+    return fbase.factory(
+        cache,
+        key_prefix=key_prefix,
+        on_manufactured=None,
+        user_interface=user_interface,
+        storage_class=storage_class,
+        miss_value=None,
+        expire_default=expire,
+        coder=coder,
+        **kwargs,
+    )
+
+
+def sqlite(
+    db,
+    key_prefix=None,
+    expire=None,
+    coder=None,
+    table="ring_cache",
+    user_interface=(CacheUserInterface, BulkInterfaceMixin),
+    storage_class=SqliteStorage,
+    **kwargs,
+):
+    """:mod:`sqlite3` based persistent cache.
+
+    The database file can be shared by multiple processes. When a path is
+    given, the connection is opened in WAL mode so that readers don't block
+    the writer.
+
+    :param Union[str,sqlite3.Connection] db: A database path or a connection.
+        When a connection is given, it must be created with
+        `check_same_thread=False` to be used by :mod:`asyncio` version.
+
+        >>> @ring.sqlite('cache.db', coder='pickle')
+        >>> def f(...):
+        ...     ...
+
+    :param str table: The table name to store the entries. The table and its
+        expiration index are created when they don't exist.
+
+    :see: :class:`ring.func.sync.SqliteStorage` for the table layout.
+    :see: :func:`ring.func.sync.CacheUserInterface` for single access
+        sub-functions.
+    :see: :func:`ring.func.sync.BulkInterfaceMixin` for bulk access
+        sub-functions.
+
+    :see: :func:`ring.func.asyncio.sqlite` for :mod:`asyncio` version.
+    """
+    return fbase.factory(
+        (db, table),
+        key_prefix=key_prefix,
+        on_manufactured=None,
+        user_interface=user_interface,
+        storage_class=storage_class,
+        miss_value=None,
+        expire_default=expire,
+        coder=coder,
+        **kwargs,
+    )
+
+
 def arcus(
     client,
     key_prefix=None,
@@ -0,0 +1,222 @@
+""":mod:`ring.func.tags` --- Tag-based invalidation.
+===================================================
+
+Tag the entries by their arguments, and delete every entry of a tag over the
+functions at once:
+
+    >>> @ring.redis(client)
+    ... def user_posts(user_id):
+    ...     ...
+    >>> @user_posts.ring.tags
+    ... def user_posts_tags(user_id):
+    ...     return ["user:{}".format(user_id)]
+    >>> ring.invalidate_tags(["user:42"])
+
+The tags are compared as :class:`str`, so ``42`` and ``"42"`` are the same
+tag.
+
+The index of tags is stored in the backend for Redis storages as a ``SET``
+for each tag of each function, named ``<key prefix>@tag:<tag>`` after the
+key prefix of the function, so the tags of different functions and
+applications don't collide. Deleting an entry
+removes its key from the sets of its tags, but the sets are not aware of the
+expiration of the entries: The keys of expired entries remain in the sets
+until their tags are invalidated, so a tag which is never invalidated keeps
+growing. Use the tags to be invalidated, not the tags of unbounded values.
+
+In-memory storages keep the index in the storage. The keys are removed from
+the index when the entries are deleted or evicted, and the keys of expired or
+collected entries are pruned as the index grows.
+
+The other storages, including Redis hashes and memcache, don't support tags;
+Registering tags for them raises :exc:`TypeError`.
+
+:func:`invalidate_tags` only covers the functions whose tags are registered in
+the current process. The entries set by the other processes are deleted from
+Redis as long as the same functions are tagged in the invalidating process,
+but the in-memory storages of the other processes are never invalidated.
+"""
+
+import asyncio
+import inspect
+import weakref
+
+from . import base as fbase
+
+__all__ = ("invalidate_tags",)
+
+#: The ropes with registered tags.
+_tagged_ropes = weakref.WeakSet()
+
+
+def register(rope):
+    """Register `rope` as a target of :func:`invalidate_tags`."""
+    _tagged_ropes.add(rope)
+
+
+class TagIndex(object):
+    """The index of tags of an in-memory storage.
+
+    :param storage: The storage of the entries.
+    """
+
+    #: The minimum number of the keys to prune the keys of gone entries.
+    prune_size = 1024
+
+    def __init__(self, storage):
+        self.storage = weakref.proxy(storage)
+        self.keys_of = {}
+        self.tags_of = {}
+        self._prune_at = self.prune_size
+
+    def add_many(self, keys, tags_list):
+        """Attach the tags to the keys to be set."""
+        # the keys are pruned before adding the keys which are not set yet
+        if len(self.tags_of) + len(keys) >= self._prune_at:
+            self.prune()
+        for key, tags in zip(keys, tags_list):
+            tags_of_key = self.tags_of.setdefault(key, set())
+            for tag in tags:
+                tags_of_key.add(tag)
+                self.keys_of.setdefault(tag, set()).add(key)
+
+    def discard(self, key):
+        """Remove the key from the tags of it."""
+        for tag in self.tags_of.pop(key, ()):
+            keys = self.keys_of.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.keys_of[tag]
+
+    def pop(self, tags):
+        """Remove the tags and the keys of them from the index.
+
+        :return: The keys of the tags.
+        """
+        keys = set()
+        for tag in tags:
+            keys.update(self.keys_of.get(tag, ()))
+        for key in keys:
+            self.discard(key)
+        return keys
+
+    def prune(self):
+        """Remove the keys of the expired or collected entries."""
+        for key in list(self.tags_of):
+            try:
+                self.storage.get_value(key)
+            except fbase.NotFound:
+                self.discard(key)
+        self._prune_at = max(2 * len(self.tags_of), self.prune_size)
+
+    def on_evict(self, key):
+        self.discard(key)
+
+
+def _index_of(storage):
+    index = storage.__dict__.get("_tag_index")
+    if index is None:
+        index = storage.__dict__["_tag_index"] = TagIndex(storage)
+        delete_value = storage.delete_value
+
+        def _delete_value(key):
+            index.discard(key)
+            return delete_value(key)
+
+        storage.delete_value = _delete_value
+        delete_many_values = getattr(storage, "delete_many_values", None)
+        if delete_many_values is not None:
+
+            def _delete_many_values(keys):
+                for key in keys:
+                    index.discard(key)
+                return delete_many_values(keys)
+
+            storage.delete_many_values = _delete_many_values
+        if hasattr(storage.backend, "on_evict"):
+            from .base import evict_dispatcher  # circular
+
+            evict_dispatcher(storage.backend).listeners.add(index)
+    return index
+
+
+def check_support(storage_class):
+    """Raise :exc:`TypeError` unless `storage_class` supports tags."""
+    if getattr(storage_class, "tag_values", None) is not None:
+        return
+    if not getattr(storage_class, "in_memory_storage", False):
+        raise TypeError("{} doesn't support tags".format(storage_class.__name__))
+
+
+def tag_keys(storage, keys, tags_list):
+    """Attach the tags to the keys in `storage`.
+
+    :return: An awaitable object for :mod:`asyncio` storages.
+    """
+    tag_values = getattr(storage, "tag_values", None)
+    if tag_values is not None:
+        return tag_values(keys, tags_list)
+    check_support(type(storage))
+    _index_of(storage).add_many(keys, tags_list)
+
+
+def untag_keys(storage, keys, tags_list):
+    """Detach the tags from the deleted keys in `storage`.
+
+    The in-memory index is updated by the deletion itself.
+
+    :return: An awaitable object for :mod:`asyncio` storages.
+    """
+    untag_values = getattr(storage, "untag_values", None)
+    if untag_values is not None:
+        return untag_values(keys, tags_list)
+
+
+def _invalidate_local(storage, tags):
+    index = storage.__dict__.get("_tag_index")
+    if index is None:
+        return
+    for key in index.pop(tags):
+        try:
+            storage.delete_value(key)
+        except KeyError:
+            pass
+
+
+def invalidate_tags(tags, batch_size=1000):
+    """Delete every entry tagged by any of `tags` from the tagged functions.
+
+    Only the functions whose tags are registered in the current process are
+    invalidated.
+
+    The keys are deleted in pipelined batches of `batch_size` for Redis.
+
+    :param Iterable[str] tags: The tags to invalidate.
+    :param int batch_size: The number of keys for each delete command.
+    :return: An awaitable object when any :mod:`asyncio` storage is tagged;
+        Otherwise :data:`None`.
+    """
+    tags = [str(tag) for tag in tags]
+    indexes = set()
+    awaitables = []
+    for rope in list(_tagged_ropes):
+        for storage in list(rope._storages):
+            invalidate = getattr(storage, "invalidate_tag_values", None)
+            if invalidate is None:
+                _invalidate_local(storage, tags)
+                continue
+            # the index in the backend is shared by the storages of the rope
+            index_id = id(storage.backend), rope.tag_key_prefix
+            if index_id in indexes:
+                continue
+            indexes.add(index_id)
+            result = invalidate(tags, batch_size)
+            if inspect.isawaitable(result):
+                awaitables.append(result)
+    if awaitables:
+        return _gather(awaitables)
+
+
+async def _gather(awaitables):
+    await asyncio.gather(*awaitables)
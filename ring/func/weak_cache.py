@@ -0,0 +1,70 @@
+""":mod:`ring.func.weak_cache` --- weak-value cache with a strong window.
+=======================================================================
+
+A cache which doesn't extend the lifetimes of its values. The values are
+referenced weakly, and only a bounded hot set of recently used values is
+referenced strongly not to be collected right after they are cached.
+"""
+
+import weakref
+from threading import RLock
+
+from .lru_cache import LruCache, SENTINEL
+
+__all__ = ("WeakValueCache", "SENTINEL")
+
+
+class WeakValueCache(object):
+    """Weak-value cache with a strong-reference LRU window.
+
+    Every value is held by :class:`weakref.WeakValueDictionary`, so it is
+    available while anything else refers it. The `window` most recently used
+    values are also held by an :class:`ring.func.lru_cache.LruCache`. Values
+    which cannot be weakly referenced, like :class:`tuple` or :class:`str`,
+    are cached only in the window.
+
+    :param int window: The size of the strong-reference window.
+        ``0`` disables it.
+    """
+
+    def __init__(self, window=128):
+        self.values = weakref.WeakValueDictionary()
+        self.window = LruCache(window)
+        self.lock = RLock()
+
+    def get(self, key):
+        with self.lock:
+            value = self.window.get(key)
+            if value is not SENTINEL:
+                return value
+            value = self.values.get(key, SENTINEL)
+            if value is not SENTINEL:
+                # back to the hot set
+                self.window.set(key, value)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            try:
+                self.values[key] = value
+            except TypeError:  # cannot create weak reference
+                self.values.pop(key, None)
+            self.window.set(key, value)
+
+    def delete(self, key):
+        with self.lock:
+            found = self.values.pop(key, SENTINEL) is not SENTINEL
+            if self.window.has(key):
+                self.window.delete(key)
+                found = True
+            if not found:
+                raise KeyError(key)
+
+    def has(self, key):
+        with self.lock:
+            return self.window.has(key) or key in self.values
+
+    def clear(self):
+        with self.lock:
+            self.values.clear()
+            self.window.clear()
@@ -1,10 +1,16 @@
 from __future__ import absolute_import
 
+import hashlib
 import re
 from ._compat import inspect
 from ._util import cached_property
 from .callable import Callable
 
+try:
+    import xxhash
+except ImportError:  # pragma: no cover
+    xxhash = None
+
 
 class Key(object):
     def __init__(self, provider, indirect_marker="*"):
@@ -100,3 +106,86 @@ class CallableKey(Key):
 
     def build(self, labels):
         return self.format.format(**labels)
+
+
+def _blake2b_hexdigest(data, digest_size):
+    return hashlib.blake2b(data, digest_size=digest_size).hexdigest()
+
+
+def _xxhash_hexdigest(data, digest_size):
+    if digest_size <= 8:
+        hexdigest = xxhash.xxh3_64_hexdigest(data)
+    else:
+        hexdigest = xxhash.xxh3_128_hexdigest(data)
+    return hexdigest[: digest_size * 2]
+
+
+class KeyHash(object):
+    """Hash composed keys into short fixed-length keys.
+
+    The hashed key is the hex digest of the utf-8 encoded key. When
+    `readable_prefix` is set, the key prefix is kept as it is and only the
+    argument part of the key is hashed.
+
+    :param str algorithm: ``blake2b``, ``xxhash`` or any other algorithm name
+        of :func:`hashlib.new`. ``xxhash`` requires :mod:`xxhash` package.
+    :param int digest_size: The digest size in bytes. For ``xxhash``, up to
+        16 bytes are supported.
+    :param bool readable_prefix: Keep the key prefix readable.
+    """
+
+    def __init__(self, algorithm="blake2b", digest_size=16, readable_prefix=False):
+        if algorithm == "blake2b":
+            hexdigest = _blake2b_hexdigest
+        elif algorithm == "xxhash":
+            if xxhash is None:
+                raise TypeError("'xxhash' key hash requires xxhash package")
+            hexdigest = _xxhash_hexdigest
+        else:
+            hashlib.new(algorithm)  # raise ValueError for unsupported names
+
+            def hexdigest(data, digest_size):
+                return hashlib.new(algorithm, data).hexdigest()[: digest_size * 2]
+
+        self.algorithm = algorithm
+        self.digest_size = digest_size
+        self.readable_prefix = readable_prefix
+        self._hexdigest = hexdigest
+
+    def __repr__(self):
+        return "<{}.{} algorithm={} digest_size={}>".format(
+            type(self).__module__, type(self).__name__, self.algorithm, self.digest_size
+        )
+
+    def hash(self, key, prefix=None):
+        """Return the hashed key.
+
+        :param str key: The composed key.
+        :param Optional[str] prefix: The readable prefix of the key.
+        """
+        if prefix is not None:
+            body = key[len(prefix) :]
+            return prefix + ":" + self._hexdigest(body.encode("utf-8"), self.digest_size)
+        return self._hexdigest(key.encode("utf-8"), self.digest_size)
+
+    def __call__(self, key):
+        return self.hash(key)
+
+
+def key_hash_of(key_hash):
+    """Return :class:`KeyHash` object for the given `key_hash` parameter.
+
+    :param key_hash: :data:`None`, an algorithm name for :class:`KeyHash`,
+        or a :class:`KeyHash` object.
+    :rtype: Optional[ring.key.KeyHash]
+    """
+    if key_hash is None or isinstance(key_hash, KeyHash):
+        return key_hash
+    if key_hash == "auto":
+        return KeyHash("xxhash" if xxhash is not None else "blake2b")
+    if isinstance(key_hash, str):
+        return KeyHash(key_hash)
+    raise TypeError(
+        "'key_hash' must be one of None, algorithm name or KeyHash. "
+        "Given: {!r}".format(key_hash)
+    )
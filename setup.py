@@ -34,6 +34,14 @@ tests_require = [
     "django",
     "numpy",
 ]
+benchmarks_require = [
+    "pytest-benchmark",
+    "xxhash",
+    "diskcache>=4.1.0",
+    "fakeredis",
+    "pymemcache",
+    "numpy",
+]
 docs_require = [
     "sphinx",
     "django",
@@ -107,6 +115,7 @@ setup(
     extras_require={
         "tests": tests_require,
         "docs": docs_require,
+        "benchmarks": benchmarks_require,
         "dev": dev_require,
     },
     classifiers=[
@@ -2,6 +2,9 @@ import asyncio
 import time
 import sys
 import shelve
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 import aiomcache
@@ -77,9 +80,18 @@ def aioredis_client(request):
     return request.param
 
 
+@pytest.fixture()
+def storage_sqlite():
+    storage = sqlite3.connect(
+        "/tmp/ring-test/sqlitea", check_same_thread=False, isolation_level=None
+    )
+    return storage, ring.sqlite
+
+
 @pytest.fixture(
     params=[
         lazy_fixture("storage_dict"),
+        lazy_fixture("storage_sqlite"),
         lazy_fixture("aiomcache_client"),
         lazy_fixture("redis_asyncio_pool"),
         lazy_fixture("aioredis_connection"),
@@ -260,6 +272,117 @@ async def test_func_dict():
     assert (await f2.get(1, 2)) is None
 
 
+@pytest.mark.asyncio
+async def test_stats(storage_and_ring):
+    storage, storage_ring = storage_and_ring
+
+    @storage_ring(storage, "ring-test-stats", stats=True)
+    async def f(a):
+        return str(a).encode()
+
+    await f.delete(1)
+    assert (await f(1)) == b"1"
+    assert (await f(1)) == b"1"
+
+    stats = f.stats(reset=True)
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["sets"] == 1
+    assert stats["deletes"] == 1
+    assert stats["latency"]["execute"]["count"] == 1
+    assert stats["latency"]["storage"]["count"] == 4
+    assert f.stats()["hits"] == 0
+
+
+@pytest.mark.asyncio
+async def test_hooks(storage_sqlite):
+    storage, storage_ring = storage_sqlite
+    events = []
+
+    @storage_ring(storage, "ring-test-hooks")
+    async def f(a):
+        return a * 100
+
+    f.ring.on_hit(lambda key, value: events.append(("hit", value)))
+    f.ring.on_miss(lambda key: events.append(("miss",)))
+    f.ring.on_set(lambda key, value: events.append(("set", value)))
+    f.ring.on_execute(lambda args, kwargs, result: events.append(("execute", result)))
+
+    await f.delete(1)
+    await f.delete(2)
+    assert (await f(1)) == 100
+    assert (await f(1)) == 100
+    assert (await f.get_many((1,), (2,))) == [100, None]
+    assert events == [
+        ("miss",),
+        ("execute", 100),
+        ("set", 100),
+        ("hit", 100),
+        ("hit", 100),
+        ("miss",),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_offload(storage_sqlite):
+    storage, storage_ring = storage_sqlite
+    pickle_coder = ring.coder.registry.get("pickle")
+    executor = ThreadPoolExecutor(1)
+    threads = []
+
+    class Coder(ring.coder.Coder):
+        def encode(self, value):
+            threads.append(threading.current_thread())
+            return pickle_coder.encode(value)
+
+        def decode(self, data):
+            threads.append(threading.current_thread())
+            return pickle_coder.decode(data)
+
+    @storage_ring(
+        storage,
+        "offload",
+        coder=Coder(),
+        offload_threshold=1000,
+        offload_executor=executor,
+    )
+    async def f(n):
+        return "x" * n
+
+    await f.delete(10)
+    await f.delete(10000)
+
+    assert (await f(10)) == "x" * 10
+    assert (await f.get(10)) == "x" * 10
+    assert threads == [threading.current_thread()] * 2
+
+    del threads[:]
+    assert (await f(10000)) == "x" * 10000
+    assert (await f.get(10000)) == "x" * 10000
+    assert threads[0] is threading.current_thread()  # encode
+    assert threads[1] is not threading.current_thread()  # decode
+
+    del threads[:]
+    assert (await f.get_many((10,), (10000,))) == ["x" * 10, "x" * 10000]
+    assert all(t is not threading.current_thread() for t in threads)
+
+    @storage_ring(
+        storage, "offload", coder=Coder(), offload_threshold=0, offload_executor=executor
+    )
+    async def g(n):
+        return "x" * n
+
+    del threads[:]
+    await g.update(10)
+    await g.set_many(((10,),), ["y"])
+    assert threads
+    assert all(t is not threading.current_thread() for t in threads)
+    assert (await g.get(10)) == "y"
+    assert f._rope.config.offload_threshold == 1000
+
+    executor.shutdown()
+
+
 @pytest.mark.asyncio
 async def test_many(aiomcache_client):
     client, _ = aiomcache_client
@@ -585,3 +708,132 @@ async def test_annotation(field, expected):
     print("actual:", owner.__annotations__)
     print("expected:", expected)
     assert owner.__annotations__ == expected
+
+
+@pytest.mark.asyncio
+async def test_aioredis_cluster_storage():
+    fakeredis = pytest.importorskip("fakeredis")
+    from ring._redis import key_slot
+
+    @ring.aioredis(
+        fakeredis.FakeAsyncRedis(),
+        "cluster",
+        expire=60,
+        storage_class=ring.func.asyncio.Aioredis2ClusterStorage,
+    )
+    async def f(a):
+        return str(a * 10).encode()
+
+    args = [(a,) for a in range(20)]
+    values = [str(a * 10).encode() for a, in args]
+    assert len({key_slot(f.key(*a)) for a in args}) > 1
+    assert await f.update_many(*args) == values
+    assert await f.get_many(*args, (100,)) == values + [None]
+    await f.delete_many(*args[:10])
+    assert await f.get_many(*args) == [None] * 10 + values[10:]
+
+
+@pytest.mark.asyncio
+async def test_aioredis_bucketed_hash():
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeAsyncRedis()
+
+    @ring.aioredis_hash(client, "test-bucket-hash", "field", buckets=4, expire=60)
+    async def f(a):
+        return str(a * 10).encode()
+
+    assert await f(1) == b"10"
+    assert await f.has(1) is True
+
+    args = [(a,) for a in range(40)]
+    values = [str(a * 10).encode() for a, in args]
+    assert await f.update_many(*args) == values
+    assert await f.get_many(*args, (100,)) == values + [None]
+    buckets = ["test-bucket-hash:{}".format(i) for i in range(4)]
+    assert all([0 < await client.hlen(bucket) < 40 for bucket in buckets])
+    assert all([0 < await client.ttl(bucket) <= 60 for bucket in buckets])
+
+    await f.delete_many(*args[:10])
+    assert await f.get_many(*args) == [None] * 10 + values[10:]
+
+
+@pytest.mark.asyncio
+async def test_aioredis_generation():
+    fakeredis = pytest.importorskip("fakeredis")
+    from ring.func.generation import Generation
+
+    client = fakeredis.FakeAsyncRedis()
+
+    @ring.aioredis(client, "agen", generation=Generation(ttl=0, cleanup=True))
+    async def f(a):
+        return str(a).encode()
+
+    assert await f(1) == b"1"
+    await f.update_many((2,), (3,))
+    assert sorted(await client.keys("agen*")) == [b"agen@0:1", b"agen@0:2", b"agen@0:3"]
+
+    await f.clear()
+    assert await f.get(1) is None
+    await f.storage.cleanup_task
+    assert sorted(await client.keys("agen*")) == [b"agen@generation"]
+
+    @ring.dict({}, generation=True)
+    async def g(a):
+        return a
+
+    assert await g(1) == 1
+    await g.clear()
+    assert await g.get(1) is None
+
+
+@pytest.mark.asyncio
+async def test_aioredis_tags():
+    fakeredis = pytest.importorskip("fakeredis")
+    from ring.func.generation import Generation
+
+    client = fakeredis.FakeAsyncRedis()
+
+    @ring.aioredis(client, "atag", generation=Generation(ttl=0))
+    async def f(a, b):
+        return "{}:{}".format(a, b).encode()
+
+    @ring.aioredis(
+        client, "atag-cluster", storage_class=ring.func.asyncio.Aioredis2ClusterStorage
+    )
+    async def g(a):
+        return str(a).encode()
+
+    @ring.dict({})
+    async def local(a):
+        return a
+
+    f.ring.tags(lambda a, b: ["a:{}".format(a)])
+    g.ring.tags(lambda a: ["a:{}".format(a)])
+    local.ring.tags(lambda a: ["a:{}".format(a)])
+
+    await f(1, 1)
+    await f.set(b"x", 1, 2)
+    await f.get_or_update_many((2, 1), (1, 3))
+    await g.update_many((1,), (2,))
+    await g.set_many(((3,),), (b"3",))
+    await local(1)
+    assert await client.smembers("atag@tag:a:1") == {
+        b"atag@0:1:1",
+        b"atag@0:1:2",
+        b"atag@0:1:3",
+    }
+    assert await client.smembers("atag-cluster@tag:a:1") == {b"atag-cluster:1"}
+
+    await ring.invalidate_tags(["a:1", "a:3"])
+    assert await f.get_many((1, 1), (1, 2), (1, 3), (2, 1)) == [None] * 3 + [b"2:1"]
+    assert await g.get_many((1,), (2,), (3,)) == [None, b"2", None]
+    assert await local.get(1) is None
+    assert sorted(await client.keys("*@tag:*")) == [
+        b"atag-cluster@tag:a:2",
+        b"atag@tag:a:2",
+    ]
+
+    await g.delete(2)
+    assert await client.keys("*@tag:*") == [b"atag@tag:a:2"]
+    await f.delete(2, 1)
+    assert await client.keys("*@tag:*") == []
@@ -4,7 +4,10 @@ import ring
 from ring.coder import (
     Registry,
     Coder,
+    CompressionCoder,
     JsonCoder,
+    PipelineCoder,
+    codecs,
     coderize,
     registry as default_registry,
 )
@@ -103,6 +106,71 @@ if sys.version_info >= (3, 7):
         assert decoded_dataclass.name == "name"
         assert decoded_dataclass.my_int == 1
         assert decoded_dataclass.my_dict == {"test": 1}
+        # substitute class is reused
+        assert type(coder.decode(encoded_dataclass)) is type(decoded_dataclass)
+
+    @pytest.mark.parametrize("as_tuple", [False, True])
+    def test_dataclass_coder_registry(as_tuple):
+        from ring.coder import DataclassCoder
+
+        coder = DataclassCoder(as_tuple=as_tuple)
+        assert coder.register(DataClass) is DataClass
+        with pytest.raises(TypeError):
+            coder.register(int)
+
+        dataclass = DataClass("name", 1, {"test": 1})
+        encoded_dataclass = coder.encode(dataclass)
+        if as_tuple:
+            assert (
+                b'["tests._test_module_py37.DataClass", ["name", 1, {"test": 1}]]'
+                == encoded_dataclass
+            )
+        decoded_dataclass = coder.decode(encoded_dataclass)
+        assert type(decoded_dataclass) is DataClass
+        assert decoded_dataclass == dataclass
+
+        # legacy data by name is still decodable
+        legacy = default_registry.get("dataclass").encode(dataclass)
+        assert coder.decode(legacy).my_dict == {"test": 1}
+
+    @pytest.mark.parametrize("as_tuple", [False, True])
+    def test_dataclass_coder_non_init(as_tuple):
+        import dataclasses
+        from ring.coder import DataclassCoder
+
+        coder = DataclassCoder(as_tuple=as_tuple)
+
+        @coder.register
+        @dataclasses.dataclass(frozen=True)
+        class Point:
+            x: int
+            y: int = dataclasses.field(init=False, default=0)
+
+            def __post_init__(self):
+                object.__setattr__(self, "y", self.x * 2)
+
+        point = Point(1)
+        object.__setattr__(point, "y", 5)
+        assert coder.decode(coder.encode(point)) == point
+
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="kw_only")
+    @pytest.mark.parametrize("as_tuple", [False, True])
+    def test_dataclass_coder_kw_only(as_tuple):
+        import dataclasses
+        from ring.coder import DataclassCoder
+
+        coder = DataclassCoder(as_tuple=as_tuple)
+
+        @coder.register
+        @dataclasses.dataclass
+        class Options:
+            name: str
+            _: dataclasses.KW_ONLY
+            limit: int = 10
+            offset: int = 0
+
+        options = Options("a", offset=3)
+        assert coder.decode(coder.encode(options)) == options
 
 
 def test_unexisting_coder():
@@ -129,3 +197,111 @@ def test_coderize(raw_coder):
 def test_invalid_coderize():
     with pytest.raises(TypeError):
         coderize(1)
+
+
+@pytest.mark.parametrize("codec", sorted(codecs.keys()))
+def test_compression_coder(codec):
+    coder = CompressionCoder("json", codec, threshold=100)
+    small = [1, 2]
+    large = list(range(1000))
+
+    encoded_small = coder.encode(small)
+    assert encoded_small == b"\x00" + JsonCoder.encode(small)
+    assert coder.decode(encoded_small) == small
+
+    encoded_large = coder.encode(large)
+    assert encoded_large[:1] != b"\x00"
+    assert len(encoded_large) < len(JsonCoder.encode(large))
+    assert coder.decode(encoded_large) == large
+
+    # decoding is self-describing regardless of the codec
+    assert CompressionCoder("json", "zlib").decode(encoded_large) == large
+
+    registered = default_registry.get(codec)
+    assert registered.decode(registered.encode(b"x" * 2000)) == b"x" * 2000
+
+
+def test_compression_coder_ring():
+    cache = {}
+
+    @ring.dict(cache, coder=CompressionCoder("pickle", "zlib", threshold=10, level=9))
+    def f(n):
+        return "a" * n
+
+    assert f(100) == "a" * 100
+    assert f.get(100) == "a" * 100
+    assert len(cache[f.key(100)]) < 100
+
+    with pytest.raises(TypeError):
+        CompressionCoder("pickle", "unknown")
+    with pytest.raises(ValueError):
+        f.decode(b"\xff")
+
+
+def test_numpy_coder():
+    numpy = pytest.importorskip("numpy")
+
+    coder = default_registry.get("numpy")
+    arrays = [
+        numpy.arange(12).reshape(3, 4),
+        numpy.asfortranarray(numpy.arange(12.0).reshape(3, 4)),
+        numpy.arange(24).reshape(4, 6)[::2, ::3],
+        numpy.array(42),
+        numpy.array(["ab", "c"]),
+        numpy.arange(6, dtype=">i4"),
+        numpy.arange(6, dtype="<c16").reshape(1, 2, 3),
+    ]
+    for array in arrays:
+        encoded = coder.encode(array)
+        decoded = coder.decode(encoded)
+        assert decoded.dtype == array.dtype
+        assert decoded.shape == array.shape
+        assert (decoded == array).all()
+        assert decoded.flags.aligned
+        # zero-copy
+        assert numpy.shares_memory(decoded, numpy.frombuffer(encoded, numpy.uint8))
+
+    with pytest.raises(ValueError):
+        coder.encode(numpy.array([object()]))
+
+
+@pytest.mark.skipif(sys.version_info < (3, 8), reason="pickle protocol 5")
+def test_pickle5_coder():
+    coder = default_registry.get("pickle5")
+
+    data = {"bytearray": bytearray(b"x" * 1000), "list": [1, "a", b"b"]}
+    encoded = coder.encode(data)
+    assert coder.decode(encoded) == data
+    assert coder.decode(memoryview(encoded)) == data
+    assert coder.decode(coder.encode(None)) is None
+
+    try:
+        import numpy
+    except ImportError:
+        return
+    array = numpy.arange(1000)
+    encoded = coder.encode(array)
+    decoded = coder.decode(encoded)
+    assert (decoded == array).all()
+    assert numpy.shares_memory(decoded, numpy.frombuffer(encoded, numpy.uint8))
+
+
+def test_coder_pipeline():
+    coder = default_registry.chain("json", CompressionCoder(threshold=0))
+    assert isinstance(coder, PipelineCoder)
+    encoded = coder.encode({"x": 1})
+    assert encoded[:1] == b"\x01"
+    assert coder.decode(encoded) == {"x": 1}
+
+    cache = {}
+
+    @ring.dict(cache, coder=("pickle", "zlib"))
+    def f(n):
+        return "a" * n
+
+    assert f(2000) == "a" * 2000
+    assert f.get(2000) == "a" * 2000
+    assert len(cache[f.key(2000)]) < 100
+
+    with pytest.raises(TypeError):
+        default_registry.chain("pickle", "messed-up")
@@ -3,6 +3,8 @@ import sys
 
 import pytest
 
+import ring
+
 try:
     import numpy
 except ImportError:
@@ -13,7 +15,7 @@ except ImportError:
 
     numpy = None
 
-from ring.func.base import coerce
+from ring.func.base import CoercerRegistry, coerce, coercer_registry
 
 
 class User(object):
@@ -78,3 +80,194 @@ if sys.version_info >= (3, 7):
 def test_coerce(value, result):
     in_memory_storage = type(value).__hash__ != object.__hash__
     assert coerce(value, in_memory_storage) == result
+
+
+digest_parameters = [
+    [1, 2, 3, 4],
+    ["1", "2", "3", "4"],
+    ("1", "2", "3", "4"),
+    {1, 2, 3, 4},
+    {"a": [1, 2], "b": {"c": 3}},
+    [ring_key_instance, (1, "1")],
+]
+if numpy is not None:
+    digest_parameters.extend(
+        [
+            numpy.arange(10000),
+            numpy.arange(12).reshape(3, 4).T,
+            numpy.array([[1, "a"], [None, 2.0]], dtype=object),
+        ]
+    )
+
+
+@pytest.mark.parametrize("value", digest_parameters)
+def test_coerce_digest(value):
+    digest = coerce(value, False, digest=True)
+    assert digest.startswith(type(value).__name__ + ":")
+    assert len(digest) == len(type(value).__name__) + 33
+    assert digest == coerce(value, False, digest=True)
+    assert digest != coerce(value, False)
+
+
+def test_coerce_digest_collision():
+    def digest(value):
+        return coerce(value, False, digest=True)
+
+    assert digest([1, 2]) != digest(["1", "2"])
+    assert digest([1, 2]) != digest((1, 2))
+    assert digest(["a,b"]) != digest(["a", "b"])
+    assert digest({1: 2}) != digest({2: 1})
+    assert digest({1, 2}) == digest({2, 1})
+    assert digest({"a": 1, "b": 2}) == digest({"b": 2, "a": 1})
+    assert digest([User(1)]) != digest(["User1"])
+
+    if numpy is not None:
+        large = numpy.zeros(10000)
+        other = large.copy()
+        other[5000] = 1
+        assert "..." in str(large) and str(large) == str(other)
+        assert digest(large) != digest(other)
+        assert digest(numpy.zeros(4)) != digest(numpy.zeros(4, dtype="int64"))
+        assert digest(numpy.zeros(4)) != digest(numpy.zeros((2, 2)))
+        transposed = numpy.arange(6).reshape(2, 3).T
+        assert digest(transposed) == digest(numpy.ascontiguousarray(transposed))
+
+
+def test_coerce_digest_factory():
+    @ring.dict({}, coerce_digest=True)
+    def f(a, b):
+        return len(a) + b
+
+    assert f([1, 2, 3], 1) == 4
+    assert f.get([1, 2, 3], 1) == 4
+    assert f.get([1, 2, 4], 1) is None
+    digest = coerce([1, 2, 3], False, digest=True)
+    assert f.key([1, 2, 3], 1).endswith(":{}:1".format(digest))
+
+
+def test_coercer_registry():
+    registry = CoercerRegistry()
+
+    class Point(object):
+        def __init__(self, x, y):
+            self.x = x
+            self.y = y
+
+    class Point3D(Point):
+        pass
+
+    with pytest.raises(TypeError):
+        registry.dispatch(Point, False)(Point(1, 2))
+
+    @registry.register(Point)
+    def coerce_point(v):
+        return "{},{}".format(v.x, v.y)
+
+    assert registry.dispatch(Point, False)(Point(1, 2)) == "1,2"
+    assert registry.dispatch(Point3D, True)(Point3D(1, 2)) == "1,2"
+
+    registry.register(Point3D, lambda v: "3d")
+    assert registry.dispatch(Point, False)(Point(1, 2)) == "1,2"
+    assert registry.dispatch(Point3D, False)(Point3D(1, 2)) == "3d"
+
+    # registered coercers precede the built-in rules
+    registry.register(list, len)
+    assert registry.dispatch(list, False)([1, 2, 3]) == 3
+    assert registry.dispatch(list, False, digest=True)([1, 2, 3]) == 3
+    assert coerce([1, 2, 3], False) == "[1,2,3]"
+
+    # virtual subclasses
+    class Sized(abc.ABC):
+        pass
+
+    Sized.register(tuple)
+    registry.register(Sized, lambda v: "sized")
+    assert registry.dispatch(tuple, False)((1,)) == "sized"
+
+
+def test_default_coercer_registry():
+    class Meter(object):
+        def __init__(self, value):
+            self.value = value
+
+    coercer_registry.register(Meter, lambda v: "{}m".format(v.value))
+
+    @ring.dict({})
+    def f(distance):
+        return distance.value
+
+    assert f(Meter(3)) == 3
+    assert f.key(Meter(3)).endswith(":3m")
+
+
+def test_frozen_ring_key_memo():
+    dataclasses = pytest.importorskip("dataclasses")
+    calls = []
+
+    @dataclasses.dataclass(frozen=True)
+    class Frozen:
+        name: str
+
+        def __ring_key__(self):
+            calls.append(self)
+            return self.name
+
+    @dataclasses.dataclass
+    class Mutable:
+        name: str
+
+        def __ring_key__(self):
+            calls.append(self)
+            return self.name
+
+    frozen = Frozen("a")
+    assert coerce(frozen, False) == coerce(frozen, True) == "a"
+    assert len(calls) == 1
+    assert frozen == Frozen("a")
+    assert vars(frozen) == {"name": "a"}
+
+    mutable = Mutable("a")
+    assert coerce(mutable, False) == "a"
+    mutable.name = "b"
+    assert coerce(mutable, False) == "b"
+    assert len(calls) == 3
+
+    @dataclasses.dataclass(frozen=True)
+    class FrozenList:
+        names: list
+
+        def __ring_key__(self):
+            calls.append(self)
+            return ",".join(self.names)
+
+    frozen_list = FrozenList(["a"])
+    assert coerce(frozen_list, False) == "a"
+    frozen_list.names.append("b")
+    assert coerce(frozen_list, False) == "a,b"
+    assert len(calls) == 5
+    assert FrozenList in ring.func.base._unmemoizable_types
+
+    @dataclasses.dataclass(frozen=True)
+    class Slotted:
+        __slots__ = ("name", "__weakref__")
+        name: str
+
+        def __ring_key__(self):
+            calls.append(self)
+            return self.name
+
+    @dataclasses.dataclass(frozen=True)
+    class SlottedWithoutWeakref:
+        __slots__ = ("name",)
+        name: str
+
+        def __ring_key__(self):
+            calls.append(self)
+            return self.name
+
+    slotted = Slotted("a")
+    assert coerce(slotted, False) == coerce(slotted, False) == "a"
+    assert len(calls) == 6
+    slotted = SlottedWithoutWeakref("a")
+    assert coerce(slotted, False) == coerce(slotted, False) == "a"
+    assert len(calls) == 8
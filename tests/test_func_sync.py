@@ -1,13 +1,18 @@
+import gc
 import sys
 import time
+import weakref
 import shelve
+import sqlite3
 import ring
 import pymemcache.client
 import memcache
 import redis
 import diskcache
 from ring.func.lru_cache import LruCache
+from ring.func.mmap_cache import MmapCache
 
+import attr
 import pytest
 from pytest_lazyfixture import lazy_fixture
 
@@ -102,6 +107,38 @@ def storage_lru():
     return storage
 
 
+@pytest.fixture(scope="session")
+def storage_mmap(request):
+    storage = MmapCache("/tmp/ring-test/mmap{}".format(sys.version_info[0]))
+    storage.ring = ring.mmap
+    storage.is_binary = True
+    storage.has_has = True
+    storage.has_touch = True
+    storage.has_expire = True
+    request.addfinalizer(storage.close)
+    return storage
+
+
+class StorageConnection(sqlite3.Connection):
+    pass
+
+
+@pytest.fixture(scope="session")
+def storage_sqlite(request):
+    storage = sqlite3.connect(
+        "/tmp/ring-test/sqlite{}".format(sys.version_info[0]),
+        factory=StorageConnection,
+        check_same_thread=False,
+    )
+    storage.ring = ring.sqlite
+    storage.is_binary = False
+    storage.has_has = True
+    storage.has_touch = True
+    storage.has_expire = True
+    request.addfinalizer(storage.close)
+    return storage
+
+
 @pytest.fixture(scope="session", params=[diskcache.Cache("/tmp/ring-test/diskcache")])
 def storage_diskcache(request):
     client = request.param
@@ -176,6 +213,8 @@ def redis_client(request):
         lazy_fixture("memcache_client"),
         lazy_fixture("redis_client"),
         lazy_fixture("storage_diskcache"),
+        lazy_fixture("storage_mmap"),
+        lazy_fixture("storage_sqlite"),
     ]
 )
 def storage(request):
@@ -379,6 +418,139 @@ def test_lru(storage_lru):
     assert None is f.get(1, 2)
 
 
+def test_stats(tmpdir):
+    @ring.sqlite(str(tmpdir.join("cache.db")), coder="pickle", stats=True)
+    def f(a):
+        if a < 0:
+            raise ValueError(a)
+        return a * 100
+
+    assert f(1) == 100
+    assert f(1) == 100
+    assert f.get(2) is None
+    f.set_many(((3,),), [300])
+    assert f.get_many((1,), (3,), (4,)) == [100, 300, None]
+    f.delete(1)
+    with pytest.raises(ValueError):
+        f(-1)
+
+    stats = f.stats()
+    assert stats["hits"] == 3
+    assert stats["misses"] == 4
+    assert stats["sets"] == 2
+    assert stats["deletes"] == 1
+    assert stats["errors"] == 1
+    small, large = len(f.encode(100)), len(f.encode(300))
+    assert stats["bytes_in"] == small * 2 + large
+    assert stats["bytes_out"] == small + large
+    latency = stats["latency"]
+    assert latency["execute"]["count"] == 2
+    assert latency["key"]["count"] == 9
+    assert latency["coder"]["count"] == 5
+    assert latency["storage"]["count"] == 8
+    assert sum(latency["storage"]["buckets"].values()) == 8
+
+    f.stats(reset=True)
+    assert f.stats()["hits"] == 0
+    assert f.stats()["latency"]["key"]["count"] == 0
+    assert f(1) == 100
+    assert f.stats()["misses"] == 1
+
+    # the bulk executions are recorded for each item
+    f.stats(reset=True)
+    assert f.get_or_update_many((1,), (5,), (6,)) == [100, 500, 600]
+    assert f.update_many((7,)) == [700]
+    assert f.stats()["latency"]["execute"]["count"] == 3
+
+    @ring.lru()
+    def g(a):
+        return a
+
+    assert g(1) == 1
+    assert g.stats() is None
+
+
+def test_hooks(tmpdir):
+    events = []
+
+    @ring.lru(maxsize=2)
+    def f(a):
+        return a * 100
+
+    @f.ring.on_hit
+    def on_hit(key, value):
+        events.append(("hit", key, value))
+
+    @f.ring.on_execute
+    def on_execute(args, kwargs, result):
+        events.append(("execute", args, result))
+
+    f.ring.on_miss(lambda key: events.append(("miss", key)))
+    f.ring.on_set(lambda key, value: events.append(("set", key, value)))
+    f.ring.on_evict(lambda key: events.append(("evict", key)))
+
+    assert f(1) == 100
+    assert f(1) == 100
+    assert events == [
+        ("miss", f.key(1)),
+        ("execute", (1,), 100),
+        ("set", f.key(1), 100),
+        ("hit", f.key(1), 100),
+    ]
+
+    del events[:]
+    f(2)
+    f(3)
+    assert events[-1] == ("evict", f.key(1))
+
+    # the events of a shared backend are routed to the owners of the keys
+    cache = LruCache(1)
+    evicted = []
+
+    @ring.lru(cache)
+    def shared_f(a):
+        return a
+
+    @ring.lru(cache)
+    def shared_fg(a):
+        return a
+
+    shared_f.ring.on_evict(lambda key: evicted.append(("f", key)))
+    shared_fg.ring.on_evict(lambda key: evicted.append(("fg", key)))
+
+    shared_f(1)
+    shared_fg(2)
+    shared_f(3)
+    assert evicted == [("f", shared_f.key(1)), ("fg", shared_fg.key(2))]
+
+    @ring.sqlite(str(tmpdir.join("cache.db")))
+    def g(a):
+        return a * 100
+
+    g.ring.on_hit(on_hit)
+    g.ring.on_miss(lambda key: events.append(("miss", key)))
+    g.ring.on_set(lambda key, value: events.append(("set", key, value)))
+
+    del events[:]
+    g.set_many(((2,),), [200])
+    assert g.get_many((2,), (4,)) == [200, None]
+    assert events == [
+        ("set", g.key(2), 200),
+        ("hit", g.key(2), 200),
+        ("miss", g.key(4)),
+    ]
+
+    # the bulk executions fire the hooks of each item
+    g.ring.on_execute(on_execute)
+    del events[:]
+    assert g.get_or_update_many((2,), (5,)) == [200, 500]
+    assert g.update_many({"a": 6}) == [600]
+    assert [e for e in events if e[0] == "execute"] == [
+        ("execute", (5,), 500),
+        ("execute", (), 600),
+    ]
+
+
 def test_diskcache(storage_diskcache):
     base = [0]
 
@@ -402,6 +574,85 @@ def test_diskcache(storage_diskcache):
         f.touch(0, 0)
 
 
+def test_sqlite(tmpdir):
+    @ring.sqlite(str(tmpdir.join("cache.db")), table="ring_test", expire=10)
+    def f(a, b):
+        return a * 100 + b
+
+    connection = f.storage.backend
+    assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    assert f(1, 2) == 102
+    assert f.get(1, 2) == 102
+    assert f.get_many((1, 2), (3, 4)) == [102, None]
+    f.set_many(((3, 4), (5, 6)), (1, 2))
+    assert f.get_many((1, 2), (3, 4), (5, 6)) == [102, 1, 2]
+    assert f.storage.has_many([f.key(1, 2), f.key(7, 8)]) == [True, False]
+    f.touch_many((1, 2), (3, 4))
+    f.delete_many((1, 2), (3, 4))
+    assert f.get_many((1, 2), (3, 4)) == [None, None]
+
+    f.storage.bulk_size = 2
+    keys = [(i, i) for i in range(5)]
+    f.update_many(*keys)
+    assert f.get_many(*keys) == [i * 101 for i in range(5)]
+
+    assert f.storage.sweep() == 0
+    f.storage.now = lambda: time.time() + 100  # expirable duration
+    assert f.get(5, 6) is None
+    assert f.has(5, 6) is False
+    assert f.storage.sweep() == 6
+
+    with pytest.raises(ValueError):
+
+        @ring.sqlite(connection, table="bad table")
+        def g():
+            pass
+
+        g()
+
+
+def test_sqlite_threads(tmpdir):
+    import concurrent.futures
+
+    @ring.sqlite(str(tmpdir.join("cache.db")), coder="pickle")
+    def f(a):
+        return a
+
+    @ring.sqlite(f.storage.backend, table="ring_other", coder="pickle")
+    def g(a):
+        return a
+
+    assert g.storage._lock is f.storage._lock
+
+    def work(n):
+        args = [(n * 100 + i,) for i in range(50)]
+        f.set_many(args, [a for a, in args])
+        g.update_many(*args)
+        return f.get_many(*args) == g.get_many(*args) == [a for a, in args]
+
+    with concurrent.futures.ThreadPoolExecutor(8) as executor:
+        assert all(executor.map(work, range(16)))
+
+    @ring.sqlite(str(tmpdir.join("other.db")))
+    def h(a):
+        return a
+
+    assert h.storage._lock is not f.storage._lock
+
+
+def test_sqlite_rollback(tmpdir):
+    @ring.sqlite(str(tmpdir.join("cache.db")), coder="pickle")
+    def f(a):
+        return a
+
+    with pytest.raises(sqlite3.Error):
+        f.storage.set_many_values([f.key(1), f.key(2)], [b"1", object()], None)
+    assert not f.storage.backend.in_transaction
+    assert f.get_many((1,), (2,)) == [None, None]
+    assert f(1) == 1
+
+
 def test_common_value(storage):
     options = {"expire": 10}
     if not storage.has_expire:
@@ -457,3 +708,292 @@ def test_execute_many(redis_client):
 
     with pytest.raises(TypeError):
         f.execute_many([1])
+
+
+def test_shelve_write_behind():
+    shelf = shelve.open("/tmp/ring-test/shelve-write-behind")
+    synced = []
+    sync = shelf.sync
+
+    def counting_sync():
+        synced.append(True)
+        sync()
+
+    shelf.sync = counting_sync
+
+    @ring.shelve(shelf, flush_count=3)
+    def f(a):
+        return a * 100
+
+    f.storage.flush()
+    f.delete_many((1,), (2,), (3,), (6,))
+    del synced[:]
+
+    assert f(1) == 100
+    assert f.key(1) not in shelf  # buffered
+    assert f.get(1) == 100
+    assert f.has(1) is True
+    assert not synced
+
+    f.set_many(((2,), (3,)), (200, 300))
+    assert len(synced) == 1  # flushed by count
+    assert shelf[f.key(2)] == 200
+    assert f.get_many((1,), (2,), (3,), (4,)) == [100, 200, 300, None]
+
+    f.delete(1)
+    assert f.get(1) is None
+    assert f.key(1) in shelf  # deletion is buffered too
+    f.storage.flush()
+    assert f.key(1) not in shelf
+    assert len(synced) == 2
+
+    f.storage.flush_interval = 0
+    f.update(5)
+    assert shelf[f.key(5)] == 500  # flushed by interval
+
+    f.storage.flush_interval = 10
+    f.set(600, 6)
+    assert f.key(6) not in shelf
+    f.storage.now = lambda: time.time() + 100
+    assert f.get(1) is None
+    assert shelf[f.key(6)] == 600  # flushed by interval on read
+
+    shelf.close()
+
+
+def test_shared_ring():
+    cache = ring.lru()
+    storage = {}
+
+    @cache
+    def f(a):
+        return a
+
+    @cache
+    def g(a):
+        return a * 2
+
+    @ring.dict(storage)
+    def h(a):
+        return a * 3
+
+    shared = ring.dict(storage)
+
+    @shared
+    def i(a):
+        return a * 4
+
+    @shared
+    def j(a):
+        return a * 5
+
+    assert f.storage.backend is not g.storage.backend
+    assert h._rope.config is i._rope.config is j._rope.config
+    with pytest.raises(attr.exceptions.FrozenInstanceError):
+        h._rope.config.expire_default = 5
+    assert j(1) == 5
+    assert type(f) is type(h)
+
+    # hooks are not shared
+    events = []
+    f.ring.on_execute(lambda args, kwargs, result: events.append(result))
+    assert f(1) == 1
+    assert g(1) == 2
+    assert h(1) == 3
+    assert events == [1]
+
+
+def test_wire_slots():
+    class A(object):
+        def __ring_key__(self):
+            return "a"
+
+        @ring.dict({}, wire_slots=("extra",))
+        def f(self, a):
+            return a
+
+        @ring.dict({}, wire_slots=False)
+        def g(self, a):
+            return a
+
+    a = A()
+    assert not hasattr(a.f, "__dict__")
+    assert a.f(1) == 1
+    assert a.f.get is a.f.get
+    a.f.extra = 10
+    assert a.f.extra == 10
+    with pytest.raises(AttributeError):
+        a.f.not_a_slot = 10
+
+    assert hasattr(a.g, "__dict__")
+    assert a.g(1) == 1
+    a.g.not_a_slot = 10
+
+
+def test_instance_local():
+    class User(object):
+        def __init__(self, user_id):
+            self.user_id = user_id
+            self.calls = 0
+
+        @ring.lru(maxsize=2, instance_local=True)
+        def friends(self, limit):
+            self.calls += 1
+            return [self.user_id] * limit
+
+    events = []
+    User.__dict__["friends"].ring.on_hit(lambda key, value: events.append(key))
+
+    u1 = User(1)
+    u2 = User(2)
+    assert u1.friends(2) == [1, 1]
+    assert u1.friends(2) == [1, 1]
+    assert u2.friends(2) == [2, 2]
+    assert (u1.calls, u2.calls) == (1, 1)
+    assert u1.friends.key(2) == u2.friends.key(2) == ":2"
+    assert u1.friends.storage is not u2.friends.storage
+    assert events == [":2"]
+
+    # User doesn't have __ring_key__ but the object is not a part of the key
+    u1.friends.delete(2)
+    assert u1.friends.get(2) is None
+    assert u2.friends.get(2) == [2, 2]
+
+    storage = weakref.ref(u1.friends.storage)
+    del u1
+    gc.collect()
+    assert storage() is None
+
+    with pytest.raises(TypeError):
+
+        @ring.lru(LruCache(2), instance_local=True)
+        def f(a):
+            pass
+
+    with pytest.raises(TypeError):
+
+        @ring.dict({}, instance_local=True)
+        def g(a):
+            pass
+
+    @ring.dict(dict, instance_local=True)
+    def h(a):
+        return a
+
+    assert h(1) == 1
+
+
+def test_generation():
+    from ring.func.generation import Generation
+
+    calls = []
+
+    @ring.dict({}, generation=Generation(ttl=60))
+    def f(a):
+        calls.append(a)
+        return a * 10
+
+    assert f(1) == 10
+    assert f(1) == 10
+    assert calls == [1]
+    assert f.storage.generation() == 0
+
+    f.clear()
+    assert f.storage.generation() == 1
+    assert f.get(1) is None
+    assert f(1) == 10
+    assert calls == [1, 1]
+
+    # another process sees the new generation after the ttl
+    @ring.dict(f.storage.backend, key_prefix=f.storage.key_prefix, generation=True)
+    def g(a):
+        return a
+
+    assert g.storage.generation() == 1
+    g.clear()
+    assert f.storage.generation() == 1
+    f.storage._expires_at = 0
+    assert f.storage.generation() == 2
+
+    with pytest.raises(TypeError):
+        ring.dict({})(lambda a: a).clear()
+    with pytest.raises(TypeError):
+        ring.dict({}, generation=Generation(cleanup=True))(lambda a: a).clear()
+    with pytest.raises(TypeError):
+        ring.dict({}, generation=1)(lambda a: a)
+
+
+def test_tags():
+    @ring.lru()
+    def user(user_id):
+        return {"id": user_id}
+
+    @ring.dict({})
+    def posts(user_id, page):
+        return [user_id, page]
+
+    @user.ring.tags
+    def user_tags(user_id):
+        return ["user:{}".format(user_id)]
+
+    @posts.ring.tags
+    def posts_tags(user_id, page):
+        return ["user:{}".format(user_id), "page:{}".format(page)]
+
+    user(1)
+    user(2)
+    posts(1, 1)
+    posts.update(1, 2)
+    posts(2, 1)
+    posts.set([1, 3], 1, 3)
+
+    ring.invalidate_tags(["user:1"])
+    assert user.get(1) is None
+    assert user.get(2) == {"id": 2}
+    assert [posts.get(1, p) for p in (1, 2, 3)] == [None, None, None]
+    assert posts.get(2, 1) == [2, 1]
+
+    ring.invalidate_tags(["page:1"])
+    assert posts.get(2, 1) is None
+    assert user.get(2) == {"id": 2}
+
+    # the index follows the evictions, deletions and invalidations
+    @ring.lru(maxsize=2)
+    def bounded(a):
+        return a
+
+    bounded.ring.tags(lambda a: ["t%d" % a, "all", a])
+    for a in range(1000):
+        bounded(a)
+    index = bounded.storage._tag_index
+    assert set(index.tags_of) == {bounded.key(998), bounded.key(999)}
+    assert len(index.keys_of) == 5
+    bounded.delete(999)
+    assert set(index.tags_of) == {bounded.key(998)}
+    ring.invalidate_tags([998])
+    assert bounded.get(998) is None
+    assert index.tags_of == index.keys_of == {}
+
+    @ring.dict({}, expire=1)
+    def expiring(a):
+        return a
+
+    expiring.ring.tags(lambda a: ["all"])
+    index = None
+    for a in range(3000):
+        if a == 1500:
+            expiring.storage.now = lambda: time.time() + 10
+        expiring(a)
+        index = index or expiring.storage._tag_index
+    assert len(index.tags_of) < 2048
+    assert index.tags_of.keys() >= {expiring.key(a) for a in range(1500, 3000)}
+
+    from pymemcache.test.utils import MockMemcacheClient
+
+    @ring.memcache(MockMemcacheClient())
+    def untaggable(a):
+        return a
+
+    with pytest.raises(TypeError):
+        untaggable.ring.tags(lambda a: ["a"])
+    assert untaggable.update(1) == 1
@@ -0,0 +1,26 @@
+import subprocess
+import sys
+
+import pytest
+
+import ring
+
+
+def test_import_lazy():
+    code = (
+        "import sys, ring; "
+        "assert not {'ring.func', 'ring.django', 'numpy', 'asyncio'} & set(sys.modules)"
+    )
+    subprocess.check_call([sys.executable, "-c", code])
+
+
+def test_lazy_attributes():
+    import ring.func.asyncio
+
+    assert ring.lru is ring.func.lru
+    assert ring.aioredis is ring.func.asyncio.aioredis
+    assert "lru" in dir(ring)
+    assert ring.coder.registry is not None
+
+    with pytest.raises(AttributeError):
+        ring.not_existing
@@ -1,6 +1,6 @@
 import six
 import ring
-from ring.key import FormatKey, CallableKey
+from ring.key import FormatKey, CallableKey, KeyHash, key_hash_of
 
 import pytest
 from pytest_lazyfixture import lazy_fixture
@@ -146,3 +146,50 @@ def test_hash_key():
     assert a.f.key()
     assert a != b
     assert a.f.key() == b.f.key()
+
+
+@pytest.mark.parametrize(
+    "key_hash, length",
+    [
+        ("blake2b", 32),
+        ("sha256", 32),
+        ("auto", 32),
+        (KeyHash("blake2b", digest_size=8), 16),
+    ],
+)
+def test_key_hash(key_hash, length):
+    @ring.dict({}, key_hash=key_hash)
+    def f(a, b):
+        return a + str(b)
+
+    key = f.key("x" * 1000, 1)
+    assert len(key) == length
+    assert key != f.key("x" * 1000, 2)
+    assert f("x" * 1000, 1) == "x" * 1000 + "1"
+    assert f.get("x" * 1000, 1) == "x" * 1000 + "1"
+
+
+def test_key_hash_readable_prefix():
+    @ring.dict({}, key_prefix="f", key_hash=KeyHash(readable_prefix=True))
+    def f(a):
+        return a
+
+    key = f.key("x" * 1000)
+    assert key.startswith("f:")
+    assert len(key) == len("f:") + 32
+
+
+def test_key_hash_xxhash():
+    pytest.importorskip("xxhash")
+
+    key_hash = KeyHash("xxhash", digest_size=8)
+    assert len(key_hash.hash("key")) == 16
+    assert key_hash.hash("key") != key_hash.hash("kez")
+    assert len(KeyHash("xxhash").hash("key")) == 32
+
+
+def test_key_hash_error():
+    with pytest.raises(TypeError):
+        key_hash_of(object())
+    with pytest.raises(ValueError):
+        KeyHash("unknown")
@@ -0,0 +1,144 @@
+import os
+import time
+
+import pytest
+
+import ring
+from ring.func.mmap_cache import MmapCache
+
+
+@pytest.fixture
+def cache_path(tmpdir):
+    return str(tmpdir.join("mmap-cache"))
+
+
+def test_mmap_cache_basic(cache_path):
+    cache = MmapCache(cache_path, slot_count=8, slot_size=64)
+
+    with pytest.raises(KeyError):
+        cache.get("a")
+    assert "a" not in cache
+
+    cache.set("a", b"value-a")
+    cache[b"b"] = b"value-b"
+    assert cache.get("a") == b"value-a"
+    assert cache["b"] == b"value-b"
+    assert bytes(cache.view("a")) == b"value-a"
+    assert len(cache) == 2
+
+    cache.set("a", b"new")
+    assert cache.get("a") == b"new"
+    assert len(cache) == 2
+
+    del cache["a"]
+    assert not cache.has("a")
+    with pytest.raises(KeyError):
+        cache.delete("a")
+
+    with pytest.raises(ValueError):
+        cache.set("big", b"x" * 64)
+
+    cache.clear()
+    assert len(cache) == 0
+    cache.close()
+
+
+def test_mmap_cache_expire(cache_path):
+    cache = MmapCache(cache_path, slot_count=8, slot_size=64)
+    cache.set("a", b"1", expire=10)
+    cache.set("b", b"2")
+    assert cache.get("a") == b"1"
+
+    cache.now = lambda: time.time() + 100
+    assert "a" not in cache
+    assert cache.get("b") == b"2"
+
+    cache.touch("b", 10)
+    cache.now = lambda: time.time() + 200
+    assert "b" not in cache
+    cache.close()
+
+
+def test_mmap_cache_shared(cache_path):
+    writer = MmapCache(cache_path, slot_count=8, slot_size=64)
+    reader = MmapCache(cache_path)  # layout is loaded from the file
+    assert (reader.slot_count, reader.slot_size) == (8, 64)
+
+    writer.set("a", b"shared")
+    assert reader.get("a") == b"shared"
+    reader.close()
+    writer.close()
+
+    with open(cache_path + "-invalid", "wb") as f:
+        f.write(os.urandom(128))
+    with pytest.raises(ValueError):
+        MmapCache(cache_path + "-invalid")
+
+
+def test_mmap_cache_eviction_and_compact(cache_path):
+    cache = MmapCache(cache_path, slot_count=4, slot_size=64, max_probe=4)
+    for i in range(10):
+        cache.set(str(i), str(i).encode())
+    assert len(cache) == 4
+    assert cache.get("9") == b"9"
+
+    keys = [str(i) for i in range(10) if str(i) in cache]
+    for key in keys[:2]:
+        cache.delete(key)
+    cache.compact()
+    assert len(cache) == 2
+    for key in keys[2:]:
+        assert cache.get(key) == key.encode()
+    cache.close()
+
+
+def test_mmap_factory(cache_path):
+    @ring.mmap(cache_path, coder="pickle")
+    def f(a):
+        return {"a": a}
+
+    assert f(1) == {"a": 1}
+    assert f.get(1) == {"a": 1}
+    assert f.get_many((1,), (2,)) == [{"a": 1}, None]
+    f.set_many(((2,), (3,)), ({"a": 20}, {"a": 30}))
+    assert f.get_many((2,), (3,)) == [{"a": 20}, {"a": 30}]
+    f.delete_many((2,), (3,))
+    assert f.get(2) is None
+
+    @ring.mmap(f.storage.backend, zero_copy=True)
+    def g(a):
+        return b"g"
+
+    assert g(0) == b"g"
+    assert isinstance(g.get(0), memoryview)
+
+
+def test_mmap_cache_view_close(cache_path):
+    cache = MmapCache(cache_path, slot_count=8, slot_size=64)
+    cache.set("a", b"value-a")
+    view = cache.view("a")
+    cache.set("a", b"value-b")
+    assert bytes(view) == b"value-b"  # the view is not a snapshot
+
+    with pytest.raises(BufferError):
+        cache.close()
+    assert cache.get("a") == b"value-b"  # still open
+    view.release()
+    cache.close()
+    cache.close()
+
+
+def test_mmap_factory_oversized(cache_path):
+    @ring.mmap(cache_path, coder="pickle")
+    def f(a):
+        return "x" * a
+
+    assert f(10) == "x" * 10
+    assert f(2000) == "x" * 2000
+    assert f.get(2000) is None
+
+    f.set("small", 3000)
+    f.set("x" * 2000, 3000)
+    assert f.get(3000) is None
+    assert f.update_many((10,), (4000,)) == ["x" * 10, "x" * 4000]
+    assert f.get_many((10,), (4000,)) == ["x" * 10, None]
@@ -1,3 +1,5 @@
+import hashlib
+import time
 import ring
 from .test_func_sync import redis_client
 import pytest
@@ -122,3 +124,210 @@ def test_redis_hash(redis_client):
         (7, 8),
     )
     assert mv == [None, None, b"506", b"708"]
+
+
+def test_key_slot():
+    from ring._redis import crc16, key_slot
+
+    assert crc16(b"123456789") == 0x31C3
+    assert key_slot("foo") == 12182
+    assert key_slot(b"foo") == 12182
+    assert key_slot("{user1000}.following") == key_slot("{user1000}.followers")
+    assert key_slot("{user1000}.following") == key_slot("user1000")
+    assert key_slot("foo{}{bar}") != key_slot("bar")
+
+
+def test_redis_cluster_storage():
+    fakeredis = pytest.importorskip("fakeredis")
+    from ring._redis import key_slot
+
+    client = fakeredis.FakeRedis()
+
+    @ring.redis(client, "cluster", storage_class=ring.func.sync.RedisClusterStorage)
+    def f(a):
+        return str(a * 10).encode()
+
+    args = [(a,) for a in range(20)]
+    values = [str(a * 10).encode() for a, in args]
+    assert len({key_slot(f.key(*a)) for a in args}) > 1
+    assert f.update_many(*args) == values
+    assert f.get_many(*args, (100,)) == values + [None]
+    f.delete_many(*args[:10])
+    assert f.get_many(*args) == [None] * 10 + values[10:]
+
+    @ring.redis(client, expire=60, key_hashtag=True)
+    def g(a):
+        return str(a).encode()
+
+    assert g.key(1).startswith("{tests.test_redis.")
+    assert g.key(1).endswith(".g}:1")
+    assert len({key_slot(g.key(*a)) for a in args}) == 1
+    assert g.update_many(*args) == [str(a).encode() for a, in args]
+    assert 0 < client.ttl(g.key(1)) <= 60
+
+    @ring.redis(client, "fixed", key_hashtag=True)
+    def h(a):
+        return a
+
+    assert h.key(1) == "{fixed}:1"
+
+
+def test_redis_bucketed_hash():
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis()
+
+    with pytest.raises(TypeError):
+        ring.func.sync.redis_py_hash(client, "test-bucket-hash", expire=60)
+
+    @ring.redis_hash(client, "test-bucket-hash", "field", buckets=4, expire=60)
+    def f(a):
+        return str(a * 10).encode()
+
+    assert f(1) == b"10"
+    assert f.has(1) is True
+    assert f.get(2) is None
+
+    args = [(a,) for a in range(40)]
+    values = [str(a * 10).encode() for a, in args]
+    assert f.update_many(*args) == values
+    assert f.get_many(*args, (100,)) == values + [None]
+    buckets = ["test-bucket-hash:{}".format(i) for i in range(4)]
+    assert client.exists("test-bucket-hash") == 0
+    assert sum(client.hlen(bucket) for bucket in buckets) == 40
+    assert all(0 < client.hlen(bucket) < 40 for bucket in buckets)
+    assert all(0 < client.ttl(bucket) <= 60 for bucket in buckets)
+
+    f.delete(1)
+    assert f.has(1) is False
+    f.delete_many(*args[:10])
+    assert f.get_many(*args) == [None] * 10 + values[10:]
+    assert sum(client.hlen(bucket) for bucket in buckets) == 30
+
+
+def test_redis_generation():
+    fakeredis = pytest.importorskip("fakeredis")
+    from ring.func.generation import Generation
+
+    client = fakeredis.FakeRedis()
+
+    @ring.redis(client, "gen", generation=Generation(ttl=0, cleanup=True))
+    def f(a):
+        return str(a).encode()
+
+    @ring.redis(client, "gen1")
+    def other(a):
+        return str(a).encode()
+
+    assert f(1) == b"1"
+    f.update_many((2,), (3,))
+    other(1)
+    assert sorted(client.keys("gen*")) == [b"gen1:1", b"gen@0:1", b"gen@0:2", b"gen@0:3"]
+
+    f.clear()
+    assert f.get(1) is None
+    assert f(1) == b"1"
+    for _ in range(100):
+        if not client.keys("gen@0*"):
+            break
+        time.sleep(0.01)
+    assert sorted(client.keys("gen*")) == [b"gen1:1", b"gen@1:1", b"gen@generation"]
+
+    generation = Generation(cleanup=True)
+
+    @ring.redis_hash(client, "gen-hash", "field", generation=generation)
+    def h(a):
+        return str(a).encode()
+
+    h(1)
+    h.clear()
+    for _ in range(100):
+        if not client.hlen("gen-hash"):
+            break
+        time.sleep(0.01)
+    assert client.hkeys("gen-hash") == []
+
+    def md5(key):
+        return hashlib.md5(key.encode()).hexdigest()
+
+    @ring.redis(client, "gen-md5", key_refactor=md5, generation=True)
+    def r(a):
+        return str(a).encode()
+
+    r(1)
+    assert client.get(md5("gen-md5@0:1")) == b"1"
+    r.clear()
+    assert r.get(1) is None
+    r(1)
+    assert client.get(md5("gen-md5@1:1")) == b"1"
+
+    with pytest.raises(TypeError):
+
+        @ring.redis(client, key_refactor=md5, generation=Generation(cleanup=True))
+        def cleaned(a):
+            pass
+    assert client.get("field@generation") == b"1"
+
+
+def test_redis_tags():
+    fakeredis = pytest.importorskip("fakeredis")
+    from ring.func.generation import Generation
+
+    client = fakeredis.FakeRedis()
+
+    @ring.redis(client, "tag-user", expire=60)
+    def user(user_id):
+        return str(user_id).encode()
+
+    @ring.redis(
+        client,
+        "tag-posts",
+        storage_class=ring.func.sync.RedisClusterStorage,
+        generation=Generation(ttl=0),
+    )
+    def posts(user_id, page):
+        return "{}:{}".format(user_id, page).encode()
+
+    @user.ring.tags
+    def user_tags(user_id):
+        return ["user:{}".format(user_id)]
+
+    @posts.ring.tags
+    def posts_tags(user_id, page):
+        return ["user:{}".format(user_id)]
+
+    user.update_many((1,), (2,))
+    posts.get_or_update_many((1, 1), (1, 2), (2, 1))
+    posts.set(b"x", 1, 3)
+    assert client.smembers("tag-user@tag:user:1") == {b"tag-user:1"}
+    assert client.smembers("tag-posts@tag:user:1") == {
+        b"tag-posts@0:1:1",
+        b"tag-posts@0:1:2",
+        b"tag-posts@0:1:3",
+    }
+
+    ring.invalidate_tags(["user:1"], batch_size=2)
+    assert user.get_many((1,), (2,)) == [None, b"2"]
+    assert posts.get_many((1, 1), (1, 2), (1, 3), (2, 1)) == [None] * 3 + [b"2:1"]
+    assert not client.exists("tag-user@tag:user:1", "tag-posts@tag:user:1")
+    assert client.exists("tag-user@tag:user:2", "tag-posts@tag:user:2") == 2
+
+    # deleting removes the keys from the sets
+    posts.delete(2, 1)
+    assert not client.exists("tag-posts@tag:user:2")
+    user.delete(2)
+    assert not client.exists("tag-user@tag:user:2")
+
+    # the tags are compared as str
+    user.ring.tags(lambda user_id: [user_id])
+    user(3)
+    assert client.smembers("tag-user@tag:3") == {b"tag-user:3"}
+    ring.invalidate_tags(["3"])
+    assert user.get(3) is None
+
+    @ring.redis_hash(client, "tag-hash")
+    def h(a):
+        return str(a).encode()
+
+    with pytest.raises(TypeError):
+        h.ring.tags(lambda a: ["a"])
+    assert h(1) == b"1"
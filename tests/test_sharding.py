@@ -0,0 +1,137 @@
+import collections
+
+import ring
+import pytest
+from pymemcache.test.utils import MockMemcacheClient
+from ring.func.sharding import ConsistentHash, Shards
+
+
+def test_consistent_hash():
+    chash = ConsistentHash(["a", "b", "c"])
+    keys = ["key{}".format(i) for i in range(3000)]
+    indices = [chash.index_of(key) for key in keys]
+    counts = collections.Counter(indices)
+    assert sorted(counts) == [0, 1, 2]
+    assert min(counts.values()) > 600
+
+    # removing a node moves only its keys
+    chash2 = ConsistentHash(["a", "c"])
+    for key, index in zip(keys, indices):
+        if index != 1:
+            assert ["a", "c"][chash2.index_of(key)] == ["a", "b", "c"][index]
+
+    partitions = chash.partition(keys)
+    assert sorted(p for ps in partitions.values() for p in ps) == list(range(3000))
+
+    with pytest.raises(ValueError):
+        ConsistentHash([])
+
+
+def test_shards_names():
+    a, b = MockMemcacheClient(), MockMemcacheClient()
+    assert Shards([a, b]).hash.points == Shards({0: a, 1: b}).hash.points
+    assert Shards({"x": a, "y": b}).hash.points != Shards([a, b]).hash.points
+
+
+def test_sharded_memcache():
+    clients = [MockMemcacheClient() for _ in range(3)]
+    shards = Shards(clients)
+
+    @ring.memcache(shards, coder="json")
+    def f(a):
+        return a * 10
+
+    assert f(1) == 10
+    key = f.key(1)
+    assert shards.client_of(key).get(key) == b"10"
+    assert sum(client.get(key) is not None for client in clients) == 1
+
+    args = [(a,) for a in range(30)]
+    assert f.update_many(*args) == [a * 10 for a, in args]
+    assert all(client._contents for client in clients)
+    assert f.get_many(*args, (100,)) == [a * 10 for a, in args] + [None]
+
+    f.set_many(args, [a + 1 for a, in args])
+    assert f.get_many(*args) == [a + 1 for a, in args]
+    assert f.get(7) == 8
+
+    f.delete_many(*args[:10])
+    assert f.get_many(*args) == [None] * 10 + [a + 1 for a, in args[10:]]
+    f.delete(10)
+    assert f.get(10) is None
+    assert f.get(11) == 12
+
+
+class FakeAiomcacheClient(object):
+    def __init__(self):
+        self.contents = {}
+
+    async def get(self, key):
+        return self.contents.get(key)
+
+    async def multi_get(self, *keys):
+        return tuple(self.contents.get(key) for key in keys)
+
+    async def set(self, key, value, expire=0):
+        self.contents[key] = value
+
+    async def delete(self, key):
+        return self.contents.pop(key, None) is not None
+
+    async def touch(self, key, expire):
+        return key in self.contents
+
+
+@pytest.mark.asyncio
+async def test_sharded_aiomcache():
+    clients = [FakeAiomcacheClient() for _ in range(3)]
+    shards = Shards(clients)
+
+    @ring.aiomcache(shards, coder="json")
+    async def f(a):
+        return a * 10
+
+    assert await f(1) == 10
+    assert sum(f.key(1) in client.contents for client in clients) == 1
+
+    args = [(a,) for a in range(30)]
+    for (a,) in args:
+        await f(a)
+    assert all(client.contents for client in clients)
+    assert await f.get_many(*args, (100,)) == [a * 10 for a, in args] + [None]
+
+    await f.delete(1)
+    assert await f.get(1) is None
+
+
+def test_sharded_generation():
+    clients = [MockMemcacheClient() for _ in range(3)]
+
+    @ring.memcache(Shards(clients), coder="json", generation=True)
+    def f(a):
+        return a * 10
+
+    args = [(a,) for a in range(30)]
+    assert f.update_many(*args) == [a * 10 for a, in args]
+    f.clear()
+    assert f.get_many(*args) == [None] * 30
+    generation_key = f.storage.generation_key
+    assert sum(client.get(generation_key) is not None for client in clients) == 1
+
+
+def test_sharded_tags():
+    fakeredis = pytest.importorskip("fakeredis")
+    clients = [fakeredis.FakeRedis(server=fakeredis.FakeServer()) for _ in range(3)]
+
+    @ring.redis(Shards(clients))
+    def f(a):
+        return str(a).encode()
+
+    f.ring.tags(lambda a: ["odd" if a % 2 else "even"])
+
+    args = [(a,) for a in range(30)]
+    f.update_many(*args)
+    tag_key = f._rope.tag_key_prefix + "odd"
+    assert all(client.exists(tag_key) for client in clients)
+    ring.invalidate_tags(["odd"])
+    assert f.get_many(*args) == [None if a % 2 else str(a).encode() for a, in args]
@@ -0,0 +1,72 @@
+import gc
+
+import pytest
+
+import ring
+from ring.func.weak_cache import WeakValueCache, SENTINEL
+
+
+class Value(object):
+    def __init__(self, value):
+        self.value = value
+
+
+def test_weak_value_cache():
+    cache = WeakValueCache(window=1)
+    v1 = Value(1)
+    cache.set("a", v1)
+    cache.set("b", Value(2))
+    cache.set("c", (3,))  # not weakly referenceable
+    gc.collect()
+
+    # `a` is alive out of the window; `b` is collected
+    assert cache.get("a") is v1
+    assert cache.get("b") is SENTINEL
+    assert not cache.has("b")
+    assert cache.get("c") is SENTINEL
+
+    # `a` got back to the window by the last `get`
+    del v1
+    gc.collect()
+    assert cache.get("a").value == 1
+
+    cache.delete("a")
+    assert not cache.has("a")
+    with pytest.raises(KeyError):
+        cache.delete("a")
+
+    cache.set("d", Value(4))
+    cache.clear()
+    assert cache.get("d") is SENTINEL
+
+
+def test_weak_value_cache_no_window():
+    cache = WeakValueCache(window=0)
+    cache.set("a", Value(1))
+    gc.collect()
+    assert cache.get("a") is SENTINEL
+
+
+def test_weak():
+    calls = []
+
+    @ring.weak(window=1)
+    def f(a):
+        calls.append(a)
+        return Value(a)
+
+    v1 = f(1)
+    assert f(1) is v1
+    f(2)
+    assert f(1) is v1
+    assert calls == [1, 2]
+
+    del v1
+    f(3)
+    gc.collect()
+    assert f.get(1) is None
+    f(1)
+    assert calls == [1, 2, 3, 1]
+
+    f.delete(1)
+    assert not f.has(1)